@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Benchmark bulk loading Reviews from a JSONL file into FileStorage.
+
+Writes --objects Reviews to a JSONL file, then times bulk_load() against
+creating and saving the same Reviews one at a time, the way a script of
+console create/update commands would, on the first --naive rows only.
+Run from the repository root:
+
+    python3 benchmarks/bench_bulk_load.py --objects 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def main():
+    """Print the rows per second of bulk and one at a time loads."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=None)
+    parser.add_argument("--naive", type=int, default=500)
+    parser.add_argument("--journal", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    with open("reviews.jsonl", "w") as f:
+        for i in range(args.objects):
+            f.write(json.dumps({"place_id": "p{}".format(i % 1000),
+                                "user_id": "u{}".format(i % 5000),
+                                "text": "Review number {}".format(i)}))
+            f.write("\n")
+    storage = FileStorage(journal=args.journal)
+
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    for i in range(args.naive):
+        rv = Review()
+        storage.save()
+        rv.place_id = "p{}".format(i % 1000)
+        rv.user_id = "u{}".format(i % 5000)
+        rv.text = "Review number {}".format(i)
+        storage.save()
+    naive = args.naive / (time.perf_counter() - start)
+
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    storage.bulk_load("reviews.jsonl", Review, args.batch)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    storage.by_ref(Review, "place_id", "p0")
+    indexed = time.perf_counter() - start
+    print("one at a time: {:10.1f} rows/s ({} rows)".format(
+        naive, args.naive))
+    print("bulk_load:     {:10.1f} rows/s ({} rows in {:.1f}s, "
+          "indexes rebuilt in {:.1f}s)".format(args.objects / loaded,
+                                               args.objects, loaded,
+                                               indexed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Benchmark the save and reload time and file size of each codec.
+
+Saves a store of --objects Places with each codec, then reloads it
+eagerly and lazily. Run from the repository root:
+
+    python3 benchmarks/bench_codecs.py --objects 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.codecs import CODECS  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(func):
+    """Return the seconds taken by a call to func."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    """Print the save and reload time and file size of each codec."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=50000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    print("{} objects".format(args.objects))
+    for codec in CODECS:
+        FileStorage._FileStorage__objects = {}
+        for i in range(args.objects):
+            pl = Place()
+            pl.name = "Place {}".format(i)
+            pl.amenity_ids = ["a", "b", "c"]
+            pl.latitude = 37.77
+            pl.price_by_night = i
+        storage = FileStorage(codec=codec)
+        save = timed(storage.save)
+        size = os.path.getsize("file.json")
+        FileStorage._FileStorage__objects = {}
+        reload = timed(storage.reload)
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(codec=codec, lazy=True)
+        lazy_reload = timed(lazy.reload)
+        print("{:<7} save {:7.3f}s  reload {:7.3f}s  lazy reload {:7.3f}s"
+              "  {:10d} bytes".format(codec, save, reload, lazy_reload,
+                                      size))
+
+
+if __name__ == "__main__":
+    main()
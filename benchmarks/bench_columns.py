@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Benchmark an aggregate over Places from a reload and from columns.
+
+Computes the mean price_by_night of --objects Places, once after a full
+reload of the storage file and once from the columnar snapshot. Run from
+the repository root:
+
+    python3 benchmarks/bench_columns.py --objects 200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def main():
+    """Print the time of the aggregate with and without columns."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=200000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    FileStorage._FileStorage__objects = {}
+    for i in range(args.objects):
+        pl = Place()
+        pl.price_by_night = random.randrange(500)
+    storage = FileStorage()
+    storage.save()
+    storage.save_columns(Place)
+    print("{} objects, file {} bytes, columns {} bytes".format(
+        args.objects, os.path.getsize("file.json"),
+        os.path.getsize("file.Place.columns")))
+
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    storage.reload()
+    prices = [pl.price_by_night for pl in storage.all(Place).values()]
+    mean = sum(prices) / len(prices)
+    print("reload   {:8.3f}s  mean {:.2f}".format(
+        time.perf_counter() - start, mean))
+
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    prices = storage.column(Place, "price_by_night")
+    mean = sum(prices) / len(prices)
+    print("columns  {:8.3f}s  mean {:.2f}".format(
+        time.perf_counter() - start, mean))
+
+
+if __name__ == "__main__":
+    main()
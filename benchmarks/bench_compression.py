@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""Benchmark the CPU and I/O tradeoff of compressing the storage file.
+
+Saves and reloads a store of --objects Places with each compression at
+a few levels, printing times and the resulting file size. Run from the
+repository root:
+
+    python3 benchmarks/bench_compression.py --objects 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+LEVELS = {
+    None: (None,),
+    "zlib": (1, 6, 9),
+    "lzma": (0, 6),
+    "bz2": (1, 9)
+}
+
+
+def timed(func):
+    """Return the seconds taken by a call to func."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    """Print the save and reload time and file size of each compression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=50000)
+    parser.add_argument("--codec", default="json")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    print("{} objects, {} codec".format(args.objects, args.codec))
+    for compression, levels in LEVELS.items():
+        for level in levels:
+            FileStorage._FileStorage__objects = {}
+            for i in range(args.objects):
+                pl = Place()
+                pl.name = "Place {}".format(i)
+                pl.price_by_night = i
+            storage = FileStorage(codec=args.codec, compression=compression,
+                                  compression_level=level)
+            save = timed(storage.save)
+            size = os.path.getsize("file.json")
+            FileStorage._FileStorage__objects = {}
+            reload = timed(storage.reload)
+            print("{:<5} level {:<4} save {:7.3f}s  reload {:7.3f}s"
+                  "  {:10d} bytes".format(str(compression), str(level),
+                                          save, reload, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Benchmark saves per second of processes sharing one FileStorage file.
+
+Each worker process reloads a store preloaded with --objects Places in
+shared mode, then repeatedly creates a Place and saves. Every save merges
+the saves of the other workers, so none is lost, which is checked once
+all the workers are done. Run from the repository root:
+
+    python3 benchmarks/bench_contention.py --objects 10000 --saves 50
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def worker(saves, ready):
+    """Create and save a Place saves times once every worker is ready."""
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage(shared=True)
+    storage.reload()
+    ready.wait()
+    for i in range(saves):
+        Place()
+        storage.save()
+
+
+def run(processes, saves):
+    """Return the saves per second reached by the worker processes."""
+    ready = multiprocessing.Barrier(processes + 1)
+    workers = [multiprocessing.Process(target=worker, args=(saves, ready))
+               for i in range(processes)]
+    for p in workers:
+        p.start()
+    ready.wait()
+    start = time.perf_counter()
+    for p in workers:
+        p.join()
+    return processes * saves / (time.perf_counter() - start)
+
+
+def main():
+    """Print saves per second for an increasing number of processes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--processes", type=int, nargs="+",
+                        default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    FileStorage._FileStorage__objects = {}
+    for i in range(args.objects):
+        Place()
+    storage = FileStorage(shared=True)
+    storage.save()
+    expected = args.objects
+    print("{} objects, {} saves per process".format(args.objects,
+                                                    args.saves))
+    for processes in args.processes:
+        rate = run(processes, args.saves)
+        expected += processes * args.saves
+        with open("file.json", "r") as f:
+            lost = expected - len(json.load(f))
+        print("processes={:<3} {:10.1f} saves/s  lost={}".format(
+            processes, rate, lost))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Benchmark streaming exports of Reviews from FileStorage.
+
+Saves --objects Reviews, then times export() to JSONL and CSV after an
+eager and a lazy reload, against dumping the list of their to_dict() at
+once, and reports the peak memory traced while each export runs.
+Run from the repository root:
+
+    python3 benchmarks/bench_export.py --objects 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def dump_all(storage, f):
+    """Write all the Reviews to f as a single JSON list."""
+    json.dump([obj.to_dict() for obj in storage.all(Review).values()], f)
+    return storage.count(Review)
+
+
+def measure(storage, export, path):
+    """Return the rows per second and peak MiB of export into path."""
+    with open(path, "w", newline="") as f:
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = export(storage, f)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return rows / elapsed, peak / 2 ** 20
+
+
+def main():
+    """Print the rows per second and peak memory of each export."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    FileStorage._FileStorage__objects = {}
+    for i in range(args.objects):
+        rv = Review()
+        rv.place_id = "p{}".format(i % 1000)
+        rv.text = "Review number {}".format(i)
+    FileStorage().save()
+
+    exports = (("json list", dump_all, "reviews.json"),
+               ("jsonl", lambda s, f: s.export(Review, "jsonl", f),
+                "reviews.jsonl"),
+               ("csv", lambda s, f: s.export(Review, "csv", f),
+                "reviews.csv"))
+    print("{} objects".format(args.objects))
+    for lazy in (False, True):
+        storage = FileStorage(lazy=lazy)
+        for name, export, path in exports:
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            rate, peak = measure(storage, export, path)
+            print("{:<5} {:<9} {:10.1f} rows/s  peak {:8.1f} MiB".format(
+                "lazy" if lazy else "eager", name, rate, peak))
+
+
+if __name__ == "__main__":
+    main()
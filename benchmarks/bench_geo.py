@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Benchmark the latency of places_near and places_in_bbox.
+
+Scatters --objects Places uniformly over a region the size of the San
+Francisco Bay Area and times random searches against the grid index.
+Run from the repository root:
+
+    python3 benchmarks/bench_geo.py --objects 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def percentiles(samples):
+    """Return the median and 99th percentile of samples, in ms."""
+    samples = sorted(samples)
+    return (samples[len(samples) // 2] * 1000,
+            samples[int(len(samples) * 0.99)] * 1000)
+
+
+def main():
+    """Print the latency of radius and bounding box searches."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--radius", type=float, default=1.0)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    FileStorage._FileStorage__objects = {}
+    for i in range(args.objects):
+        pl = Place()
+        pl.latitude = random.uniform(37.2, 38.2)
+        pl.longitude = random.uniform(-122.6, -121.6)
+    storage = FileStorage()
+    start = time.perf_counter()
+    storage.places_near(0, 0, 1)
+    print("{} objects, index built in {:.3f}s".format(
+        args.objects, time.perf_counter() - start))
+
+    for name, search in (
+            ("places_near", lambda lat, lon: storage.places_near(
+                lat, lon, args.radius, args.limit)),
+            ("places_in_bbox", lambda lat, lon: storage.places_in_bbox(
+                lat, lon, lat + 0.01, lon + 0.01))):
+        samples = []
+        for i in range(args.queries):
+            lat = random.uniform(37.2, 38.2)
+            lon = random.uniform(-122.6, -121.6)
+            start = time.perf_counter()
+            search(lat, lon)
+            samples.append(time.perf_counter() - start)
+        print("{:<15} p50 {:.3f} ms  p99 {:.3f} ms".format(
+            name, *percentiles(samples)))
+
+
+if __name__ == "__main__":
+    main()
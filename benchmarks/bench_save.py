@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Benchmark saves per second of FileStorage under bursty update load.
+
+Each writer thread repeatedly updates one Place and saves, in bursts of
+a few saves separated by a short pause, against a store preloaded with
+--objects Places. Run from the repository root:
+
+    python3 benchmarks/bench_save.py --objects 10000 --threads 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def run(storage, places, threads, bursts, burst_size, pause):
+    """Return the saves per second reached by the writer threads."""
+    def writer(place):
+        for i in range(bursts):
+            for j in range(burst_size):
+                place.price_by_night = i * burst_size + j
+                storage.save()
+            time.sleep(pause)
+
+    workers = [threading.Thread(target=writer, args=(places[i],))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start - bursts * pause
+    return threads * bursts * burst_size / elapsed
+
+
+def main():
+    """Print saves per second with and without group commit."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--bursts", type=int, default=10)
+    parser.add_argument("--burst-size", type=int, default=5)
+    parser.add_argument("--pause", type=float, default=0.01)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    FileStorage._FileStorage__objects = {}
+    places = [Place() for i in range(args.objects)]
+    print("{} objects, {} threads, bursts of {}".format(
+        args.objects, args.threads, args.burst_size))
+    for window in (0.0, 0.002, 0.005):
+        for journal in (False, True):
+            storage = FileStorage(journal=journal, group_commit=window)
+            storage.save()
+            rate = run(storage, places, args.threads, args.bursts,
+                       args.burst_size, args.pause)
+            print("group_commit={:<6} journal={:<5} {:10.1f} saves/s".format(
+                window, str(journal), rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""Benchmark thread-safe FileStorage under a mixed read/write workload.
+
+Each thread performs --ops operations on a store of --objects Places:
+with probability --reads a read (get, indexed query or count), otherwise
+a locked update of a random Place, followed by a save one time in
+--save-every. Run from the repository root:
+
+    python3 benchmarks/bench_threads.py --objects 10000 --reads 0.9
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import models  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def worker(storage, ids, ops, reads, save_every, seed):
+    """Perform ops random operations on storage."""
+    rng = random.Random(seed)
+    for i in range(ops):
+        op = rng.random()
+        if op < reads / 3:
+            storage.get(Place, rng.choice(ids))
+        elif op < reads * 2 / 3:
+            price = rng.randrange(1000)
+            storage.query(Place).where(price_by_night__gte=price,
+                                       price_by_night__lt=price + 2).all()
+        elif op < reads:
+            storage.count(Place)
+        else:
+            pl = storage.get(Place, rng.choice(ids))
+            with storage.locked(pl):
+                pl.price_by_night = rng.randrange(1000)
+            if rng.randrange(save_every) == 0:
+                storage.save()
+
+
+def run(storage, ids, threads, ops, reads, save_every):
+    """Return the operations per second reached by threads threads."""
+    workers = [threading.Thread(target=worker,
+                                args=(storage, ids, ops, reads, save_every,
+                                      i))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main():
+    """Print operations per second for an increasing number of threads."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--reads", type=float, default=0.9)
+    parser.add_argument("--save-every", type=int, default=50)
+    parser.add_argument("--threads", type=int, nargs="+",
+                        default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage(thread_safe=True,
+                          range_indexes=["Place.price_by_night"])
+    models.storage = storage
+    ids = []
+    for i in range(args.objects):
+        pl = Place()
+        pl.price_by_night = random.randrange(1000)
+        ids.append(pl.id)
+    storage.save()
+    storage.indexes(Place)
+    print("{} objects, {:.0%} reads, a save every {} updates".format(
+        args.objects, args.reads, args.save_every))
+    for threads in args.threads:
+        rate = run(storage, ids, threads, args.ops, args.reads,
+                   args.save_every)
+        print("threads={:<3} {:10.1f} ops/s".format(threads, rate))
+
+
+if __name__ == "__main__":
+    main()
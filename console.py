@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Defines the HBnB console."""
 import cmd
+import os
 import re
 from shlex import split
 from models import storage
@@ -53,6 +54,17 @@ class HBNBCommand(cmd.Cmd):
         """Do nothing upon receiving an empty line."""
         pass
 
+    def __supports(self, name):
+        """Return True if storage has the method name, or print an error.
+
+        Some commands rely on the indexes of FileStorage, which the other
+        storage engines lack.
+        """
+        if hasattr(storage, name):
+            return True
+        print("** not supported by this storage **")
+        return False
+
     def default(self, arg):
         """Default behavior for cmd module when input is invalid"""
         argdict = {
@@ -76,11 +88,13 @@ class HBNBCommand(cmd.Cmd):
 
     def do_quit(self, arg):
         """Quit command to exit the program."""
+        storage.flush()
         return True
 
     def do_EOF(self, arg):
         """EOF signal to exit the program."""
         print("")
+        storage.flush()
         return True
 
     def do_create(self, arg):
@@ -127,7 +141,7 @@ class HBNBCommand(cmd.Cmd):
         elif "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
             print("** no instance found **")
         else:
-            del objdict["{}.{}".format(argl[0], argl[1])]
+            storage.delete(objdict["{}.{}".format(argl[0], argl[1])])
             storage.save()
 
     def do_all(self, arg):
@@ -139,22 +153,123 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
         else:
             objl = []
-            for obj in storage.all().values():
-                if len(argl) > 0 and argl[0] == obj.__class__.__name__:
-                    objl.append(obj.__str__())
-                elif len(argl) == 0:
-                    objl.append(obj.__str__())
+            for obj in storage.all(argl[0] if argl else None).values():
+                objl.append(obj.__str__())
             print(objl)
 
     def do_count(self, arg):
         """Usage: count <class> or <class>.count()
         Retrieve the number of instances of a given class."""
         argl = parse(arg)
-        count = 0
-        for obj in storage.all().values():
-            if argl[0] == obj.__class__.__name__:
-                count += 1
-        print(count)
+        print(storage.count(argl[0]))
+
+    def do_near(self, arg):
+        """Usage: near <latitude> <longitude> <radius_km> [<limit>]
+        Display the Places within a radius of a point, nearest first."""
+        argl = parse(arg)
+        if not self.__supports("places_near"):
+            return False
+        if len(argl) < 2:
+            print("** coordinates missing **")
+        elif len(argl) == 2:
+            print("** radius missing **")
+        else:
+            try:
+                lat, lon, radius = (float(v) for v in argl[:3])
+                limit = int(argl[3]) if len(argl) > 3 else None
+            except ValueError:
+                print("** invalid number **")
+                return False
+            print([str(obj) for obj in
+                   storage.places_near(lat, lon, radius, limit)])
+
+    def do_bbox(self, arg):
+        """Usage: bbox <south> <west> <north> <east>
+        Display the Places located in a bounding box."""
+        argl = parse(arg)
+        if not self.__supports("places_in_bbox"):
+            return False
+        if len(argl) < 4:
+            print("** coordinates missing **")
+        else:
+            try:
+                bounds = [float(v) for v in argl[:4]]
+            except ValueError:
+                print("** invalid number **")
+                return False
+            print([str(obj) for obj in storage.places_in_bbox(*bounds)])
+
+    def do_search(self, arg):
+        """Usage: search [<class>] <words>
+        Display the objects best matching some words, best first."""
+        argl = parse(arg)
+        if not self.__supports("search"):
+            return False
+        cls = None
+        if len(argl) > 1 and argl[0] in HBNBCommand.__classes:
+            cls = argl.pop(0)
+        if len(argl) == 0:
+            print("** words missing **")
+        else:
+            print([str(obj) for obj in
+                   storage.search(" ".join(argl), cls)])
+
+    def do_import(self, arg):
+        """Usage: import <class> <file> [<batch>]
+        Create instances of a class from the rows of a JSONL or CSV file,
+        saving every batch rows, and print their number."""
+        argl = parse(arg)
+        if not self.__supports("bulk_load"):
+            return False
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        elif len(argl) == 1:
+            print("** file name missing **")
+        else:
+            try:
+                batch = int(argl[2]) if len(argl) > 2 else None
+            except ValueError:
+                print("** invalid number **")
+                return False
+            try:
+                print(storage.bulk_load(argl[1], argl[0], batch))
+            except FileNotFoundError:
+                print("** no file found **")
+            except ValueError as e:
+                print("** {} **".format(e))
+
+    def do_export(self, arg):
+        """Usage: export <class> <file> [<attribute_name> ...]
+        Write the instances of a class, or only some of their attributes,
+        to a JSONL or CSV file and print their number."""
+        argl = parse(arg)
+        if not self.__supports("export"):
+            return False
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        elif len(argl) == 1:
+            print("** file name missing **")
+        else:
+            fmt = os.path.splitext(argl[1])[1].lstrip(".").lower()
+            if fmt not in ("jsonl", "ndjson", "csv"):
+                print("** unknown format {} **".format(fmt))
+                return False
+            tmp = argl[1] + ".tmp"
+            try:
+                with open(tmp, "w", newline="") as f:
+                    count = storage.export(argl[0], fmt, f, argl[2:] or None)
+                os.replace(tmp, argl[1])
+            except OSError:
+                print("** cannot write file **")
+                return False
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            print(count)
 
     def do_update(self, arg):
         """Usage: update <class> <id> <attribute_name> <attribute_value> or
@@ -191,18 +306,18 @@ class HBNBCommand(cmd.Cmd):
             obj = objdict["{}.{}".format(argl[0], argl[1])]
             if argl[2] in obj.__class__.__dict__.keys():
                 valtype = type(obj.__class__.__dict__[argl[2]])
-                obj.__dict__[argl[2]] = valtype(argl[3])
+                setattr(obj, argl[2], valtype(argl[3]))
             else:
-                obj.__dict__[argl[2]] = argl[3]
+                setattr(obj, argl[2], argl[3])
         elif type(eval(argl[2])) == dict:
             obj = objdict["{}.{}".format(argl[0], argl[1])]
             for k, v in eval(argl[2]).items():
                 if (k in obj.__class__.__dict__.keys() and
                         type(obj.__class__.__dict__[k]) in {str, int, float}):
                     valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
+                    setattr(obj, k, valtype(v))
                 else:
-                    obj.__dict__[k] = v
+                    setattr(obj, k, v)
         storage.save()
 
 
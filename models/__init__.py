@@ -1,6 +1,28 @@
 #!/usr/bin/python3
-"""Initialize the file storage class."""
-from models.engine.file_storage import FileStorage
+"""Initialize the storage engine selected by HBNB_TYPE_STORAGE."""
+from os import getenv
 
-storage = FileStorage()
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage(getenv("HBNB_DB_PATH", "hbnb.db"))
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage(
+        journal=getenv("HBNB_STORAGE_JOURNAL") == "1",
+        compact_threshold=int(getenv("HBNB_STORAGE_COMPACT_BYTES", 1 << 20)),
+        sharded=getenv("HBNB_STORAGE_SHARDED") == "1",
+        lazy=getenv("HBNB_STORAGE_LAZY") == "1",
+        group_commit=float(getenv("HBNB_STORAGE_GROUP_COMMIT_MS", 0)) / 1000,
+        autosave=(float(getenv("HBNB_STORAGE_AUTOSAVE_MS")) / 1000
+                  if getenv("HBNB_STORAGE_AUTOSAVE_MS") else None),
+        codec=getenv("HBNB_STORAGE_CODEC", "json"),
+        compression=getenv("HBNB_STORAGE_COMPRESSION") or None,
+        compression_level=(int(getenv("HBNB_STORAGE_COMPRESSION_LEVEL"))
+                           if getenv("HBNB_STORAGE_COMPRESSION_LEVEL")
+                           else None),
+        range_indexes=[name for name in getenv(
+            "HBNB_STORAGE_RANGE_INDEXES", "").split(",") if name],
+        shared=getenv("HBNB_STORAGE_SHARED") == "1",
+        thread_safe=getenv("HBNB_STORAGE_THREAD_SAFE") == "1"
+    )
 storage.reload()
@@ -26,6 +26,11 @@ class BaseModel:
         else:
             models.storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Set an attribute and flag the instance as changed in storage."""
+        super().__setattr__(name, value)
+        models.storage.touch(self, name)
+
     def save(self):
         """Update updated_at with the current datetime and save."""
         self.updated_at = datetime.today()
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Defines the AsyncStorage class."""
+import asyncio
+
+
+class AsyncStorage:
+    """Represent an asyncio facade over a storage engine.
+
+    Saving, reloading, counting and reading objects run in an executor, so
+    they never block the event loop, even while a save holds a thread-safe
+    storage for writing. Concurrent asave() calls are coalesced: callers
+    arriving while a save runs all wait for the single save that follows
+    it, which writes their changes together.
+
+    Saves run in another thread while coroutines change objects, so the
+    storage should be thread-safe, e.g. FileStorage(thread_safe=True).
+    """
+
+    def __init__(self, storage, executor=None):
+        """Initialize a new AsyncStorage.
+
+        Args:
+            storage (FileStorage or DBStorage): The storage wrapped.
+            executor (concurrent.futures.Executor): The executor to run
+                blocking calls in, or None for the default executor of the
+                event loop.
+        """
+        self.__storage = storage
+        self.__executor = executor
+        self.__waiting = None
+        self.__saver = None
+
+    @property
+    def storage(self):
+        """Return the storage wrapped."""
+        return self.__storage
+
+    async def aall(self, cls=None):
+        """Return a copy of the dictionary of the objects, or of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+        """
+        return await self.__run(self.__all, cls)
+
+    async def aget(self, cls, id):
+        """Return the object of cls with the given id, or None.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+        """
+        return await self.__run(self.__storage.get, cls, id)
+
+    async def acount(self, cls=None):
+        """Return the number of objects, or of objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+        """
+        return await self.__run(self.__storage.count, cls)
+
+    async def aiter(self, cls=None, batch=1000):
+        """Iterate asynchronously over the objects, or those of cls.
+
+        The objects are those stored when the iteration starts. Control
+        returns to the event loop after every batch of objects.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+            batch (int): The number of objects between two yields to the
+                event loop.
+        """
+        objs = await self.aall(cls)
+        for i, obj in enumerate(objs.values(), 1):
+            yield obj
+            if i % batch == 0:
+                await asyncio.sleep(0)
+
+    async def asave(self):
+        """Save the changes made so far, coalesced with concurrent calls.
+
+        Returns once a save that started after this call has completed.
+        Cancelling a caller does not cancel the save it waits for.
+
+        Raises:
+            Exception: Whatever the save raised.
+        """
+        if self.__waiting is None:
+            self.__waiting = asyncio.get_running_loop().create_future()
+            if self.__saver is None:
+                self.__saver = asyncio.ensure_future(self.__save_loop())
+        await asyncio.shield(self.__waiting)
+
+    async def aflush(self):
+        """Perform the saves deferred by the storage, if any."""
+        await self.__run(self.__storage.flush)
+
+    async def areload(self):
+        """Reload the objects saved by the storage."""
+        await self.__run(self.__storage.reload)
+
+    async def __save_loop(self):
+        """Save until no caller is waiting for a save anymore."""
+        try:
+            while self.__waiting is not None:
+                waiting, self.__waiting = self.__waiting, None
+                try:
+                    await self.__run(self.__storage.save)
+                except asyncio.CancelledError:
+                    waiting.cancel()
+                    raise
+                except Exception as e:
+                    waiting.set_exception(e)
+                else:
+                    waiting.set_result(None)
+        finally:
+            self.__saver = None
+
+    def __all(self, cls):
+        """Return a copy of the objects, or of those of cls."""
+        with self.__storage.reading():
+            return dict(self.__storage.all(cls))
+
+    def __run(self, func, *args):
+        """Return a future running func(*args) in the executor."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.__executor, func, *args)
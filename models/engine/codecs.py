@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+"""Defines the serialization codecs of FileStorage files.
+
+JSON files keep the historical headerless layout. Files of any other
+codec start with a header line made of MAGIC and the tag of the codec,
+which detect() reads back on reload. The binary codec frames compact
+JSON records, a format that does not depend on the Python version. The
+pickle codec can run arbitrary code on load, so only reload pickle files
+you wrote.
+"""
+import io
+import json
+import pickle
+import struct
+from json.decoder import scanstring
+from models.engine.json_stream import iter_records
+
+MAGIC = b"HBNB "
+FRAME = struct.Struct(">HI")
+
+
+class JSONCodec:
+    """Represent the JSON codec, saving one record per line.
+
+    Attributes:
+        name (str): The name of the codec.
+    """
+
+    name = "json"
+
+    def encode(self, record):
+        """Return record encoded as JSON bytes."""
+        return json.dumps(record).encode()
+
+    def decode(self, data):
+        """Return the record encoded in data."""
+        return json.loads(data)
+
+    def dump(self, f, records):
+        """Write records as a JSON object, one record per line.
+
+        Args:
+            f (file): A binary file open for writing.
+            records (iterable): The (key, encoded record) pair of each record.
+        """
+        sep = b"{\n"
+        for key, enc in records:
+            f.write(b"".join((sep, json.dumps(key).encode(), b": ", enc)))
+            sep = b",\n"
+        f.write(b"\n}" if sep == b",\n" else b"{\n}")
+
+    def load(self, f):
+        """Yield the (key, record) pairs saved in f, whatever its layout.
+
+        Args:
+            f (file): A binary file positioned after its header.
+        """
+        yield from iter_records(io.TextIOWrapper(f, encoding="utf-8"))
+
+    def index(self, buf, pos):
+        """Yield the (key, start, end) offsets of the records in buf.
+
+        Records are ASCII since json.dumps escapes everything else, so the
+        character offsets of a line are also its byte offsets.
+
+        Args:
+            buf (mmap): The content of a file saved by dump().
+            pos (int): The offset of the first byte after the header.
+
+        Raises:
+            ValueError: If buf was not saved one record per line.
+        """
+        if buf[pos:pos + 2] != b"{\n":
+            raise ValueError("JSON file not saved one record per line")
+        pos += 2
+        end = buf.rfind(b"\n}", pos)
+        while pos < end:
+            nl = buf.find(b"\n", pos)
+            if nl == -1 or nl > end:
+                nl = end
+            key, kend = scanstring(buf[pos:nl].decode("ascii"), 1)
+            vend = nl - 1 if buf[nl - 1:nl] == b"," else nl
+            yield key, pos + kend + 2, vend
+            pos = nl + 1
+
+
+class FramedCodec:
+    """Represent a codec saving length-prefixed binary records.
+
+    Each record is framed by the lengths of its key and of its encoded
+    value, followed by the UTF-8 key and the value.
+
+    Attributes:
+        name (str): The name of the codec.
+    """
+
+    def __init__(self, name, dumps, loads):
+        """Initialize a new FramedCodec.
+
+        Args:
+            name (str): The name of the codec.
+            dumps (callable): Returns the bytes of a record.
+            loads (callable): Returns the record of some bytes.
+        """
+        self.name = name
+        self.__dumps = dumps
+        self.__loads = loads
+
+    def encode(self, record):
+        """Return the bytes of record."""
+        return self.__dumps(record)
+
+    def decode(self, data):
+        """Return the record encoded in data."""
+        return self.__loads(data)
+
+    def dump(self, f, records):
+        """Write the header of the codec followed by the framed records.
+
+        Args:
+            f (file): A binary file open for writing.
+            records (iterable): The (key, encoded record) pair of each record.
+        """
+        f.write(MAGIC + self.name.encode() + b"\n")
+        for key, enc in records:
+            kb = key.encode()
+            f.write(b"".join((FRAME.pack(len(kb), len(enc)), kb, enc)))
+
+    def load(self, f):
+        """Yield the (key, record) pairs saved in f.
+
+        Args:
+            f (file): A binary file positioned after its header.
+        """
+        while True:
+            frame = f.read(FRAME.size)
+            if not frame:
+                return
+            klen, vlen = FRAME.unpack(frame)
+            key = f.read(klen).decode()
+            yield key, self.__loads(f.read(vlen))
+
+    def index(self, buf, pos):
+        """Yield the (key, start, end) offsets of the records in buf.
+
+        Args:
+            buf (mmap): The content of a file saved by dump().
+            pos (int): The offset of the first byte after the header.
+        """
+        size = len(buf)
+        while pos < size:
+            klen, vlen = FRAME.unpack_from(buf, pos)
+            pos += FRAME.size
+            key = buf[pos:pos + klen].decode()
+            pos += klen
+            yield key, pos, pos + vlen
+            pos += vlen
+
+
+CODECS = {
+    "json": JSONCodec(),
+    "binary": FramedCodec("binary",
+                          lambda record: json.dumps(
+                              record, separators=(",", ":")).encode(),
+                          json.loads),
+    "pickle": FramedCodec("pickle",
+                          lambda record: pickle.dumps(record, protocol=5),
+                          pickle.loads)
+}
+
+
+def detect(f):
+    """Return the codec of the file f and skip its header.
+
+    Args:
+        f (file): A binary file positioned at its start.
+
+    Raises:
+        KeyError: If the header names an unknown codec.
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        f.seek(0)
+        return CODECS["json"]
+    return CODECS[f.readline().strip().decode()]
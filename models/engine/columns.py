@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Defines the Columns class."""
+import json
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"HBNB columns\n"
+TRAILER = struct.Struct("<Q")
+
+
+class Columns:
+    """Represent a columnar snapshot of the objects of one class.
+
+    Each attribute is saved as one contiguous column: ints as a 64-bit
+    array, floats as a double array, strings as an array of offsets into
+    a UTF-8 blob, and any other values as JSON strings. A footer after the
+    columns records where each one starts, so a single column is read
+    without decoding the others or instantiating any object. Numeric
+    columns are returned as array.array, which numpy.frombuffer() can view
+    without copying.
+
+    Attributes:
+        path (str): The name of the snapshot file.
+    """
+
+    def __init__(self, path):
+        """Initialize a new Columns.
+
+        Args:
+            path (str): The name of the snapshot file.
+        """
+        self.path = path
+
+    def write(self, cls, records):
+        """Durably replace the snapshot with the given records.
+
+        Attributes absent from a record take the default of cls, so the
+        numeric attributes of a model always get a numeric column.
+
+        Args:
+            cls (type): The class of the records, e.g. Place.
+            records (list): The to_dict() of each object.
+        """
+        names = {"id": None}
+        for attr, value in vars(cls).items():
+            if type(value) in (int, float):
+                names[attr] = None
+        for record in records:
+            names.update(dict.fromkeys(record))
+        names.pop("__class__", None)
+        footer = {"class": cls.__name__, "rows": len(records), "columns": {}}
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            for name in names:
+                default = getattr(cls, name, None)
+                values = [record.get(name, default) for record in records]
+                footer["columns"][name] = self.__write_column(f, values)
+            data = json.dumps(footer).encode()
+            f.write(data)
+            f.write(TRAILER.pack(len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def names(self):
+        """Return the names of the columns of the snapshot."""
+        return list(self.__footer()["columns"])
+
+    def rows(self):
+        """Return the number of objects in the snapshot."""
+        return self.__footer()["rows"]
+
+    def column(self, name):
+        """Return the values of one attribute for every object, in order.
+
+        Args:
+            name (str): The name of the attribute.
+
+        Returns:
+            array or list: An array of the values of a numeric column, or
+                a list of the values of any other column.
+
+        Raises:
+            KeyError: If the snapshot has no column name.
+        """
+        meta = self.__footer()["columns"][name]
+        with open(self.path, "rb") as f:
+            return self.__read_column(f, meta)
+
+    def records(self):
+        """Yield the (key, to_dict()) pair of each object, in order."""
+        footer = self.__footer()
+        with open(self.path, "rb") as f:
+            columns = {name: self.__read_column(f, meta)
+                       for name, meta in footer["columns"].items()}
+        for i in range(footer["rows"]):
+            record = {name: values[i] for name, values in columns.items()}
+            record["__class__"] = footer["class"]
+            yield "{}.{}".format(footer["class"], record["id"]), record
+
+    def __footer(self):
+        """Return the footer describing the columns of the snapshot."""
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("{} is not a columnar snapshot".format(
+                    self.path))
+            f.seek(-TRAILER.size, os.SEEK_END)
+            size, = TRAILER.unpack(f.read(TRAILER.size))
+            f.seek(-TRAILER.size - size, os.SEEK_END)
+            return json.loads(f.read(size))
+
+    @classmethod
+    def __write_column(cls, f, values):
+        """Write the column of values to f and return its description."""
+        types = set(type(v) for v in values)
+        if types <= {int}:
+            try:
+                return {"type": "q", "data": cls.__write_array(
+                    f, array("q", values))}
+            except OverflowError:
+                pass
+        elif types <= {int, float}:
+            return {"type": "d", "data": cls.__write_array(
+                f, array("d", values))}
+        if types <= {str}:
+            kind, strings = "str", values
+        else:
+            kind, strings = "json", [json.dumps(v) for v in values]
+        blobs = [s.encode() for s in strings]
+        offsets = array("q", [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return {"type": kind,
+                "offsets": cls.__write_array(f, offsets),
+                "data": cls.__write_blob(f, b"".join(blobs))}
+
+    @classmethod
+    def __write_array(cls, f, values):
+        """Write an array to f as little-endian and return its extent."""
+        if sys.byteorder == "big":
+            values.byteswap()
+        return cls.__write_blob(f, values.tobytes())
+
+    @staticmethod
+    def __write_blob(f, data):
+        """Write data to f at an 8-byte boundary and return its extent."""
+        f.write(b"\0" * (-f.tell() % 8))
+        start = f.tell()
+        f.write(data)
+        return [start, len(data)]
+
+    @staticmethod
+    def __read_array(f, typecode, extent):
+        """Return the array of typecode saved at extent of f."""
+        f.seek(extent[0])
+        values = array(typecode)
+        values.frombytes(f.read(extent[1]))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    @classmethod
+    def __read_column(cls, f, meta):
+        """Return the values of the column described by meta."""
+        if meta["type"] in ("q", "d"):
+            return cls.__read_array(f, meta["type"], meta["data"])
+        offsets = cls.__read_array(f, "q", meta["offsets"])
+        f.seek(meta["data"][0])
+        data = f.read(meta["data"][1])
+        strings = [data[offsets[i]:offsets[i + 1]].decode()
+                   for i in range(len(offsets) - 1)]
+        if meta["type"] == "json":
+            return [json.loads(s) for s in strings]
+        return strings
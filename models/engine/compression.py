@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Defines the compressions FileStorage files can be saved with.
+
+Each compression wraps a file object with a stdlib streaming compressor,
+so records are compressed as they are written and decompressed as they
+are read, without holding the whole file in memory. Compressed files are
+recognized on reload by their magic bytes. zlib files are written in the
+gzip format, a deflate stream with a header and checksum.
+"""
+import bz2
+import gzip
+import lzma
+
+
+def _gzip(f, mode, level):
+    """Return f wrapped by a gzip stream."""
+    if level is None:
+        level = 6
+    return gzip.GzipFile(fileobj=f, mode=mode, compresslevel=level, mtime=0)
+
+
+def _lzma(f, mode, level):
+    """Return f wrapped by an xz stream."""
+    if mode == "rb":
+        return lzma.LZMAFile(f, mode)
+    return lzma.LZMAFile(f, mode, preset=level)
+
+
+def _bz2(f, mode, level):
+    """Return f wrapped by a bzip2 stream."""
+    return bz2.BZ2File(f, mode, compresslevel=9 if level is None else level)
+
+
+COMPRESSIONS = {
+    "zlib": (b"\x1f\x8b", _gzip),
+    "lzma": (b"\xfd7zXZ\x00", _lzma),
+    "bz2": (b"BZh", _bz2)
+}
+
+
+def compressor(name, f, level=None):
+    """Return a file compressing what is written to it into f.
+
+    Closing the returned file finishes the stream but leaves f open.
+
+    Args:
+        name (str): The name of the compression, a key of COMPRESSIONS.
+        f (file): A binary file open for writing.
+        level (int): The compression level, or None for the default.
+    """
+    return COMPRESSIONS[name][1](f, "wb", level)
+
+
+def decompressor(f):
+    """Return the name of the compression of f and a file reading it.
+
+    Uncompressed files are returned as is, positioned at their start.
+
+    Args:
+        f (file): A binary file positioned at its start.
+
+    Returns:
+        tuple: The name of the compression, or None, and a binary file
+            yielding the uncompressed content of f.
+    """
+    head = f.read(max(len(magic) for magic, wrap in COMPRESSIONS.values()))
+    f.seek(0)
+    for name, (magic, wrap) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return name, wrap(f, "rb", None)
+    return None, f
@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+"""Defines the DBStorage class."""
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.amenity import Amenity
+from models.review import Review
+from models.engine.query import Query
+
+
+class DBStorage:
+    """Represent a SQLite storage engine.
+
+    Objects are kept in memory exactly like FileStorage, and save() writes
+    the objects created, changed or deleted since the last save in a single
+    transaction. Each class has its own table keyed by id.
+
+    Attributes:
+        __classes (dict): The model classes, by name.
+    """
+    __classes = {
+        "BaseModel": BaseModel,
+        "User": User,
+        "State": State,
+        "City": City,
+        "Place": Place,
+        "Amenity": Amenity,
+        "Review": Review
+    }
+
+    def __init__(self, path, *, pool_size=4):
+        """Initialize a new DBStorage.
+
+        Args:
+            path (str): The name of the SQLite database file.
+            pool_size (int): The number of pooled connections.
+        """
+        self.__objects = {}
+        self.__dirty = set()
+        self.__lock = threading.RLock()
+        self.__writing = threading.Lock()
+        self.__pool = queue.Queue()
+        for i in range(pool_size):
+            self.__pool.put(sqlite3.connect(path, check_same_thread=False))
+        with self.__connection() as conn:
+            for name in DBStorage.__classes:
+                conn.execute('CREATE TABLE IF NOT EXISTS "{}" '
+                             '(id TEXT PRIMARY KEY, record TEXT NOT NULL)'
+                             .format(name))
+
+    def all(self, cls=None):
+        """Return the dictionary __objects, or only the objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+        """
+        if cls is None:
+            return self.__objects
+        prefix = (cls if isinstance(cls, str) else cls.__name__) + "."
+        return {k: v for k, v in self.__objects.items()
+                if k.startswith(prefix)}
+
+    def count(self, cls=None):
+        """Return the number of objects, or of objects of cls."""
+        return len(self.all(cls))
+
+    def get(self, cls, id):
+        """Return the object of cls with the given id, or None.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        return self.__objects.get("{}.{}".format(name, id))
+
+    def reading(self):
+        """Return a context manager excluding changes to __objects.
+
+        The lock is reentrant, so the thread holding it may still store
+        and change objects.
+        """
+        return self.__lock
+
+    def indexes(self, cls):
+        """Return the secondary indexes of the objects of cls, none here.
+
+        Args:
+            cls (type or str): The class, or class name, of the objects.
+        """
+        return []
+
+    def query(self, cls):
+        """Return a Query over the objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to query.
+        """
+        return Query(self, cls)
+
+    def new(self, obj):
+        """Set in __objects obj with key <obj_class_name>.id"""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            self.__objects[key] = obj
+            self.__dirty.add(key)
+
+    def delete(self, obj=None):
+        """Delete obj from __objects if it's inside."""
+        if obj is None:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            if self.__objects.pop(key, None) is not None:
+                self.__dirty.add(key)
+
+    def touch(self, obj, name=None):
+        """Mark obj as changed since the last save, if it is stored."""
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", ""))
+        with self.__lock:
+            if self.__objects.get(key) is obj:
+                self.__dirty.add(key)
+
+    def save(self):
+        """Write the objects changed since the last save to the database."""
+        with self.__writing:
+            with self.__lock:
+                dirty, self.__dirty = self.__dirty, set()
+                rows = [(key, self.__objects.get(key)) for key in dirty]
+            try:
+                with self.__connection() as conn:
+                    for key, obj in rows:
+                        name, oid = key.split(".", 1)
+                        if obj is None:
+                            conn.execute('DELETE FROM "{}" WHERE id = ?'
+                                         .format(name), (oid,))
+                        else:
+                            conn.execute('INSERT OR REPLACE INTO "{}" '
+                                         '(id, record) VALUES (?, ?)'
+                                         .format(name),
+                                         (oid, json.dumps(obj.to_dict())))
+            except sqlite3.Error:
+                with self.__lock:
+                    self.__dirty |= dirty
+                raise
+
+    def flush(self):
+        """Do nothing, as save() never defers its writes."""
+        pass
+
+    def reload(self):
+        """Load every object saved in the database into __objects."""
+        with self.__connection() as conn:
+            for name, cls in DBStorage.__classes.items():
+                rows = conn.execute('SELECT id, record FROM "{}"'
+                                    .format(name))
+                for oid, record in rows:
+                    o = json.loads(record)
+                    del o["__class__"]
+                    self.new(cls(**o))
+                    self.__dirty.discard("{}.{}".format(name, oid))
+
+    def close(self):
+        """Close every pooled connection."""
+        while not self.__pool.empty():
+            self.__pool.get_nowait().close()
+
+    @contextmanager
+    def __connection(self):
+        """Borrow a pooled connection for the duration of a transaction."""
+        conn = self.__pool.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.__pool.put(conn)
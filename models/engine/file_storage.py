@@ -1,6 +1,16 @@
 #!/usr/bin/python3
 """Defines the FileStorage class."""
+import atexit
+import csv
+import fcntl
 import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from uuid import uuid4
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -8,42 +18,1466 @@ from models.city import City
 from models.place import Place
 from models.amenity import Amenity
 from models.review import Review
+from models.engine.codecs import CODECS, detect
+from models.engine.columns import Columns
+from models.engine.compression import COMPRESSIONS, compressor, decompressor
+from models.engine.indexes import AmenityIndex, GeoIndex, RangeIndex, \
+    RefIndex
+from models.engine.journal import Journal
+from models.engine.locks import KeyLocks, NoLock, RWLock
+from models.engine.lazy_objects import LazyObjects
+from models.engine.query import Query
+from models.engine.snapshot import Snapshot
+from models.engine.text_index import TextIndex
+from models.engine.views import AggregateView
 
 
 class FileStorage:
     """Represent an abstracted storage engine.
 
+    Every file is written aside, fsynced and renamed over its target, so a
+    crash never leaves a truncated store. Secondary indexes are kept up to
+    date by new(), delete() and touch(), and rebuilt on their next use
+    after a bulk change such as a lazy reload.
+
     Attributes:
         __file_path (str): The name of the file to save objects to.
         __objects (dict): A dictionary of instantiated objects.
+        __encoded (dict): The last saved encoding of each object.
+        __dirty (set): The keys created, changed or deleted since the
+            last save.
+        __partition (dict): The keys of the objects of each class, by
+            class name.
+        __indexes (dict): The secondary indexes, by name. The foreign
+            keys of City, Place and Review, the coordinates and amenities
+            of Place and the text of Place, Review and User are always
+            indexed, and the price_by_city and reviews_by_place views
+            always maintained.
+        __stale (bool): Whether the indexes must be rebuilt before use.
+        __fresh (set): The names of the indexes up to date even though
+            __stale is set, e.g. built before a lazy reload.
+        __restorable (dict): The files of the persistent indexes saved for
+            the reloaded files, by index name, read on the first use of
+            the indexes unless their class changes first.
+        __generation (int): In shared mode, the generation of __file_path
+            __objects was last merged with or written as, or None.
+        __base (dict): In shared mode, the encoded record of each object
+            in __file_path when this process last merged or wrote it.
+        __committed (tuple): The number, codec and partitions of the last
+            version published for snapshot(), or None if it must be
+            rebuilt first, e.g. after a reload.
     """
     __file_path = "file.json"
     __objects = {}
+    __classes = {
+        "BaseModel": BaseModel,
+        "User": User,
+        "State": State,
+        "City": City,
+        "Place": Place,
+        "Amenity": Amenity,
+        "Review": Review
+    }
+    __tracked = None
+    __encoded = {}
+    __encoded_codec = None
+    __dirty = set()
+    __partition = {}
+    __partitioned = False
+    __indexes = {}
+    __class_indexes = {}
+    __stale = True
+    __fresh = set()
+    __restorable = {}
+    __generation = None
+    __base = {}
+    __committed = None
+    __foreign_keys = (
+        ("City", "state_id"),
+        ("Place", "city_id"),
+        ("Place", "user_id"),
+        ("Review", "place_id"),
+        ("Review", "user_id")
+    )
+    __text_attrs = (
+        ("Place", ("name", "description")),
+        ("Review", ("text",)),
+        ("User", ("first_name", "last_name"))
+    )
+    __views = (
+        ("price_by_city", "Place", "city_id", "price_by_night"),
+        ("reviews_by_place", "Review", "place_id", None)
+    )
+
+    def __init__(self, *, journal=False, compact_threshold=1 << 20,
+                 sharded=False, lazy=False, group_commit=0.0,
+                 autosave=None, codec="json", compression=None,
+                 compression_level=None, range_indexes=(), shared=False,
+                 thread_safe=False):
+        """Initialize a new FileStorage.
+
+        Args:
+            journal (bool): Whether to append the records changed by each
+                save to <__file_path>.journal instead of rewriting
+                __file_path. The journal is never compressed.
+            compact_threshold (int): The journal size in bytes past which
+                a background compaction folds it into __file_path.
+            sharded (bool): Whether to save each class to its own file,
+                e.g. file.Review.json, rewriting only the shards of the
+                classes that changed. While no shard exists, reload()
+                loads an unsharded __file_path and the next save() writes
+                the shard of every class loaded.
+            lazy (bool): Whether reload() memory-maps the files and only
+                indexes the offset of each record, __objects becoming a
+                LazyObjects that instantiates objects on first access.
+                Compressed files are always reloaded eagerly.
+            group_commit (float): The number of seconds a save waits for
+                other saves to join its write.
+            autosave (float): If given, save() returns at once and a
+                background thread performs the requested saves once none
+                was requested for that many seconds. Implies thread_safe,
+                since that thread reads the objects other threads change.
+            codec (str): The name of the codec files are saved with, one
+                of "json", "binary" or "pickle". reload() detects the
+                codec of each file.
+            compression (str): If given, the name of the compression files
+                are streamed to disk with, one of "zlib", "lzma" or "bz2".
+                reload() detects the compression of each file.
+            compression_level (int): The level files are compressed at, or
+                None for the default level of compression.
+            range_indexes (iterable): The "<class name>.<attribute>" names
+                of the numeric attributes to keep a sorted index of, e.g.
+                "Place.price_by_night".
+            shared (bool): Whether other processes may save to __file_path
+                concurrently. Writes then hold an flock() on
+                <__file_path>.lock and bump the generation kept in
+                <__file_path>.version. Saves and reloads finding it moved
+                first merge the records on disk attribute by attribute,
+                the changes of this process winning.
+            thread_safe (bool): Whether several threads may use storage
+                concurrently. A readers-writer lock then lets any number
+                of threads read at once, while new(), delete(), touch(),
+                reload() and the encoding step of save() are exclusive.
+
+        Raises:
+            ValueError: If both journal and sharded are set, if shared is
+                set with journal, sharded or lazy, if thread_safe or
+                autosave is set with lazy, if codec or compression is
+                unknown, or if journal is set with another codec than json.
+        """
+        if journal and sharded:
+            raise ValueError("journal and sharded modes are exclusive")
+        if shared and (journal or sharded or lazy):
+            raise ValueError("shared mode requires eager snapshot saves")
+        thread_safe = thread_safe or autosave is not None
+        if thread_safe and lazy:
+            raise ValueError("thread-safe mode requires eager reloads")
+        if codec not in CODECS:
+            raise ValueError("unknown codec {}".format(codec))
+        if journal and codec != "json":
+            raise ValueError("journal mode requires the json codec")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError("unknown compression {}".format(compression))
+        self.__codec = CODECS[codec]
+        self.__compression = compression
+        self.__compression_level = compression_level
+        self.__journaled = journal
+        self.__sharded = sharded
+        self.__lazy = lazy
+        self.__shared = shared
+        self.__thread_safe = thread_safe
+        self.__compact_threshold = compact_threshold
+        self.__group_commit = group_commit
+        self.__lock = threading.Lock()
+        self.__rw = RWLock() if thread_safe else NoLock()
+        self.__key_locks = KeyLocks()
+        self.__refreshing = threading.Lock()
+        self.__compacting = threading.Lock()
+        self.__commit = threading.Condition()
+        self.__requested = 0
+        self.__committed = 0
+        self.__leading = False
+        self.__changes = []
+        self.__shards = set()
+        self.__autosave = autosave
+        self.__deferred = threading.Event()
+        self.__last_save = 0.0
+        self.__writer = None
+        self.__writer_error = None
+        for cls_name, attr in FileStorage.__foreign_keys:
+            if "{}.{}".format(cls_name, attr) not in FileStorage.__indexes:
+                self.add_index(RefIndex(cls_name, attr))
+        if "Place:geo" not in FileStorage.__indexes:
+            self.add_index(GeoIndex("Place"))
+        if "Place:amenities" not in FileStorage.__indexes:
+            self.add_index(AmenityIndex())
+        for view in FileStorage.__views:
+            if view[0] not in FileStorage.__indexes:
+                self.add_index(AggregateView(*view))
+        for cls_name, attrs in FileStorage.__text_attrs:
+            if cls_name + ":text" not in FileStorage.__indexes:
+                self.add_index(TextIndex(cls_name, attrs))
+        for name in range_indexes:
+            if name + ":range" not in FileStorage.__indexes:
+                self.add_index(RangeIndex(*name.split(".")))
+
+    def all(self, cls=None):
+        """Return the dictionary __objects, or only the objects of cls.
+
+        In thread-safe mode iterate __objects within reading(), or use
+        snapshot(), since other threads may change it meanwhile.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+        """
+        with self.__rw.read():
+            if cls is None:
+                return FileStorage.__objects
+            odict = FileStorage.__objects
+            return {key: odict[key] for key in self.__keys(cls)}
+
+    def count(self, cls=None):
+        """Return the number of objects, or of objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+        """
+        with self.__rw.read():
+            if cls is None:
+                return len(FileStorage.__objects)
+            return len(self.__keys(cls))
+
+    def get(self, cls, id):
+        """Return the object of cls with the given id, or None.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        with self.__rw.read():
+            return FileStorage.__objects.get("{}.{}".format(name, id))
 
-    def all(self):
-        """Return the dictionary __objects."""
-        return FileStorage.__objects
+    def reading(self):
+        """Return a context manager holding the storage for reading.
+
+        In thread-safe mode other threads may read meanwhile, but no
+        object is created, changed, deleted or saved until it exits. The
+        thread holding it cannot change objects either.
+        """
+        return self.__rw.read()
+
+    def locked(self, obj):
+        """Return the lock of one object, for read-modify-write updates.
+
+        The lock is reentrant, and only excludes the threads taking the
+        lock of the same object, e.g.
+            with storage.locked(place):
+                place.number_rooms += 1
+
+        Args:
+            obj (BaseModel or str): The object, or its key.
+        """
+        if not isinstance(obj, str):
+            obj = "{}.{}".format(obj.__class__.__name__, obj.id)
+        return self.__key_locks.lock(obj)
 
     def new(self, obj):
         """Set in __objects obj with key <obj_class_name>.id"""
-        ocname = obj.__class__.__name__
-        FileStorage.__objects["{}.{}".format(ocname, obj.id)] = obj
+        with self.__rw.write():
+            ocname = obj.__class__.__name__
+            key = "{}.{}".format(ocname, obj.id)
+            self.__sync()
+            FileStorage.__objects[key] = obj
+            FileStorage.__dirty.add(key)
+            if FileStorage.__partitioned:
+                FileStorage.__partition.setdefault(ocname, {})[key] = None
+            self.__reindex(key, obj)
 
-    def save(self):
-        """Serialize __objects to the JSON file __file_path."""
+    def delete(self, obj=None):
+        """Delete obj from __objects if it's inside."""
+        with self.__rw.write():
+            if obj is None:
+                return
+            key = "{}.{}".format(obj.__class__.__name__, obj.id)
+            self.__sync()
+            if FileStorage.__objects.pop(key, None) is not None:
+                FileStorage.__dirty.add(key)
+                if FileStorage.__partitioned:
+                    FileStorage.__partition.get(
+                        obj.__class__.__name__, {}).pop(key, None)
+                self.__reindex(key, None)
+
+    def touch(self, obj, name=None):
+        """Mark obj as changed since the last save, if it is stored.
+
+        Called by BaseModel whenever an attribute is set. Changes made in
+        place to mutable attributes (e.g. amenity_ids.append) go unseen,
+        so reassign the attribute instead. Objects not stored yet, such as
+        those being initialized, return without taking the lock.
+
+        Args:
+            obj (BaseModel): The changed object.
+            name (str): The name of the attribute set, if known.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", ""))
+        if key not in FileStorage.__objects:
+            return
+        with self.__rw.write():
+            self.__sync()
+            if FileStorage.__objects.get(key) is obj:
+                FileStorage.__dirty.add(key)
+                self.__reindex(key, obj, name)
+
+    def add_index(self, index):
+        """Register a secondary index, built on its first use.
+
+        An index already registered under the same name is replaced.
+
+        Args:
+            index (Index): The index to register.
+        """
+        with self.__rw.write():
+            old = FileStorage.__indexes.get(index.name)
+            if old is not None:
+                FileStorage.__class_indexes[old.cls_name].remove(old)
+            FileStorage.__indexes[index.name] = index
+            FileStorage.__class_indexes.setdefault(index.cls_name, []).append(
+                index)
+            FileStorage.__fresh.discard(index.name)
+            FileStorage.__restorable.pop(index.name, None)
+            FileStorage.__stale = True
+
+    def index(self, name):
+        """Return the up to date secondary index registered as name.
+
+        Raises:
+            KeyError: If no index is registered as name.
+        """
+        with self.__rw.read():
+            index = FileStorage.__indexes[name]
+            self.__refresh()
+            return index
+
+    def rebuild_index(self, name):
+        """Rebuild from scratch the index or view registered as name.
+
+        Incremental maintenance should make this unnecessary, it exists to
+        verify it.
+
+        Raises:
+            KeyError: If no index is registered as name.
+        """
+        with self.__rw.write():
+            index = self.index(name)
+            odict = FileStorage.__objects
+            index.build((key, odict[key])
+                        for key in self.__keys(index.cls_name))
+            return index
+
+    def aggregate(self, name, group):
+        """Return the aggregates of one group of the view registered as name.
+
+        Args:
+            name (str): The name of the view, e.g. "price_by_city".
+            group: The value grouped by, e.g. the id of a City.
+
+        Raises:
+            KeyError: If no view is registered as name.
+        """
+        with self.__rw.read():
+            return self.index(name).get(group)
+
+    def places_per_state(self, state_id):
+        """Return the number of Places in the Cities of a State.
+
+        Sums the price_by_city counts of the Cities of the State.
+
+        Args:
+            state_id (str): The id of the State.
+        """
+        with self.__rw.read():
+            view = self.index("price_by_city")
+            return sum(view.get(key.split(".", 1)[1])["count"]
+                       for key in self.index("City.state_id").lookup(state_id))
+
+    def indexes(self, cls):
+        """Return the up to date secondary indexes of the objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, of the objects.
+        """
+        with self.__rw.read():
+            name = cls if isinstance(cls, str) else cls.__name__
+            self.__refresh()
+            return list(FileStorage.__class_indexes.get(name, ()))
+
+    def query(self, cls):
+        """Return a Query over the objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to query.
+        """
+        return Query(self, cls)
+
+    def __refresh(self):
+        """Restore or rebuild the secondary indexes if they are stale.
+
+        Readers holding the storage for reading rebuild them one at a time.
+        """
+        self.__sync()
+        if not FileStorage.__stale:
+            return
+        with self.__refreshing:
+            if not FileStorage.__stale:
+                return
+            fresh = FileStorage.__fresh
+            odict = FileStorage.__objects
+            for cls_name, indexes in FileStorage.__class_indexes.items():
+                for idx in indexes:
+                    if idx.name not in fresh and not self.__restore(idx):
+                        idx.build((key, odict[key])
+                                  for key in self.__keys(cls_name))
+            FileStorage.__fresh = set()
+            FileStorage.__restorable = {}
+            FileStorage.__stale = False
+
+    def by_ref(self, cls, attr, value):
+        """Return the objects of cls whose attribute attr equals value.
+
+        Args:
+            cls (type): The class of the objects, e.g. Review.
+            attr (str): The indexed attribute, e.g. "place_id".
+            value (str): The value looked up, e.g. the id of a Place.
+
+        Raises:
+            KeyError: If attr of cls is not indexed.
+        """
+        with self.__rw.read():
+            keys = self.index("{}.{}".format(cls.__name__, attr)).lookup(value)
+            return [FileStorage.__objects[key] for key in keys]
+
+    def by_range(self, cls, attr, lo=None, hi=None):
+        """Return the objects of cls whose attr is between lo and hi.
+
+        Objects are returned by increasing attr, bounds included.
+
+        Args:
+            cls (type): The class of the objects, e.g. Place.
+            attr (str): The indexed attribute, e.g. "price_by_night".
+            lo (int or float): The lower bound, or None for no bound.
+            hi (int or float): The upper bound, or None for no bound.
+
+        Raises:
+            KeyError: If attr of cls has no sorted index.
+        """
+        with self.__rw.read():
+            index = self.index("{}.{}:range".format(cls.__name__, attr))
+            return [FileStorage.__objects[key] for key in index.range(lo, hi)]
+
+    def places_near(self, lat, lon, radius_km, limit=None):
+        """Return the Places within radius_km of a point, nearest first.
+
+        Args:
+            lat (float): The latitude of the point.
+            lon (float): The longitude of the point.
+            radius_km (float): The maximum great-circle distance in km.
+            limit (int): The maximum number of Places, or None for all.
+        """
+        with self.__rw.read():
+            found = self.index("Place:geo").near(lat, lon, radius_km, limit)
+            return [FileStorage.__objects[key] for dist, key in found]
+
+    def places_in_bbox(self, south, west, north, east):
+        """Return the Places located in a bounding box.
+
+        Args:
+            south (float): The minimum latitude.
+            west (float): The minimum longitude, greater than east if the
+                box crosses the antimeridian.
+            north (float): The maximum latitude.
+            east (float): The maximum longitude.
+        """
+        with self.__rw.read():
+            keys = self.index("Place:geo").in_bbox(south, west, north, east)
+            return [FileStorage.__objects[key] for key in keys]
+
+    def places_with_amenities(self, all_of=(), any_of=()):
+        """Return the Places having amenities.
+
+        Args:
+            all_of (iterable): Amenities, or amenity ids, every Place must
+                have.
+            any_of (iterable): Amenities, or amenity ids, a Place must have
+                one of, ignored if empty.
+        """
+        with self.__rw.read():
+            index = self.index("Place:amenities")
+            keys = index.having([getattr(a, "id", a) for a in all_of],
+                                [getattr(a, "id", a) for a in any_of])
+            return [FileStorage.__objects[key] for key in keys]
+
+    def search(self, text, cls=None, limit=10):
+        """Return the objects best matching the words of text.
+
+        Objects are ranked by the BM25 score of their text attributes,
+        each class being scored against its own objects.
+
+        Args:
+            text (str): The words searched for.
+            cls (type or str): If given, the class, or class name, to
+                search, otherwise every class with a text index.
+            limit (int): The maximum number of objects, or None for all.
+        """
+        with self.__rw.read():
+            if cls is None:
+                names = [name for name, attrs in FileStorage.__text_attrs]
+            else:
+                names = [cls if isinstance(cls, str) else cls.__name__]
+            ranked = []
+            for name in names:
+                ranked.extend(self.index(name + ":text").search(text, limit))
+            ranked.sort(key=lambda s: (-s[0], s[1]))
+            odict = FileStorage.__objects
+            return [odict[key] for score, key in ranked[:limit]]
+
+    def snapshot(self):
+        """Return an immutable Snapshot of the objects as of the last save.
+
+        Objects created, changed or deleted since are not reflected. Taking
+        a snapshot is O(1), except for the first one after a reload, which
+        encodes the objects not cached yet. Later saves copy the partitions
+        of the classes they change, so readers never wait for them.
+        """
+        self.__sync()
+        committed = FileStorage.__committed
+        if committed is None or committed[1] is not self.__codec:
+            with self.__rw.read(), self.__lock:
+                self.__build_committed()
+                committed = FileStorage.__committed
+        return Snapshot(*committed, FileStorage.__classes)
+
+    def bulk_load(self, path, cls, batch=None, fmt=None):
+        """Create objects of cls from the rows of a JSONL or CSV file.
+
+        Rows are streamed and each becomes an object without a save of its
+        own, set up directly rather than attribute by attribute through
+        BaseModel.__init__, which would mark it changed each time. The
+        indexes of cls are left stale meanwhile, and rebuilt in a
+        single pass on their next use. The objects are saved at the end,
+        and also every batch rows if batch is given.
+
+        Each JSONL line is an object of attributes. The first CSV line
+        names the attributes, whose values are converted to the type of
+        the class attribute of the same name: list attributes are read as
+        JSON, and empty cells are skipped. The objects of the rows read
+        before a malformed one are kept, but not saved.
+
+        Args:
+            path (str): The name of the file to load.
+            cls (type or str): The class, or class name, of the objects.
+            batch (int): If given, the number of rows between two saves.
+            fmt (str): "jsonl" (or "ndjson") or "csv", guessed from the
+                extension of path by default.
+
+        Returns:
+            int: The number of objects created.
+
+        Raises:
+            KeyError: If cls is unknown.
+            ValueError: If the format is unknown or a row is malformed.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        klass = FileStorage.__classes[name]
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip(".").lower()
+        fmt = self.__format(fmt)
+        self.__defer_indexes(name)
+        count = 0
+        with open(path, newline="") as f:
+            if fmt == "jsonl":
+                rows = self.__jsonl_rows(f)
+            else:
+                rows = self.__csv_rows(f, klass)
+            for o in rows:
+                self.new(self.__instantiate(klass, o))
+                count += 1
+                if batch and count % batch == 0:
+                    self.save()
+        self.save()
+        return count
+
+    def records(self, cls=None, fields=None):
+        """Yield the (key, to_dict()) pair of the objects, or of cls.
+
+        Records are produced one at a time. In lazy mode the records of
+        objects not instantiated yet are decoded from the reloaded file
+        and left uninstantiated, so memory stays constant whatever the
+        size of the store.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+            fields (list): If given, the only attributes of each record,
+                in this order. Attributes an object lacks are left out.
+        """
+        with self.__rw.read():
+            if cls is None:
+                keys = list(FileStorage.__objects)
+            else:
+                keys = list(self.__keys(cls))
         odict = FileStorage.__objects
-        objdict = {obj: odict[obj].to_dict() for obj in odict.keys()}
-        with open(FileStorage.__file_path, "w") as f:
-            json.dump(objdict, f)
+        lazy = isinstance(odict, LazyObjects)
+        for key in keys:
+            if lazy and odict.is_pending(key):
+                record = odict.record(key)
+            else:
+                obj = odict.get(key)
+                if obj is None:
+                    continue
+                record = obj.to_dict()
+            if fields is not None:
+                record = {f: record[f] for f in fields if f in record}
+            yield key, record
+
+    def export(self, cls, fmt, fileobj, fields=None):
+        """Stream the records of the objects of cls to a text file.
+
+        JSONL files hold one JSON object per line. CSV files start with a
+        header naming the fields, by default id, created_at, updated_at
+        and the class attributes of cls, list values being written as
+        JSON. Both can be loaded back with bulk_load().
+
+        Args:
+            cls (type or str): The class, or class name, to export.
+            fmt (str): "jsonl" (or "ndjson") or "csv".
+            fileobj (file): A text file open for writing, with newline=""
+                for CSV.
+            fields (list): If given, the only attributes exported, in this
+                order.
+
+        Returns:
+            int: The number of records written.
+
+        Raises:
+            KeyError: If cls is unknown.
+            ValueError: If fmt is unknown.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        klass = FileStorage.__classes[name]
+        fmt = self.__format(fmt)
+        count = 0
+        if fmt == "jsonl":
+            for key, record in self.records(name, fields):
+                fileobj.write(json.dumps(record) + "\n")
+                count += 1
+            return count
+        if fields is None:
+            fields = ["id", "created_at", "updated_at"] + [
+                attr for attr, value in vars(klass).items()
+                if not attr.startswith("_") and not callable(value)]
+        writer = csv.DictWriter(fileobj, fields, extrasaction="ignore")
+        writer.writeheader()
+        for key, record in self.records(name, fields):
+            writer.writerow({f: json.dumps(v) if isinstance(v, (list, dict))
+                             else v for f, v in record.items()})
+            count += 1
+        return count
+
+    def save(self):
+        """Serialize __objects to the JSON file __file_path.
+
+        Only the records changed since the last save are re-encoded, the
+        others are written from the encoded cache. Returns once the changes
+        are durably written, possibly by the write of a concurrent save,
+        or right away in autosave mode.
+
+        Raises:
+            Exception: In autosave mode, what the last write of the writer
+                thread raised, if it failed.
+        """
+        if self.__autosave is None:
+            self.__persist()
+            return
+        error, self.__writer_error = self.__writer_error, None
+        self.__last_save = time.monotonic()
+        self.__deferred.set()
+        if self.__writer is None:
+            self.__writer = threading.Thread(target=self.__autosaver,
+                                             daemon=True)
+            self.__writer.start()
+            atexit.register(self.flush)
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Perform now the saves deferred to the autosave thread, if any.
+
+        The persistent indexes are then written next to __file_path, so
+        after the next reload() their first use restores them instead of
+        rebuilding them. The autosave thread only performs the saves, so
+        the indexes are written on explicit flushes and at exit.
+        """
+        self.__flush_saves()
+        self.__save_indexes()
+
+    def __flush_saves(self):
+        """Perform now the saves deferred to the autosave thread, if any."""
+        if self.__deferred.is_set():
+            self.__deferred.clear()
+            try:
+                self.__persist()
+            except BaseException:
+                self.__deferred.set()
+                raise
+
+    def __autosaver(self):
+        """Flush the deferred saves once no save was requested for a while."""
+        while True:
+            self.__deferred.wait()
+            idle = time.monotonic() - self.__last_save
+            while idle < self.__autosave:
+                time.sleep(self.__autosave - idle)
+                idle = time.monotonic() - self.__last_save
+            try:
+                self.__flush_saves()
+            except Exception as e:
+                self.__writer_error = e
+                time.sleep(self.__autosave)
+            else:
+                self.__writer_error = None
+
+    def __persist(self):
+        """Encode the dirty objects and durably write them."""
+        with self.__rw.write(), self.__lock:
+            self.__sync()
+            odict = FileStorage.__objects
+            encoded = FileStorage.__encoded
+            dirty, FileStorage.__dirty = FileStorage.__dirty, set()
+            changes = []
+            try:
+                for key in dirty:
+                    if key in odict:
+                        encoded[key] = self.__codec.encode(
+                            odict[key].to_dict())
+                        changes.append((key, encoded[key]))
+                    else:
+                        encoded.pop(key, None)
+                        changes.append((key, None))
+                    self.__shards.add(key.split(".")[0])
+            except BaseException:
+                FileStorage.__dirty |= dirty
+                raise
+            self.__changes.extend(changes)
+            self.__publish(changes)
+        with self.__commit:
+            self.__requested += 1
+            ticket = self.__requested
+            while self.__leading and self.__committed < ticket:
+                self.__commit.wait()
+            if self.__committed >= ticket:
+                return
+            self.__leading = True
+        written = 0
+        try:
+            time.sleep(self.__group_commit)
+            with self.__commit:
+                target = self.__requested
+            self.__write()
+            written = target
+        finally:
+            with self.__commit:
+                self.__leading = False
+                self.__committed = max(self.__committed, written)
+                self.__commit.notify_all()
 
     def reload(self):
         """Deserialize the JSON file __file_path to __objects, if it exists."""
+        with self.__rw.write():
+            if self.__sharded:
+                shards = [self.__shard(name) for name in FileStorage.__classes]
+                if any(os.path.exists(path) for path in shards):
+                    for name in FileStorage.__classes:
+                        self.reload_shard(name)
+                else:
+                    self.__load(FileStorage.__file_path)
+                    with self.__lock:
+                        self.__shards.update(
+                            key.split(".")[0] for key in FileStorage.__objects)
+                self.__load_indexes()
+                return
+            if self.__shared:
+                with self.__file_lock(fcntl.LOCK_SH):
+                    self.__merge(FileStorage.__dirty)
+                self.__load_indexes()
+                return
+            self.__load(FileStorage.__file_path)
+            if self.__journaled:
+                objdict = {}
+                for key, record in self.__journal().replay():
+                    objdict[key] = record
+                for key, record in objdict.items():
+                    if record is None:
+                        obj = FileStorage.__objects.get(key)
+                        if obj is not None:
+                            self.delete(obj)
+                        FileStorage.__dirty.discard(key)
+                        FileStorage.__encoded.pop(key, None)
+                self.__register({k: o for k, o in objdict.items() if o})
+            self.__load_indexes()
+
+    def reload_shard(self, cls):
+        """Deserialize the shard file of a single class, if it exists.
+
+        Args:
+            cls (type or str): The class, or class name, to reload.
+        """
+        with self.__rw.write():
+            name = cls if isinstance(cls, str) else cls.__name__
+            self.__load(self.__shard(name))
+
+    def save_columns(self, cls):
+        """Write a columnar snapshot of the objects of cls.
+
+        The snapshot is kept next to __file_path, independently of save().
+
+        Args:
+            cls (type or str): The class, or class name, to snapshot.
+        """
+        with self.__rw.read():
+            name = cls if isinstance(cls, str) else cls.__name__
+            records = [obj.to_dict() for obj in self.all(name).values()]
+            self.__columns(name).write(FileStorage.__classes[name], records)
+
+    def reload_columns(self, cls):
+        """Instantiate the objects of the columnar snapshot of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to reload.
+        """
+        with self.__rw.write():
+            name = cls if isinstance(cls, str) else cls.__name__
+            FileStorage.__committed = None
+            try:
+                records = self.__columns(name).records()
+                for key, o in records:
+                    self.__hydrate(o)
+                    FileStorage.__encoded.pop(key, None)
+            except FileNotFoundError:
+                return
+
+    def column(self, cls, attr):
+        """Return attr of every object in the columnar snapshot of cls.
+
+        Only that column is read, no object is instantiated.
+
+        Args:
+            cls (type or str): The class, or class name, of the snapshot.
+            attr (str): The name of the attribute, e.g. "price_by_night".
+
+        Raises:
+            FileNotFoundError: If cls has no columnar snapshot.
+            KeyError: If the snapshot has no column attr.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        return self.__columns(name).column(attr)
+
+    def compact(self):
+        """Fold the journal into a new snapshot of __file_path."""
+        if not self.__journaled:
+            return
+        with self.__compacting:
+            journal = self.__journal()
+            with self.__rw.read(), self.__lock:
+                journal.rotate()
+                records = list(self.__records())
+            self.__dump(FileStorage.__file_path, records)
+            journal.discard_old()
+
+    def __write(self):
+        """Durably write the changes gathered by the saves so far.
+
+        The changes are kept for the next write if this one fails. The
+        records are gathered while holding the storage for reading, or for
+        writing if the changes of other processes must be merged first. In
+        thread-safe mode the files are then written once it is released,
+        so objects may change meanwhile.
+        """
+        rw = self.__rw.write() if self.__shared else self.__rw.read()
+        with rw:
+            self.__lock.acquire()
+            changes, self.__changes = self.__changes, []
+            shards, self.__shards = self.__shards, set()
+            try:
+                dumps = self.__gather(changes, shards)
+            except BaseException:
+                self.__changes[:0] = changes
+                self.__shards |= shards
+                self.__lock.release()
+                raise
         try:
-            with open(FileStorage.__file_path) as f:
-                objdict = json.load(f)
-                for o in objdict.values():
-                    cls_name = o["__class__"]
-                    del o["__class__"]
-                    self.new(eval(cls_name)(**o))
+            for path, records in dumps:
+                self.__dump(path, records)
+        except BaseException:
+            self.__changes[:0] = changes
+            self.__shards |= shards
+            raise
+        finally:
+            self.__lock.release()
+        if self.__journaled and not self.__compacting.locked():
+            if self.__journal().size() > self.__compact_threshold:
+                threading.Thread(target=self.compact, daemon=True).start()
+
+    def __gather(self, changes, shards):
+        """Return the (path, records) pair of each file to rewrite.
+
+        Journal and shared saves are written right away instead. In
+        thread-safe mode the records are read into lists.
+
+        Args:
+            changes (list): Pairs of a key and its encoded record, or None
+                if the key was destroyed.
+            shards (set): The names of the classes changed.
+        """
+        dumps = []
+        if self.__sharded:
+            dumps = [(self.__shard(name), self.__records(name))
+                     for name in shards]
+        elif self.__journaled:
+            self.__journal().append(changes)
+        elif self.__shared:
+            with self.__file_lock(fcntl.LOCK_EX):
+                generation = self.__read_generation()
+                if generation != FileStorage.__generation:
+                    local = {key for key, enc in changes}
+                    self.__merge(local | FileStorage.__dirty)
+                records = list(self.__records())
+                self.__dump(FileStorage.__file_path, records)
+                self.__write_generation(generation + 1)
+                FileStorage.__base = dict(records)
+        else:
+            dumps = [(FileStorage.__file_path, self.__records())]
+        if self.__thread_safe:
+            dumps = [(path, list(records)) for path, records in dumps]
+        return dumps
+
+    def __sync(self):
+        """Reset the state derived from __objects if it was replaced."""
+        if FileStorage.__tracked is not FileStorage.__objects:
+            FileStorage.__tracked = FileStorage.__objects
+            FileStorage.__encoded = {}
+            FileStorage.__dirty = set(FileStorage.__objects)
+            FileStorage.__partitioned = False
+            FileStorage.__stale = True
+            FileStorage.__fresh = set()
+            FileStorage.__restorable = {}
+            FileStorage.__base = {}
+            FileStorage.__committed = None
+        if FileStorage.__encoded_codec is not self.__codec:
+            FileStorage.__encoded_codec = self.__codec
+            FileStorage.__encoded = {}
+
+    def __keys(self, cls):
+        """Return the keys of the objects of cls, in insertion order.
+
+        Args:
+            cls (type or str): The class, or class name.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.__sync()
+        if not FileStorage.__partitioned:
+            partition = {}
+            for key in FileStorage.__objects:
+                partition.setdefault(key.split(".")[0], {})[key] = None
+            FileStorage.__partition = partition
+            FileStorage.__partitioned = True
+        return FileStorage.__partition.get(name, {})
+
+    def __reindex(self, key, obj, name=None):
+        """Update the indexes of the class of key, unless they are stale.
+
+        Args:
+            key (str): The key of the stored, changed or deleted object.
+            obj (BaseModel): The object stored under key, or None.
+            name (str): If given, only the indexes on this attribute.
+        """
+        for idx in FileStorage.__class_indexes.get(key.split(".")[0], ()):
+            if FileStorage.__stale and idx.name not in FileStorage.__fresh:
+                FileStorage.__restorable.pop(idx.name, None)
+                continue
+            if name is None or name in idx.attrs:
+                idx.update(key, obj)
+
+    def __records(self, cls_name=None):
+        """Yield the saved (key, encoded record) pair of each object.
+
+        Records are taken from the encoded cache, from the file they were
+        lazily indexed from, or encoded and cached. Objects never saved
+        since they were last changed are skipped.
+
+        Args:
+            cls_name (str): If given, only yield the records of this class.
+        """
+        odict = FileStorage.__objects
+        encoded = FileStorage.__encoded
+        lazy = isinstance(odict, LazyObjects)
+        keys = odict if cls_name is None else list(self.__keys(cls_name))
+        for key in keys:
+            if key in encoded:
+                yield key, encoded[key]
+            elif key in FileStorage.__dirty:
+                continue
+            elif lazy and odict.is_pending(key):
+                yield key, odict.raw(key, self.__codec)
+            else:
+                encoded[key] = self.__codec.encode(odict[key].to_dict())
+                yield key, encoded[key]
+
+    def __publish(self, changes):
+        """Publish a new version for snapshot(), if one was ever taken.
+
+        The partitions of the classes changed are copied, never mutated,
+        since older snapshots may still be reading them.
+
+        Args:
+            changes (list): Pairs of a key and its encoded record, or None
+                if the key was destroyed.
+        """
+        committed = FileStorage.__committed
+        if committed is None or not changes:
+            return
+        version, codec, partitions = committed
+        if codec is not self.__codec:
+            FileStorage.__committed = None
+            return
+        partitions = dict(partitions)
+        copied = set()
+        for key, enc in changes:
+            name = key.split(".")[0]
+            if name not in copied:
+                partitions[name] = dict(partitions.get(name, {}))
+                copied.add(name)
+            if enc is None:
+                partitions[name].pop(key, None)
+            else:
+                partitions[name][key] = enc
+        FileStorage.__committed = (version + 1, codec, partitions)
+
+    def __build_committed(self):
+        """Publish a version of every saved object for snapshot().
+
+        Objects never saved are left out, and objects changed or deleted
+        since their last save are published as then saved.
+        """
+        partitions = {}
+        encoded = FileStorage.__encoded
+        for key, enc in self.__records():
+            partitions.setdefault(key.split(".")[0], {})[key] = enc
+        for key in FileStorage.__dirty:
+            if key in encoded and key not in FileStorage.__objects:
+                partitions.setdefault(key.split(".")[0], {})[key] = \
+                    encoded[key]
+        version = FileStorage.__committed[0] + 1 \
+            if FileStorage.__committed else 0
+        FileStorage.__committed = (version, self.__codec, partitions)
+
+    def __defer_indexes(self, cls_name):
+        """Leave the indexes of cls_name stale until their next use.
+
+        The other indexes stay up to date, so only those of cls_name are
+        rebuilt.
+        """
+        names = {idx.name
+                 for idx in FileStorage.__class_indexes.get(cls_name, ())}
+        with self.__rw.write():
+            if FileStorage.__stale:
+                FileStorage.__fresh -= names
+            else:
+                FileStorage.__fresh = set(FileStorage.__indexes) - names
+                FileStorage.__stale = True
+
+    @staticmethod
+    def __instantiate(klass, o):
+        """Return a new instance of klass with the attributes of o.
+
+        Like klass(**o), but without going through __setattr__, nor
+        registering the instance in storage.
+        """
+        tform = "%Y-%m-%dT%H:%M:%S.%f"
+        obj = object.__new__(klass)
+        now = datetime.today()
+        obj.__dict__.update(id=str(uuid4()), created_at=now, updated_at=now)
+        o.pop("__class__", None)
+        for name in ("created_at", "updated_at"):
+            if name in o:
+                o[name] = datetime.strptime(o[name], tform)
+        obj.__dict__.update(o)
+        return obj
+
+    @staticmethod
+    def __format(fmt):
+        """Return the name of a bulk file format, "jsonl" or "csv".
+
+        Raises:
+            ValueError: If fmt is unknown.
+        """
+        fmt = "jsonl" if fmt == "ndjson" else fmt
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError("unknown format {}".format(fmt))
+        return fmt
+
+    @staticmethod
+    def __jsonl_rows(f):
+        """Yield the attributes of each line of a JSONL file.
+
+        Raises:
+            ValueError: If a line is not a JSON object.
+        """
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                o = json.loads(line)
+            except ValueError as e:
+                raise ValueError("line {}: {}".format(n, e)) from None
+            if not isinstance(o, dict):
+                raise ValueError("line {}: not a JSON object".format(n))
+            yield o
+
+    @staticmethod
+    def __csv_rows(f, klass):
+        """Yield the attributes of each row of a CSV file.
+
+        Values are converted to the type of the class attribute of klass
+        of the same name, if any.
+
+        Raises:
+            ValueError: If a value cannot be converted.
+        """
+        reader = csv.DictReader(f)
+        for row in reader:
+            o = {}
+            for attr, value in row.items():
+                if attr is None or value in ("", None):
+                    continue
+                default = getattr(klass, attr, None)
+                try:
+                    if isinstance(default, list):
+                        value = json.loads(value)
+                    elif type(default) in (int, float):
+                        value = type(default)(value)
+                except ValueError as e:
+                    raise ValueError("line {}: {}".format(
+                        reader.line_num, e)) from None
+                o[attr] = value
+            yield o
+
+    def __register(self, objdict):
+        """Instantiate the records of objdict into __objects as saved.
+
+        Args:
+            objdict (dict): The to_dict() of each object, by key.
+        """
+        for key, o in objdict.items():
+            self.__hydrate(o)
+            FileStorage.__encoded.pop(key, None)
+
+    def __hydrate(self, o):
+        """Instantiate a saved record into __objects and return it.
+
+        Args:
+            o (dict): The to_dict() of the object.
+        """
+        obj = FileStorage.__classes[o.pop("__class__")](**o)
+        self.new(obj)
+        FileStorage.__dirty.discard("{}.{}".format(type(obj).__name__, obj.id))
+        return obj
+
+    def __load(self, path):
+        """Load the objects saved in path into __objects, if it exists.
+
+        Records are registered one at a time as they are parsed, so the
+        whole file is never held in memory. In lazy mode the objects are
+        only indexed, unless path was compressed or saved in a layout that
+        cannot be indexed.
+        """
+        FileStorage.__committed = None
+        if self.__lazy:
+            self.__sync()
+            if not isinstance(FileStorage.__objects, LazyObjects):
+                FileStorage.__objects = LazyObjects(self.__hydrate,
+                                                    FileStorage.__objects)
+                FileStorage.__tracked = FileStorage.__objects
+            try:
+                keys = FileStorage.__objects.index(path)
+            except FileNotFoundError:
+                return
+            if keys is not None:
+                for key in keys:
+                    FileStorage.__encoded.pop(key, None)
+                    FileStorage.__dirty.discard(key)
+                FileStorage.__partitioned = False
+                FileStorage.__stale = True
+                return
+        try:
+            with open(path, "rb") as raw:
+                name, f = decompressor(raw)
+                with f:
+                    for key, o in detect(f).load(f):
+                        self.__hydrate(o)
+                        FileStorage.__encoded.pop(key, None)
+        except FileNotFoundError:
+            return
+
+    def __merge(self, local):
+        """Merge the records saved in __file_path into __objects.
+
+        Must be called with the lock file held.
+
+        Args:
+            local (set): The keys changed by this process and not written
+                yet, which keep their state in __objects, merged with the
+                attributes other processes changed meanwhile.
+        """
+        generation = self.__read_generation()
+        self.__sync()
+        odict = FileStorage.__objects
+        encoded = FileStorage.__encoded
+        base = FileStorage.__base
+        saved = set()
+        changes = []
+        try:
+            with open(FileStorage.__file_path, "rb") as raw:
+                name, f = decompressor(raw)
+                with f:
+                    for key, o in detect(f).load(f):
+                        saved.add(key)
+                        enc = self.__codec.encode(o)
+                        if key in local:
+                            if key in odict and key in base and \
+                                    base[key] != enc:
+                                self.__rebase(key, o)
+                                if key not in FileStorage.__dirty:
+                                    encoded[key] = self.__codec.encode(
+                                        odict[key].to_dict())
+                                    changes.append((key, encoded[key]))
+                            base[key] = enc
+                            continue
+                        if key in odict and key not in encoded:
+                            encoded[key] = self.__codec.encode(
+                                odict[key].to_dict())
+                        if encoded.get(key) != enc:
+                            self.__hydrate(o)
+                            encoded[key] = enc
+                            changes.append((key, enc))
+                        base[key] = enc
+        except FileNotFoundError:
+            pass
+        for key in [key for key in odict
+                    if key not in saved and key not in local]:
+            self.delete(odict[key])
+            FileStorage.__dirty.discard(key)
+            encoded.pop(key, None)
+            changes.append((key, None))
+        for key in [key for key in base if key not in saved]:
+            del base[key]
+        self.__publish(changes)
+        FileStorage.__generation = generation
+
+    def __rebase(self, key, o):
+        """Apply to the object of key the attributes changed on disk.
+
+        Attributes the object still has as last read or written by this
+        process take their value in o, the others keep theirs.
+
+        Args:
+            key (str): The key of an object changed by this process.
+            o (dict): The record of the object saved by another process.
+        """
+        obj = FileStorage.__objects[key]
+        mine = obj.to_dict()
+        before = self.__codec.decode(FileStorage.__base[key])
+        unset = object()
+        for attr in set(before) | set(o):
+            if attr == "__class__" or \
+                    mine.get(attr, unset) != before.get(attr, unset):
+                continue
+            if attr not in o:
+                obj.__dict__.pop(attr, None)
+            elif attr in ("created_at", "updated_at"):
+                obj.__dict__[attr] = datetime.fromisoformat(o[attr])
+            else:
+                obj.__dict__[attr] = o[attr]
+        self.__reindex(key, obj)
+
+    @contextmanager
+    def __file_lock(self, operation):
+        """Hold a flock() on <__file_path>.lock for a with block.
+
+        Args:
+            operation (int): fcntl.LOCK_SH or fcntl.LOCK_EX.
+        """
+        fd = os.open(FileStorage.__file_path + ".lock",
+                     os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, operation)
+            yield
+        finally:
+            os.close(fd)
+
+    def __read_generation(self):
+        """Return the generation of __file_path, 0 if it was never saved."""
+        try:
+            with open(FileStorage.__file_path + ".version") as f:
+                return int(f.read() or 0)
         except FileNotFoundError:
+            return 0
+
+    def __write_generation(self, generation):
+        """Durably record the generation of __file_path just written."""
+        path = FileStorage.__file_path + ".version"
+        with open(path + ".tmp", "w") as f:
+            f.write(str(generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        FileStorage.__generation = generation
+
+    @staticmethod
+    def __shard(cls_name):
+        """Return the name of the shard file of the class cls_name."""
+        root, ext = os.path.splitext(FileStorage.__file_path)
+        return "{}.{}{}".format(root, cls_name, ext)
+
+    @staticmethod
+    def __columns(cls_name):
+        """Return the columnar snapshot of the class cls_name."""
+        root, ext = os.path.splitext(FileStorage.__file_path)
+        return Columns("{}.{}.columns".format(root, cls_name))
+
+    def __index_path(self, index):
+        """Return the name of the file index is persisted to."""
+        root, ext = os.path.splitext(FileStorage.__file_path)
+        return "{}.{}.idx".format(root, index.name.replace(":", "."))
+
+    def __stamp(self):
+        """Return the size and modification time of the saved files."""
+        paths = [FileStorage.__file_path]
+        if self.__sharded:
+            paths = [self.__shard(name) for name in FileStorage.__classes]
+        elif self.__journaled:
+            journal = self.__journal()
+            paths += [journal.path, journal.old_path]
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamp.append([path, st.st_size, st.st_mtime_ns])
+        return stamp
+
+    def __save_indexes(self):
+        """Write the up to date persistent indexes with a stamp of the
+        saved files, unless some changes are not saved yet.
+
+        Each file holds a line with the stamp, then a line with the index.
+        Indexes not used since restorable are not read for this: the new
+        stamp is written ahead of the index already saved.
+        """
+        with self.__rw.read(), self.__lock:
+            if FileStorage.__dirty or self.__changes:
+                return
+            stamp = self.__stamp()
+            for idx in FileStorage.__indexes.values():
+                restorable = FileStorage.__restorable.get(idx.name)
+                if not idx.persistent or (FileStorage.__stale and
+                                          idx.name not in FileStorage.__fresh
+                                          and restorable is None):
+                    continue
+                path = self.__index_path(idx)
+                header = json.dumps({"stamp": stamp,
+                                     "count": self.count(idx.cls_name)})
+                with open(path + ".tmp", "w") as f:
+                    f.write(header + "\n")
+                    if restorable is None:
+                        json.dump(idx.dump(), f)
+                    else:
+                        with open(restorable) as saved:
+                            saved.readline()
+                            shutil.copyfileobj(saved, f)
+                os.replace(path + ".tmp", path)
+
+    def __load_indexes(self):
+        """Find the persistent indexes saved for the reloaded files.
+
+        Only the stamp of each file is read, the index itself is restored
+        on its first use. An index is only restorable if the files are
+        unchanged since it was saved and storage holds as many objects of
+        its class as then.
+        """
+        if not FileStorage.__stale:
             return
+        stamp = self.__stamp()
+        for idx in FileStorage.__indexes.values():
+            if not idx.persistent or idx.name in FileStorage.__fresh:
+                continue
+            path = self.__index_path(idx)
+            try:
+                with open(path) as f:
+                    saved = json.loads(f.readline())
+            except (FileNotFoundError, ValueError):
+                continue
+            if saved["stamp"] == stamp and \
+                    saved["count"] == self.count(idx.cls_name):
+                FileStorage.__restorable[idx.name] = path
+
+    def __restore(self, idx):
+        """Load a restorable persistent index from its file.
+
+        Returns:
+            bool: Whether idx was restored.
+        """
+        path = FileStorage.__restorable.get(idx.name)
+        if path is None:
+            return False
+        try:
+            with open(path) as f:
+                f.readline()
+                idx.load(json.loads(f.readline()))
+        except (FileNotFoundError, ValueError):
+            return False
+        return True
+
+    def __journal(self):
+        """Return the Journal kept next to __file_path."""
+        return Journal(FileStorage.__file_path + ".journal")
+
+    def __dump(self, path, records):
+        """Durably write records to path with the codec of the storage.
+
+        With a compression the records are compressed as they are written.
+
+        The file is written aside, fsynced and renamed over path, so path
+        always holds either the previous or the new records in full, and a
+        file that a lazy reload memory-mapped is never truncated under it.
+
+        Args:
+            path (str): The name of the file to write.
+            records (iterable): The (key, encoded record) pair of each record.
+        """
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            if self.__compression is None:
+                self.__codec.dump(f, records)
+            else:
+                with compressor(self.__compression, f,
+                                self.__compression_level) as cf:
+                    self.__codec.dump(cf, records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,635 @@
+#!/usr/bin/python3
+"""Defines the secondary indexes maintained by FileStorage."""
+import heapq
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+
+MISSING = object()
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Index(ABC):
+    """Represent an index over the objects of one class.
+
+    Storage calls update() whenever an object of cls_name is stored,
+    deleted, or has one of attrs set.
+
+    Attributes:
+        name (str): The name the index is registered under.
+        cls_name (str): The name of the class of the indexed objects.
+        attrs (tuple): The attributes whose changes affect the index.
+        sorted_attr (str): The attribute the keys returned by match() and
+            sorted_keys() are sorted by, if any.
+        persistent (bool): Whether storage saves the index to disk with
+            dump() and restores it with load() instead of rebuilding it.
+            Only persistent indexes define these two methods.
+    """
+
+    sorted_attr = None
+    persistent = False
+
+    def __init__(self, name, cls_name, attrs):
+        """Initialize a new Index.
+
+        Args:
+            name (str): The name the index is registered under.
+            cls_name (str): The name of the class of the indexed objects.
+            attrs (tuple): The attributes whose changes affect the index.
+        """
+        self.name = name
+        self.cls_name = cls_name
+        self.attrs = tuple(attrs)
+
+    @abstractmethod
+    def update(self, key, obj):
+        """Reindex key after its object was stored, changed or deleted.
+
+        Args:
+            key (str): The <class name>.<id> key of the object.
+            obj (BaseModel): The object stored under key, or None if key
+                was deleted.
+        """
+
+    @abstractmethod
+    def clear(self):
+        """Remove every key from the index."""
+
+    def build(self, items):
+        """Replace the content of the index with the objects of items.
+
+        Args:
+            items (iterable): The (key, object) pair of every object of
+                cls_name.
+        """
+        self.clear()
+        for key, obj in items:
+            self.update(key, obj)
+
+    def match(self, conditions):
+        """Return the keys of the objects satisfying some of conditions.
+
+        Used by the query planner, which falls back to scanning the class
+        when no index can answer a condition.
+
+        Args:
+            conditions (tuple): The (attr, op, value) conditions of a
+                query, op being one of the operators of Query.
+
+        Returns:
+            tuple: The matching keys and the conditions they satisfy, or
+                None if the index cannot answer any of conditions.
+        """
+        return None
+
+    def sorted_keys(self):
+        """Return the keys of every object, sorted by sorted_attr.
+
+        Used by the query planner to read the objects in the order of
+        order_by() when no condition can be answered by an index.
+
+        Returns:
+            list: The keys, not to be changed, or None if the index is not
+                sorted or leaves out some objects.
+        """
+        return None
+
+
+class RefIndex(Index):
+    """Represent an index of objects by the value of one attribute.
+
+    Used for the foreign keys of the models, e.g. Review.place_id.
+    """
+
+    def __init__(self, cls_name, attr):
+        """Initialize a new RefIndex.
+
+        Args:
+            cls_name (str): The name of the class of the indexed objects.
+            attr (str): The name of the indexed attribute.
+        """
+        super().__init__("{}.{}".format(cls_name, attr), cls_name, (attr,))
+        self.__refs = {}
+        self.__values = {}
+
+    def update(self, key, obj):
+        """Reindex key after its object was stored, changed or deleted."""
+        old = self.__values.pop(key, MISSING)
+        if old is not MISSING:
+            keys = self.__refs[old]
+            keys.discard(key)
+            if not keys:
+                del self.__refs[old]
+        if obj is None:
+            return
+        value = getattr(obj, self.attrs[0], None)
+        try:
+            self.__refs.setdefault(value, set()).add(key)
+        except TypeError:
+            return
+        self.__values[key] = value
+
+    def clear(self):
+        """Remove every key from the index."""
+        self.__refs = {}
+        self.__values = {}
+
+    def lookup(self, value):
+        """Return the set of keys whose attribute equals value."""
+        return set(self.__refs.get(value, ()))
+
+    def match(self, conditions):
+        """Return the keys whose attribute equals, or is in, a value."""
+        for cond in conditions:
+            attr, op, value = cond
+            if attr != self.attrs[0] or op not in ("eq", "in"):
+                continue
+            try:
+                if op == "eq":
+                    return self.lookup(value), (cond,)
+                return set().union(*(self.__refs.get(v, ())
+                                     for v in value)), (cond,)
+            except TypeError:
+                continue
+        return None
+
+
+class RangeIndex(Index):
+    """Represent a sorted index of objects by a numeric attribute.
+
+    Keys are kept in two parallel lists ordered by (value, key), so range
+    scans and the k lowest or highest values cost O(log N + k) through
+    bisect. Objects whose value is not a number are left out.
+    """
+
+    def __init__(self, cls_name, attr):
+        """Initialize a new RangeIndex.
+
+        Args:
+            cls_name (str): The name of the class of the indexed objects.
+            attr (str): The name of the indexed numeric attribute.
+        """
+        super().__init__("{}.{}:range".format(cls_name, attr), cls_name,
+                         (attr,))
+        self.sorted_attr = attr
+        self.__values = []
+        self.__keys = []
+        self.__indexed = {}
+        self.__unindexed = set()
+
+    def update(self, key, obj):
+        """Reindex key after its object was stored, changed or deleted."""
+        old = self.__indexed.pop(key, MISSING)
+        if old is not MISSING:
+            i = self.__position(old, key)
+            del self.__values[i]
+            del self.__keys[i]
+        self.__unindexed.discard(key)
+        if obj is None:
+            return
+        value = getattr(obj, self.attrs[0], None)
+        if not self.__numeric(value):
+            self.__unindexed.add(key)
+            return
+        i = self.__position(value, key)
+        self.__values.insert(i, value)
+        self.__keys.insert(i, key)
+        self.__indexed[key] = value
+
+    def clear(self):
+        """Remove every key from the index."""
+        self.__values = []
+        self.__keys = []
+        self.__indexed = {}
+        self.__unindexed = set()
+
+    def build(self, items):
+        """Replace the content of the index with the objects of items.
+
+        The keys are sorted once, in O(N log N), rather than inserted one
+        at a time.
+
+        Args:
+            items (iterable): The (key, object) pair of every object of
+                cls_name.
+        """
+        self.clear()
+        entries = []
+        for key, obj in items:
+            value = getattr(obj, self.attrs[0], None)
+            if self.__numeric(value):
+                entries.append((value, key))
+                self.__indexed[key] = value
+            else:
+                self.__unindexed.add(key)
+        entries.sort()
+        self.__values = [value for value, key in entries]
+        self.__keys = [key for value, key in entries]
+
+    def range(self, lo=None, hi=None, lo_inclusive=True, hi_inclusive=True):
+        """Return the keys whose value is between lo and hi, by value.
+
+        Args:
+            lo (int or float): The lower bound, or None for no bound.
+            hi (int or float): The upper bound, or None for no bound.
+            lo_inclusive (bool): Whether lo itself is in the range.
+            hi_inclusive (bool): Whether hi itself is in the range.
+        """
+        values = self.__values
+        i, j = 0, len(values)
+        if lo is not None:
+            i = (bisect_left if lo_inclusive else bisect_right)(values, lo)
+        if hi is not None:
+            j = (bisect_right if hi_inclusive else bisect_left)(values, hi)
+        return self.__keys[i:j]
+
+    def lowest(self, k):
+        """Return the k keys with the lowest values, lowest first."""
+        return self.__keys[:max(k, 0)]
+
+    def highest(self, k):
+        """Return the k keys with the highest values, highest first."""
+        return self.__keys[:-max(k, 0) - 1:-1]
+
+    def match(self, conditions):
+        """Return the keys within the bounds set by the conditions, in
+        order, or None without any bound."""
+        lo = hi = None
+        lo_inclusive = hi_inclusive = True
+        used = []
+        for cond in conditions:
+            attr, op, value = cond
+            if attr != self.attrs[0] or op not in ("eq", "lt", "lte", "gt",
+                                                   "gte") or \
+                    not self.__numeric(value):
+                continue
+            used.append(cond)
+            if op in ("eq", "gt", "gte") and (
+                    lo is None or value > lo or
+                    (value == lo and op == "gt")):
+                lo, lo_inclusive = value, op != "gt"
+            if op in ("eq", "lt", "lte") and (
+                    hi is None or value < hi or
+                    (value == hi and op == "lt")):
+                hi, hi_inclusive = value, op != "lt"
+        if not used:
+            return None
+        return self.range(lo, hi, lo_inclusive, hi_inclusive), tuple(used)
+
+    def sorted_keys(self):
+        """Return the keys of every object by value, provided they all
+        hold a number, or None."""
+        return None if self.__unindexed else self.__keys
+
+    def __position(self, value, key):
+        """Return the position of (value, key) in the sorted lists."""
+        i = bisect_left(self.__values, value)
+        j = bisect_right(self.__values, value, i)
+        return bisect_left(self.__keys, key, i, j)
+
+    @staticmethod
+    def __numeric(value):
+        """Return True if value is a number that can be ordered."""
+        return isinstance(value, (int, float)) and value == value
+
+
+class GeoIndex(Index):
+    """Represent a grid index of objects by latitude and longitude.
+
+    The globe is cut into cells of cell_deg degrees on a side, each
+    holding the keys of the objects located in it, so a search only
+    measures the distance to the objects of the cells it overlaps. A
+    radius search with a limit visits the cells nearest first and stops
+    once no remaining cell can hold a nearer object. Each point keeps the
+    cosine of its latitude and searches compare the haversine term
+    itself, so only the distances returned go through asin and sqrt.
+    Objects without valid coordinates of their own, such as Places
+    still holding the class defaults, are left out.
+    """
+
+    def __init__(self, cls_name, cell_deg=0.01):
+        """Initialize a new GeoIndex.
+
+        Args:
+            cls_name (str): The name of the class of the indexed objects.
+            cell_deg (float): The size of a cell in degrees.
+        """
+        super().__init__("{}:geo".format(cls_name), cls_name,
+                         ("latitude", "longitude"))
+        self.cell_deg = cell_deg
+        self.__cells = {}
+        self.__points = {}
+
+    def update(self, key, obj):
+        """Reindex key after its object was stored, changed or deleted."""
+        old = self.__points.pop(key, None)
+        if old is not None:
+            keys = self.__cells[old[2]]
+            del keys[key]
+            if not keys:
+                del self.__cells[old[2]]
+        if obj is None:
+            return
+        attrs = vars(obj)
+        lat, lon = attrs.get("latitude"), attrs.get("longitude")
+        if not self.__valid(lat, lon):
+            return
+        cell = self.__cell(lat, lon)
+        self.__cells.setdefault(cell, {})[key] = (
+            lat, lon, math.cos(math.radians(lat)))
+        self.__points[key] = (lat, lon, cell)
+
+    def clear(self):
+        """Remove every key from the index."""
+        self.__cells = {}
+        self.__points = {}
+
+    def in_bbox(self, south, west, north, east):
+        """Return the keys located in a bounding box.
+
+        A box whose west edge is east of its east edge crosses the
+        antimeridian.
+
+        Args:
+            south (float): The minimum latitude.
+            west (float): The minimum longitude.
+            north (float): The maximum latitude.
+            east (float): The maximum longitude.
+        """
+        if west > east:
+            return (self.in_bbox(south, west, north, 180.0) +
+                    self.in_bbox(south, -180.0, north, east))
+        keys = []
+        for cell, points in self.__overlapped(south, west, north, east):
+            keys.extend(key for key, (lat, lon, cos) in points.items()
+                        if south <= lat <= north and west <= lon <= east)
+        return keys
+
+    def near(self, lat, lon, radius_km, limit=None):
+        """Return the keys within radius_km of a point, nearest first.
+
+        Args:
+            lat (float): The latitude of the point.
+            lon (float): The longitude of the point.
+            radius_km (float): The maximum great-circle distance in km.
+            limit (int): The maximum number of keys, or None for all.
+
+        Returns:
+            list: The (distance in km, key) pair of each key found.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        cos = min(math.cos(math.radians(south)),
+                  math.cos(math.radians(north)))
+        if cos <= 0 or dlat / cos >= 180:
+            boxes = [(-180.0, 180.0)]
+        else:
+            dlon = dlat / cos
+            west, east = lon - dlon, lon + dlon
+            if west < -180:
+                boxes = [(west + 360, 180.0), (-180.0, east)]
+            elif east > 180:
+                boxes = [(west, 180.0), (-180.0, east - 360)]
+            else:
+                boxes = [(west, east)]
+        half = radius_km / EARTH_RADIUS_KM / 2
+        h_max = math.sin(half) ** 2 if half < math.pi / 2 else 1.0
+        cos1 = math.cos(math.radians(lat))
+        sin, radians = math.sin, math.radians
+        cells = []
+        for west, east in boxes:
+            for cell, points in self.__overlapped(south, west, north, east):
+                bound = self.__bound(lat, lon, cos1, cell)
+                if bound <= h_max:
+                    cells.append((bound, west, east, points))
+        if limit is not None:
+            cells.sort(key=lambda c: c[0])
+        found = []
+        for bound, west, east, points in cells:
+            if limit is not None and len(found) >= limit and \
+                    bound > -found[0][0]:
+                break
+            for key, (plat, plon, cos2) in points.items():
+                if not (south <= plat <= north and west <= plon <= east):
+                    continue
+                h = (sin(radians(plat - lat) / 2) ** 2 +
+                     cos1 * cos2 * sin(radians(plon - lon) / 2) ** 2)
+                if h > h_max:
+                    continue
+                if limit is None:
+                    found.append((h, key))
+                elif len(found) < limit:
+                    heapq.heappush(found, (-h, key))
+                elif -h > found[0][0]:
+                    heapq.heapreplace(found, (-h, key))
+        if limit is not None:
+            found = [(-h, key) for h, key in found]
+        return [(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0))),
+                 key) for h, key in sorted(found)]
+
+    def __bound(self, lat, lon, cos1, cell):
+        """Return a lower bound of the haversine term from a point to cell.
+
+        Args:
+            lat (float): The latitude of the point.
+            lon (float): The longitude of the point.
+            cos1 (float): The cosine of lat.
+            cell (tuple): The (row, column) of the cell.
+        """
+        south, west = cell[0] * self.cell_deg, cell[1] * self.cell_deg
+        north, east = south + self.cell_deg, west + self.cell_deg
+        dlat = max(south - lat, lat - north, 0.0)
+        dlon = max(west - lon, lon - east, 0.0)
+        dlon = min(dlon, 360.0 - dlon)
+        cos2 = max(min(math.cos(math.radians(south)),
+                       math.cos(math.radians(min(north, 90.0)))), 0.0)
+        return (math.sin(math.radians(dlat) / 2) ** 2 +
+                cos1 * cos2 * math.sin(math.radians(dlon) / 2) ** 2)
+
+    def __overlapped(self, south, west, north, east):
+        """Yield the cell and {key: (lat, lon, cos)} of each cell
+        overlapping a box."""
+        lo, hi = self.__cell(south, west), self.__cell(north, east)
+        if (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) > len(self.__cells):
+            for (i, j), points in self.__cells.items():
+                if lo[0] <= i <= hi[0] and lo[1] <= j <= hi[1]:
+                    yield (i, j), points
+            return
+        for i in range(lo[0], hi[0] + 1):
+            for j in range(lo[1], hi[1] + 1):
+                points = self.__cells.get((i, j))
+                if points:
+                    yield (i, j), points
+
+    def __cell(self, lat, lon):
+        """Return the (row, column) of the cell of a point."""
+        return (math.floor(lat / self.cell_deg),
+                math.floor(lon / self.cell_deg))
+
+    @staticmethod
+    def __valid(lat, lon):
+        """Return True if lat and lon are the coordinates of a point."""
+        for value, bound in ((lat, 90), (lon, 180)):
+            if not isinstance(value, (int, float)) or \
+                    not -bound <= value <= bound:
+                return False
+        return True
+
+
+class AmenityIndex(Index):
+    """Represent a bitset index of Places by amenity.
+
+    Each amenity id gets a bit, so the amenities of a Place are encoded
+    as an int mask. Each Place gets a slot, reused once it is deleted,
+    and each amenity maps to the int bitset of the slots of the Places
+    having it, so AND and OR filters over several amenities are bitwise
+    operations. Places whose attribute is not a list or tuple are left
+    out.
+    """
+
+    def __init__(self, cls_name="Place", attr="amenity_ids"):
+        """Initialize a new AmenityIndex.
+
+        Args:
+            cls_name (str): The name of the class of the indexed objects.
+            attr (str): The name of the attribute listing amenity ids.
+        """
+        super().__init__("{}:amenities".format(cls_name), cls_name, (attr,))
+        self.clear()
+
+    def update(self, key, obj):
+        """Reindex key after its object was stored, changed or deleted."""
+        slot = self.__slots.get(key)
+        if slot is not None:
+            for aid in self.amenities(self.__masks.pop(key)):
+                places = self.__places[aid] & ~(1 << slot)
+                if places:
+                    self.__places[aid] = places
+                else:
+                    del self.__places[aid]
+        self.__unindexed.discard(key)
+        value = None if obj is None else getattr(obj, self.attrs[0], None)
+        if not isinstance(value, (list, tuple)):
+            if slot is not None:
+                del self.__slots[key]
+                self.__keys[slot] = None
+                self.__free.append(slot)
+                self.__live &= ~(1 << slot)
+            if obj is not None:
+                self.__unindexed.add(key)
+            return
+        if slot is None:
+            slot = self.__free.pop() if self.__free else len(self.__keys)
+            if slot == len(self.__keys):
+                self.__keys.append(key)
+            else:
+                self.__keys[slot] = key
+            self.__slots[key] = slot
+            self.__live |= 1 << slot
+        mask = 0
+        for aid in value:
+            try:
+                bit = self.__bits.setdefault(aid, len(self.__bits))
+            except TypeError:
+                continue
+            if bit == len(self.__ids):
+                self.__ids.append(aid)
+            mask |= 1 << bit
+            self.__places[aid] = self.__places.get(aid, 0) | (1 << slot)
+        self.__masks[key] = mask
+
+    def clear(self):
+        """Remove every key from the index."""
+        self.__bits = {}
+        self.__ids = []
+        self.__masks = {}
+        self.__slots = {}
+        self.__keys = []
+        self.__free = []
+        self.__live = 0
+        self.__places = {}
+        self.__unindexed = set()
+
+    def mask(self, key):
+        """Return the bitset of the amenities of key, 0 if it has none."""
+        return self.__masks.get(key, 0)
+
+    def amenities(self, mask):
+        """Return the amenity ids of the bits set in mask."""
+        return [self.__ids[bit] for bit in self.__bits_of(mask)]
+
+    def having(self, all_of=(), any_of=()):
+        """Return the keys of the objects having amenities.
+
+        Args:
+            all_of (iterable): Amenity ids every object must have.
+            any_of (iterable): Amenity ids an object must have one of,
+                ignored if empty.
+        """
+        places = self.__all_of(all_of)
+        if any_of:
+            places &= self.__any_of(any_of)
+        return [self.__keys[slot] for slot in self.__bits_of(places)]
+
+    def match(self, conditions):
+        """Return the keys satisfying the contains conditions on the
+        attribute, provided every object lists its amenities."""
+        if self.__unindexed:
+            return None
+        places = self.__all_of(())
+        used = []
+        for cond in conditions:
+            attr, op, value = cond
+            if attr != self.attrs[0]:
+                continue
+            try:
+                if op == "contains":
+                    places &= self.__places.get(value, 0)
+                elif op == "contains_all":
+                    places &= self.__all_of(value)
+                elif op == "contains_any":
+                    places &= self.__any_of(value)
+                else:
+                    continue
+            except TypeError:
+                continue
+            used.append(cond)
+        if not used:
+            return None
+        return ([self.__keys[slot] for slot in self.__bits_of(places)],
+                tuple(used))
+
+    def __all_of(self, amenity_ids):
+        """Return the bitset of the slots having every amenity."""
+        places = self.__live
+        for aid in amenity_ids:
+            places &= self.__places.get(aid, 0)
+        return places
+
+    def __any_of(self, amenity_ids):
+        """Return the bitset of the slots having one of the amenities."""
+        places = 0
+        for aid in amenity_ids:
+            places |= self.__places.get(aid, 0)
+        return places
+
+    @staticmethod
+    def __bits_of(bitset):
+        """Return the positions of the bits set in bitset, lowest first."""
+        digits = bin(bitset)[:1:-1]
+        bits = []
+        i = digits.find("1")
+        while i != -1:
+            bits.append(i)
+            i = digits.find("1", i + 1)
+        return bits
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance in km between two points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) *
+         math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
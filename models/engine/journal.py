@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""Defines the Journal class."""
+import json
+import os
+
+
+class Journal:
+    """Represent an append-only log of storage mutations.
+
+    Each line of the journal is a JSON array ``[key, record]`` where
+    record is the to_dict() of the object, or null if it was destroyed.
+
+    Attributes:
+        path (str): The name of the journal file.
+    """
+
+    def __init__(self, path):
+        """Initialize a new Journal.
+
+        Args:
+            path (str): The name of the journal file.
+        """
+        self.path = path
+
+    @property
+    def old_path(self):
+        """Return the name of the journal being folded by a compaction."""
+        return self.path + ".old"
+
+    def append(self, changes):
+        """Durably append one record per (key, encoded record) pair.
+
+        Args:
+            changes (iterable): Pairs of a key and the bytes of its JSON
+                encoded record, or None if the key was destroyed.
+        """
+        lines = ["[{}, {}]\n".format(json.dumps(key),
+                                     enc.decode() if enc else "null")
+                 for key, enc in changes]
+        if lines:
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def size(self):
+        """Return the size in bytes of the active journal."""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def replay(self):
+        """Yield every (key, record) pair, oldest first.
+
+        The journal being compacted, if any, is replayed before the active
+        one. A truncated last line left by a crash is ignored.
+        """
+        for path in (self.old_path, self.path):
+            try:
+                with open(path) as f:
+                    for line in f:
+                        try:
+                            key, record = json.loads(line)
+                        except ValueError:
+                            break
+                        yield key, record
+            except FileNotFoundError:
+                continue
+
+    def rotate(self):
+        """Move the active journal aside so a compaction can fold it."""
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.old_path):
+            with open(self.path) as src, open(self.old_path, "a") as dst:
+                dst.write(src.read())
+            os.remove(self.path)
+        else:
+            os.rename(self.path, self.old_path)
+
+    def discard_old(self):
+        """Remove the journal folded by a finished compaction."""
+        try:
+            os.remove(self.old_path)
+        except FileNotFoundError:
+            pass
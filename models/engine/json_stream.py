@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Defines an incremental reader for saved storage files."""
+import json
+import re
+
+WHITESPACE = re.compile(r"\s*")
+
+
+def iter_records(f, chunk_size=1 << 16):
+    """Yield the (key, value) pairs of the JSON object saved in f.
+
+    The file is read chunk_size characters at a time and each value is
+    decoded as soon as it is complete, so memory stays bounded by the
+    chunk size and the largest record, whatever the layout of the file.
+
+    Args:
+        f (file): A text file holding a single JSON object.
+        chunk_size (int): The number of characters read at a time.
+
+    Raises:
+        json.JSONDecodeError: If f does not hold a valid JSON object.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    step, key = "{", None
+    while True:
+        pos = WHITESPACE.match(buf, pos).end()
+        try:
+            if step in ("key", "value"):
+                value, end = decoder.raw_decode(buf, pos)
+                if end == len(buf) and not eof:
+                    raise ValueError("Value may continue in the next chunk")
+            else:
+                value, end = buf[pos], pos + 1
+        except (ValueError, IndexError):
+            if eof:
+                raise json.JSONDecodeError("Truncated JSON object", buf, pos)
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        if step == "{" and value == "{":
+            step = "first"
+        elif step == "first" and value == "}":
+            return
+        elif step == "first":
+            step = "key"
+            continue
+        elif step == "key" and isinstance(value, str):
+            key, step = value, ":"
+        elif step == ":" and value == ":":
+            step = "value"
+        elif step == "value":
+            yield key, value
+            step = ","
+        elif step == "," and value == ",":
+            step = "key"
+        elif step == "," and value == "}":
+            return
+        else:
+            raise json.JSONDecodeError("Expecting " + step, buf, pos)
+        pos = end
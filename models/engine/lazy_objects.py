@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Defines the LazyObjects class."""
+import mmap
+from collections.abc import MutableMapping
+from models.engine.codecs import detect
+from models.engine.compression import decompressor
+
+
+class LazyObjects(MutableMapping):
+    """Represent a dictionary of objects instantiated on first access.
+
+    Records indexed from a memory-mapped file are kept as byte offsets
+    until their key is looked up, at which point the record is decoded and
+    handed to the hydrate callable.
+    """
+
+    def __init__(self, hydrate, objects=None):
+        """Initialize a new LazyObjects.
+
+        Args:
+            hydrate (callable): Called with the to_dict() of a record,
+                returns the instantiated object.
+            objects (dict): Already instantiated objects, by key.
+        """
+        self.__hydrate = hydrate
+        self.__loaded = dict(objects or {})
+        self.__pending = {}
+
+    def index(self, path):
+        """Index the records of a file saved by a codec of FileStorage.
+
+        Records of path replace the objects already held under the same
+        key. Compressed files and JSON files not saved one record per line
+        are left unindexed.
+
+        Args:
+            path (str): The name of the file to index.
+
+        Returns:
+            list: The keys indexed, or None if the layout of path is unknown.
+        """
+        with open(path, "rb") as f:
+            if decompressor(f)[0] is not None:
+                return None
+            codec = detect(f)
+            pos = f.tell()
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return []
+        try:
+            offsets = list(codec.index(buf, pos))
+        except ValueError:
+            return None
+        for key, start, end in offsets:
+            self.__loaded.pop(key, None)
+            self.__pending[key] = (codec, buf, start, end)
+        return [key for key, start, end in offsets]
+
+    def is_pending(self, key):
+        """Return True if key is indexed but not instantiated yet."""
+        return key in self.__pending
+
+    def raw(self, key, codec):
+        """Return the record saved for a pending key, encoded by codec.
+
+        Args:
+            key (str): A key that is still pending.
+            codec (JSONCodec or FramedCodec): The codec to encode with.
+        """
+        src, buf, start, end = self.__pending[key]
+        if src is codec:
+            return buf[start:end]
+        return codec.encode(src.decode(buf[start:end]))
+
+    def record(self, key):
+        """Return the record saved for a pending key, without instantiating
+        it.
+
+        Args:
+            key (str): A key that is still pending.
+        """
+        src, buf, start, end = self.__pending[key]
+        return src.decode(buf[start:end])
+
+    def __getitem__(self, key):
+        """Return the object of key, instantiating it if needed.
+
+        The key is no longer pending while its object is instantiated, so
+        lookups made by the model's __init__ do not recurse.
+        """
+        try:
+            return self.__loaded[key]
+        except KeyError:
+            pass
+        entry = self.__pending.pop(key)
+        codec, buf, start, end = entry
+        try:
+            obj = self.__hydrate(codec.decode(buf[start:end]))
+        except Exception:
+            self.__pending[key] = entry
+            raise
+        self.__loaded[key] = obj
+        return obj
+
+    def __setitem__(self, key, obj):
+        """Set obj as the object of key."""
+        self.__pending.pop(key, None)
+        self.__loaded[key] = obj
+
+    def __delitem__(self, key):
+        """Remove key whether it was instantiated or not."""
+        if self.__pending.pop(key, None) is None:
+            del self.__loaded[key]
+
+    def __contains__(self, key):
+        """Return True if key is held, without instantiating it."""
+        return key in self.__loaded or key in self.__pending
+
+    def __iter__(self):
+        """Iterate over the keys, instantiated ones first."""
+        yield from list(self.__loaded)
+        yield from list(self.__pending)
+
+    def __len__(self):
+        """Return the number of objects held."""
+        return len(self.__loaded) + len(self.__pending)
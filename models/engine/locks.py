@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""Defines the locks of a thread-safe FileStorage."""
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+class RWLock:
+    """Represent a readers-writer lock that prefers writers.
+
+    Any number of threads may hold the lock for reading, or a single one
+    for writing. Threads asking for it for reading wait while a writer
+    waits, so a steady flow of readers cannot starve writers.
+
+    Both modes are reentrant, and the writer may also take the lock for
+    reading. A reader cannot take it for writing, as two readers doing so
+    would wait on each other forever.
+    """
+
+    def __init__(self):
+        """Initialize a new RWLock."""
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__waiting = 0
+        self.__writer = None
+        self.__local = threading.local()
+
+    @contextmanager
+    def read(self):
+        """Hold the lock for reading for the duration of a with block."""
+        held = getattr(self.__local, "reads", 0)
+        if held or self.__writer == threading.get_ident():
+            self.__local.reads = held + 1
+            try:
+                yield
+            finally:
+                self.__local.reads = held
+            return
+        with self.__cond:
+            while self.__writer is not None or self.__waiting:
+                self.__cond.wait()
+            self.__readers += 1
+        self.__local.reads = 1
+        try:
+            yield
+        finally:
+            self.__local.reads = 0
+            with self.__cond:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock for writing for the duration of a with block.
+
+        Raises:
+            RuntimeError: If the thread holds the lock for reading only.
+        """
+        me = threading.get_ident()
+        if self.__writer == me:
+            yield
+            return
+        if getattr(self.__local, "reads", 0):
+            raise RuntimeError("cannot write while holding a read lock")
+        with self.__cond:
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = me
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__writer = None
+                self.__cond.notify_all()
+
+
+class NoLock:
+    """Represent the RWLock of a storage used by a single thread.
+
+    Both modes return the same context manager, which does nothing.
+    """
+
+    __null = nullcontext()
+
+    def read(self):
+        """Return a context manager that does nothing."""
+        return NoLock.__null
+
+    def write(self):
+        """Return a context manager that does nothing."""
+        return NoLock.__null
+
+
+class KeyLocks:
+    """Represent a fixed set of reentrant locks shared by hashing keys.
+
+    Two keys may share a lock, so hold the lock of one key at a time.
+    """
+
+    def __init__(self, stripes=64):
+        """Initialize a new KeyLocks.
+
+        Args:
+            stripes (int): The number of locks keys are spread over.
+        """
+        self.__locks = [threading.RLock() for i in range(stripes)]
+
+    def lock(self, key):
+        """Return the lock of key."""
+        return self.__locks[hash(key) % len(self.__locks)]
@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""Defines the Query class."""
+import heapq
+import operator
+from itertools import islice
+
+OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "in": lambda value, values: value in values,
+    "contains": lambda values, value: value in values,
+    "contains_all": lambda values, wanted: all(v in values for v in wanted),
+    "contains_any": lambda values, wanted: any(v in values for v in wanted)
+}
+
+
+class Query:
+    """Represent a query over the objects of one class of a storage.
+
+    Conditions are given as keyword arguments of where(), e.g.
+    where(city_id=city.id, price_by_night__lt=100), with the operator
+    after a double underscore, "eq" by default. A Query is never changed
+    in place, each method returns a new one.
+
+    The planner asks every index of the class which of the conditions
+    it can answer, uses the one matching the fewest keys and checks the
+    remaining conditions on those objects only. Without a usable index it
+    scans the objects of the class. When the keys come from a sorted index
+    on the single attribute of order_by(), they are read in order and
+    reading stops at the limit. Results come in no particular order unless
+    order_by() is given.
+    """
+
+    def __init__(self, storage, cls):
+        """Initialize a new Query.
+
+        Args:
+            storage (FileStorage or DBStorage): The storage queried.
+            cls (type or str): The class, or class name, of the objects.
+        """
+        self.__storage = storage
+        self.__cls_name = cls if isinstance(cls, str) else cls.__name__
+        self.__conditions = ()
+        self.__order = ()
+        self.__limit = None
+
+    def where(self, **conditions):
+        """Return a query also filtering on conditions.
+
+        Raises:
+            ValueError: If a condition names an unknown operator.
+        """
+        parsed = []
+        for name, value in conditions.items():
+            attr, _, op = name.partition("__")
+            op = op or "eq"
+            if op not in OPERATORS:
+                raise ValueError("unknown operator {}".format(op))
+            parsed.append((attr, op, value))
+        return self.__copy(conditions=self.__conditions + tuple(parsed))
+
+    def order_by(self, *attrs):
+        """Return a query sorting by attrs, descending if prefixed by -."""
+        return self.__copy(order=self.__order + attrs)
+
+    def limit(self, n):
+        """Return a query returning at most n objects."""
+        return self.__copy(limit=n)
+
+    def all(self):
+        """Return the list of the objects matching the query."""
+        with self.__storage.reading():
+            return self.__all()
+
+    def __all(self):
+        """Return the list of the objects matching the query, unlocked."""
+        index, keys, used = self.__plan()
+        odict = self.__storage.all()
+        if index is None:
+            objs = self.__storage.all(self.__cls_name).values()
+        else:
+            if self.__ordered(index) and self.__order[0].startswith("-"):
+                keys = reversed(keys)
+            objs = (odict[key] for key in keys if key in odict)
+        conditions = [c for c in self.__conditions if c not in used]
+        objs = (obj for obj in objs if self.__matches(obj, conditions))
+        if self.__ordered(index):
+            return list(islice(objs, self.__limit))
+        objs = list(objs)
+        if self.__order and self.__limit is not None and \
+                len(self.__order) == 1:
+            attr = self.__order[0]
+            top = heapq.nlargest if attr.startswith("-") else heapq.nsmallest
+            return top(self.__limit, objs, key=self.__key(attr))
+        for attr in reversed(self.__order):
+            objs.sort(key=self.__key(attr), reverse=attr.startswith("-"))
+        return objs if self.__limit is None else objs[:self.__limit]
+
+    def first(self):
+        """Return the first object matching the query, or None."""
+        objs = self.limit(1).all()
+        return objs[0] if objs else None
+
+    def count(self):
+        """Return the number of objects matching the query."""
+        return len(self.all())
+
+    def explain(self):
+        """Return a description of the plan of the query, one step a line.
+        """
+        with self.__storage.reading():
+            index, keys, used = self.__plan()
+        if index is None:
+            steps = ["PartitionScan {} ({} keys)".format(
+                self.__cls_name, self.__storage.count(self.__cls_name))]
+        elif used:
+            steps = ["IndexScan {} ({}) ({} keys)".format(
+                index.name, ", ".join("{} {} {!r}".format(*c) for c in used),
+                len(keys))]
+        else:
+            steps = ["IndexOrderScan {} ({} keys)".format(index.name,
+                                                          len(keys))]
+        for c in self.__conditions:
+            if c not in used:
+                steps.append("Filter {} {} {!r}".format(*c))
+        if self.__ordered(index):
+            steps.append("IndexOrder {}".format(self.__order[0]))
+        elif self.__order:
+            top = self.__limit is not None and len(self.__order) == 1
+            steps.append("{} {}".format("TopN" if top else "Sort",
+                                        ", ".join(self.__order)))
+        if self.__limit is not None:
+            steps.append("Limit {}".format(self.__limit))
+        return "\n".join(steps)
+
+    def __iter__(self):
+        """Return an iterator over the objects matching the query."""
+        return iter(self.all())
+
+    def __plan(self):
+        """Return the index, keys and conditions the query starts from.
+
+        Returns:
+            tuple: The most selective index, its matching keys and the
+                conditions they satisfy, or (None, None, ()) to scan the
+                class. Failing any selective index, a sorted index on the
+                attribute of order_by() is used for its order alone.
+        """
+        best = ordered = None
+        for index in self.__storage.indexes(self.__cls_name):
+            found = index.match(self.__conditions)
+            if found is not None and found[1]:
+                if best is None or len(found[0]) < len(best[1]):
+                    best = (index,) + found
+            elif ordered is None and self.__ordered(index):
+                ordered = index
+        if best is None and ordered is not None:
+            keys = ordered.sorted_keys()
+            if keys is not None:
+                best = (ordered, keys, ())
+        return best or (None, None, ())
+
+    def __ordered(self, index):
+        """Return True if the keys of index come in the order of the query.
+        """
+        return index is not None and len(self.__order) == 1 and \
+            index.sorted_attr == self.__order[0].lstrip("-")
+
+    def __copy(self, conditions=None, order=None, limit=None):
+        """Return a copy of the query with some parts replaced."""
+        query = Query(self.__storage, self.__cls_name)
+        query.__conditions = self.__conditions if conditions is None \
+            else conditions
+        query.__order = self.__order if order is None else order
+        query.__limit = self.__limit if limit is None else limit
+        return query
+
+    @staticmethod
+    def __matches(obj, conditions):
+        """Return True if obj satisfies every condition."""
+        for attr, op, value in conditions:
+            try:
+                if not OPERATORS[op](getattr(obj, attr, None), value):
+                    return False
+            except TypeError:
+                return False
+        return True
+
+    @staticmethod
+    def __key(attr):
+        """Return a sort key on attr, or -attr, placing missing values last.
+        """
+        descending = attr.startswith("-")
+        attr = attr.lstrip("-")
+
+        def key(obj):
+            value = getattr(obj, attr, None)
+            return ((value is None) != descending, value)
+        return key
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Defines the Snapshot class."""
+from collections.abc import Mapping
+from datetime import datetime
+
+
+class Snapshot(Mapping):
+    """Represent an immutable view of the objects of a committed version.
+
+    A Snapshot maps each key to the encoded record saved for it. Storage
+    never mutates the partitions of a published version, it copies those
+    a save changes, so a Snapshot can be read from any thread without a
+    lock while saves go on.
+
+    Looking up a key decodes its record into a new instance detached from
+    storage: it is not registered by its creation, changing it does not
+    mark anything as changed, and two lookups return distinct instances.
+
+    Attributes:
+        version (int): The number of saves committed before this version.
+    """
+
+    def __init__(self, version, codec, partitions, classes):
+        """Initialize a new Snapshot.
+
+        Args:
+            version (int): The number of the committed version.
+            codec (JSONCodec or FramedCodec): The codec records are
+                encoded with.
+            partitions (dict): The encoded records of each class, by key,
+                by class name. Never mutated afterwards.
+            classes (dict): The model classes, by name.
+        """
+        self.version = version
+        self.__codec = codec
+        self.__partitions = partitions
+        self.__classes = classes
+
+    def __getitem__(self, key):
+        """Return a detached instance of the object saved as key."""
+        return self.__detach(self.__partitions[key.split(".")[0]][key])
+
+    def __iter__(self):
+        """Iterate over the keys of the version, class by class."""
+        for partition in self.__partitions.values():
+            yield from partition
+
+    def __len__(self):
+        """Return the number of objects in the version."""
+        return sum(len(p) for p in self.__partitions.values())
+
+    def __contains__(self, key):
+        """Return True if an object was saved as key in the version."""
+        return key in self.__partitions.get(key.split(".")[0], ())
+
+    def all(self, cls=None):
+        """Return detached instances of the objects, or of those of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+        """
+        return {key: self.__detach(enc) for key, enc in self.__encoded(cls)}
+
+    def count(self, cls=None):
+        """Return the number of objects, or of objects of cls.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+        """
+        if cls is None:
+            return len(self)
+        name = cls if isinstance(cls, str) else cls.__name__
+        return len(self.__partitions.get(name, ()))
+
+    def records(self, cls=None):
+        """Yield the (key, to_dict()) pair of the objects, or of cls.
+
+        Records are decoded one at a time, without instantiating them.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+        """
+        for key, enc in self.__encoded(cls):
+            yield key, self.__codec.decode(enc)
+
+    def __encoded(self, cls):
+        """Yield the (key, encoded record) pairs of the objects of cls."""
+        if cls is None:
+            partitions = self.__partitions.values()
+        else:
+            name = cls if isinstance(cls, str) else cls.__name__
+            partitions = [self.__partitions.get(name, {})]
+        for partition in partitions:
+            yield from partition.items()
+
+    def __detach(self, enc):
+        """Return a new instance of an encoded record, detached from storage.
+
+        The instance is built without calling __init__ or __setattr__,
+        which would register it in storage or mark it as changed.
+        """
+        o = self.__codec.decode(enc)
+        obj = object.__new__(self.__classes[o.pop("__class__")])
+        for name in ("created_at", "updated_at"):
+            if name in o:
+                o[name] = datetime.fromisoformat(o[name])
+        obj.__dict__.update(o)
+        return obj
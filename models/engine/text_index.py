@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""Defines the TextIndex class."""
+import heapq
+import math
+import re
+from models.engine.indexes import Index
+
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Return the list of the lowercase words of text."""
+    return WORD.findall(text.casefold())
+
+
+class TextIndex(Index):
+    """Represent an inverted full-text index over string attributes.
+
+    Each word maps to a postings list holding, for every object whose
+    attributes contain the word, the number of times it occurs. Searches
+    rank objects by Okapi BM25.
+
+    Attributes:
+        k1 (float): The BM25 term frequency saturation.
+        b (float): The BM25 document length normalization.
+    """
+
+    persistent = True
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, cls_name, attrs):
+        """Initialize a new TextIndex.
+
+        Args:
+            cls_name (str): The name of the class of the indexed objects.
+            attrs (tuple): The names of the indexed string attributes.
+        """
+        super().__init__("{}:text".format(cls_name), cls_name, attrs)
+        self.__postings = {}
+        self.__docs = {}
+        self.__lengths = {}
+        self.__total = 0
+
+    def update(self, key, obj):
+        """Reindex key after its object was stored, changed or deleted."""
+        old = self.__docs.pop(key, None)
+        if old is not None:
+            for word in old:
+                postings = self.__postings[word]
+                del postings[key]
+                if not postings:
+                    del self.__postings[word]
+            self.__total -= self.__lengths.pop(key)
+        if obj is None:
+            return
+        counts = {}
+        for attr in self.attrs:
+            value = getattr(obj, attr, None)
+            if isinstance(value, str):
+                for word in tokenize(value):
+                    counts[word] = counts.get(word, 0) + 1
+        self.__add(key, counts)
+
+    def clear(self):
+        """Remove every key from the index."""
+        self.__postings = {}
+        self.__docs = {}
+        self.__lengths = {}
+        self.__total = 0
+
+    def search(self, text, limit=None):
+        """Return the keys matching the words of text, best first.
+
+        Args:
+            text (str): The words searched for.
+            limit (int): The maximum number of keys, or None for all.
+
+        Returns:
+            list: The (score, key) pair of each key matching a word.
+        """
+        n = len(self.__docs)
+        if not n:
+            return []
+        avg = self.__total / n or 1
+        lengths = self.__lengths
+        k1, b = self.k1, self.b
+        scores = {}
+        for word in set(tokenize(text)):
+            postings = self.__postings.get(word)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for key, tf in postings.items():
+                norm = 1 - b + b * lengths[key] / avg
+                scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1) / (
+                    tf + k1 * norm)
+        ranked = ((score, key) for key, score in scores.items())
+        if limit is None:
+            return sorted(ranked, key=lambda s: (-s[0], s[1]))
+        return heapq.nsmallest(limit, ranked, key=lambda s: (-s[0], s[1]))
+
+    def dump(self):
+        """Return the words of each key, as JSON-serializable data."""
+        return self.__docs
+
+    def load(self, docs):
+        """Replace the content of the index with data returned by dump().
+        """
+        self.clear()
+        for key, counts in docs.items():
+            self.__add(key, counts)
+
+    def __add(self, key, counts):
+        """Add the word counts of key to the postings lists."""
+        self.__docs[key] = counts
+        self.__lengths[key] = sum(counts.values())
+        self.__total += self.__lengths[key]
+        for word, tf in counts.items():
+            self.__postings.setdefault(word, {})[key] = tf
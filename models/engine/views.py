@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Defines the AggregateView class."""
+from bisect import bisect_left, insort
+from models.engine.indexes import Index
+
+
+class AggregateView(Index):
+    """Represent a materialized aggregate of objects grouped by attribute.
+
+    The view keeps, for each value of group_by, the number of objects and
+    the running sum of attr together with its values in sorted order, so
+    count, sum, average, minimum and maximum are read in O(1). Storage
+    updates it like any index when objects are stored, changed or
+    deleted. Only numbers are aggregated, other values of attr are only
+    counted.
+    """
+
+    def __init__(self, name, cls_name, group_by, attr=None):
+        """Initialize a new AggregateView.
+
+        Args:
+            name (str): The name the view is registered under.
+            cls_name (str): The name of the class of the objects.
+            group_by (str): The attribute the objects are grouped by.
+            attr (str): The numeric attribute aggregated, if any.
+        """
+        super().__init__(name, cls_name,
+                         (group_by,) if attr is None else (group_by, attr))
+        self.group_by = group_by
+        self.attr = attr
+        self.__rows = {}
+        self.__members = {}
+
+    def update(self, key, obj):
+        """Remove the old contribution of key and add the new one."""
+        old = self.__members.pop(key, None)
+        if old is not None:
+            group, value = old
+            row = self.__rows[group]
+            row["count"] -= 1
+            if value is not None:
+                row["sum"] -= value
+                values = row["values"]
+                del values[bisect_left(values, value)]
+            if not row["count"]:
+                del self.__rows[group]
+        if obj is None:
+            return
+        group = getattr(obj, self.group_by, None)
+        try:
+            row = self.__rows.setdefault(group, {"count": 0, "sum": 0,
+                                                 "values": []})
+        except TypeError:
+            return
+        value = None if self.attr is None else getattr(obj, self.attr, None)
+        if not isinstance(value, (int, float)) or value != value:
+            value = None
+        row["count"] += 1
+        if value is not None:
+            row["sum"] += value
+            insort(row["values"], value)
+        self.__members[key] = (group, value)
+
+    def clear(self):
+        """Remove every key from the view."""
+        self.__rows = {}
+        self.__members = {}
+
+    def get(self, group):
+        """Return the aggregates of one group.
+
+        Returns:
+            dict: The count of objects and the sum, avg, min and max of
+                their numeric values of attr, None when there are none.
+        """
+        row = self.__rows.get(group)
+        if row is None:
+            return {"count": 0, "sum": 0, "avg": None, "min": None,
+                    "max": None}
+        values = row["values"]
+        return {"count": row["count"],
+                "sum": row["sum"],
+                "avg": row["sum"] / len(values) if values else None,
+                "min": values[0] if values else None,
+                "max": values[-1] if values else None}
+
+    def groups(self):
+        """Return the aggregates of every group, by group."""
+        return {group: self.get(group) for group in self.__rows}
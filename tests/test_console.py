@@ -10,12 +10,17 @@ Unittest classes:
     TestHBNBCommand_all
     TestHBNBCommand_destroy
     TestHBNBCommand_update
+    TestHBNBCommand_import
+    TestHBNBCommand_export
 """
 import os
 import sys
 import unittest
 from models import storage
+from models.engine.db_storage import DBStorage
 from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
 from console import HBNBCommand
 from io import StringIO
 from unittest.mock import patch
@@ -96,10 +101,52 @@ class TestHBNBCommand_help(unittest.TestCase):
             self.assertFalse(HBNBCommand().onecmd("help update"))
             self.assertEqual(h, output.getvalue().strip())
 
+    def test_help_near(self):
+        h = ("Usage: near <latitude> <longitude> <radius_km> [<limit>]\n"
+             "        Display the Places within a radius of a point, nearest"
+             " first.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help near"))
+            self.assertEqual(h, output.getvalue().strip())
+
+    def test_help_bbox(self):
+        h = ("Usage: bbox <south> <west> <north> <east>\n"
+             "        Display the Places located in a bounding box.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help bbox"))
+            self.assertEqual(h, output.getvalue().strip())
+
+    def test_help_import(self):
+        h = ("Usage: import <class> <file> [<batch>]\n"
+             "        Create instances of a class from the rows of a JSONL or"
+             " CSV file,\n        saving every batch rows, and print their"
+             " number.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help import"))
+            self.assertEqual(h, output.getvalue().strip())
+
+    def test_help_export(self):
+        h = ("Usage: export <class> <file> [<attribute_name> ...]\n"
+             "        Write the instances of a class, or only some of their"
+             " attributes,\n        to a JSONL or CSV file and print their"
+             " number.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help export"))
+            self.assertEqual(h, output.getvalue().strip())
+
+    def test_help_search(self):
+        h = ("Usage: search [<class>] <words>\n"
+             "        Display the objects best matching some words, best"
+             " first.")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help search"))
+            self.assertEqual(h, output.getvalue().strip())
+
     def test_help(self):
         h = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  bbox   create   export  import  quit    show  \n"
+             "all  count  destroy  help    near    search  update")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(h, output.getvalue().strip())
@@ -116,6 +163,17 @@ class TestHBNBCommand_exit(unittest.TestCase):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertTrue(HBNBCommand().onecmd("EOF"))
 
+    def test_quit_flushes_storage(self):
+        with patch("console.storage") as mocked:
+            self.assertTrue(HBNBCommand().onecmd("quit"))
+            mocked.flush.assert_called_once_with()
+
+    def test_EOF_flushes_storage(self):
+        with patch("sys.stdout", new=StringIO()):
+            with patch("console.storage") as mocked:
+                self.assertTrue(HBNBCommand().onecmd("EOF"))
+                mocked.flush.assert_called_once_with()
+
 
 class TestHBNBCommand_create(unittest.TestCase):
     """Unittests for testing create from the HBNB command interpreter."""
@@ -1566,5 +1624,256 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class TestHBNBCommand_near(unittest.TestCase):
+    """Unittests for testing the geospatial commands of HBNB comand
+    interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.sf = Place()
+        self.sf.latitude, self.sf.longitude = 37.7749, -122.4194
+        self.oakland = Place()
+        self.oakland.latitude, self.oakland.longitude = 37.8044, -122.2712
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_near_missing_coordinates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 37.7"))
+            self.assertEqual("** coordinates missing **",
+                             output.getvalue().strip())
+
+    def test_near_missing_radius(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 37.7 -122.4"))
+            self.assertEqual("** radius missing **",
+                             output.getvalue().strip())
+
+    def test_near_invalid_number(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 37.7 west 5"))
+            self.assertEqual("** invalid number **",
+                             output.getvalue().strip())
+
+    def test_near(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 37.78 -122.41 20"))
+            self.assertEqual(str([str(self.sf), str(self.oakland)]),
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 37.8 -122.27 20 1"))
+            self.assertEqual(str([str(self.oakland)]),
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("near 0 0 10 0"))
+            self.assertEqual("[]", output.getvalue().strip())
+
+    def test_bbox_missing_coordinates(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("bbox 37 -123 38"))
+            self.assertEqual("** coordinates missing **",
+                             output.getvalue().strip())
+
+    def test_bbox(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("bbox 37 -123 38 -122.3"))
+            self.assertEqual(str([str(self.sf)]), output.getvalue().strip())
+
+    def test_db_storage_unsupported(self):
+        db = DBStorage(":memory:")
+        self.addCleanup(db.close)
+        for cmd in ("near 37.78 -122.41 20", "bbox 37 -123 38 -122.3"):
+            with patch("console.storage", db), \
+                    patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(cmd))
+                self.assertEqual("** not supported by this storage **",
+                                 output.getvalue().strip())
+
+
+class TestHBNBCommand_search(unittest.TestCase):
+    """Unittests for testing the search command of HBNB comand
+    interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.pl.name = "Quiet loft"
+        self.rv = Review()
+        self.rv.text = "A quiet street"
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_search_missing_words(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search"))
+            self.assertEqual("** words missing **",
+                             output.getvalue().strip())
+
+    def test_search(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search loft"))
+            self.assertEqual(str([str(self.pl)]), output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search quiet"))
+            self.assertEqual(2, output.getvalue().lower().count("quiet"))
+
+    def test_search_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Review quiet"))
+            self.assertEqual(str([str(self.rv)]), output.getvalue().strip())
+
+    def test_db_storage_unsupported(self):
+        db = DBStorage(":memory:")
+        self.addCleanup(db.close)
+        with patch("console.storage", db), \
+                patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search quiet"))
+            self.assertEqual("** not supported by this storage **",
+                             output.getvalue().strip())
+
+
+class TestHBNBCommand_import(unittest.TestCase):
+    """Unittests for testing the import command of HBNB comand
+    interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        with open("reviews.jsonl", "w") as f:
+            f.write('{"id": "r1", "text": "Great"}\n{"id": "r2"}\n')
+
+    def tearDown(self):
+        for path in ("file.json", "reviews.jsonl"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_import_errors(self):
+        for cmd, msg in (("import", "** class name missing **"),
+                         ("import Guest x.csv", "** class doesn't exist **"),
+                         ("import Review", "** file name missing **"),
+                         ("import Review missing.csv", "** no file found **"),
+                         ("import Review reviews.jsonl x",
+                          "** invalid number **"),
+                         ("import Review file.xml",
+                          "** unknown format xml **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(cmd))
+                self.assertEqual(msg, output.getvalue().strip())
+
+    def test_import(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "import Review reviews.jsonl 1"))
+            self.assertEqual("2", output.getvalue().strip())
+        self.assertEqual("Great", storage.all()["Review.r1"].text)
+        with open("file.json", "r") as f:
+            self.assertIn("Review.r2", f.read())
+
+    def test_db_storage_unsupported(self):
+        db = DBStorage(":memory:")
+        self.addCleanup(db.close)
+        with patch("console.storage", db), \
+                patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "import Review reviews.jsonl"))
+            self.assertEqual("** not supported by this storage **",
+                             output.getvalue().strip())
+
+
+class TestHBNBCommand_export(unittest.TestCase):
+    """Unittests for testing the export command of HBNB comand
+    interpreter."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.review = Review()
+        self.review.text = "Great"
+
+    def tearDown(self):
+        for path in ("file.json", "reviews.jsonl", "reviews.csv"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_export_errors(self):
+        for cmd, msg in (("export", "** class name missing **"),
+                         ("export Guest x.csv", "** class doesn't exist **"),
+                         ("export Review", "** file name missing **"),
+                         ("export Review file.xml",
+                          "** unknown format xml **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(cmd))
+                self.assertEqual(msg, output.getvalue().strip())
+        self.assertFalse(os.path.exists("file.xml"))
+
+    def test_export_failure_keeps_file(self):
+        with open("reviews.jsonl", "w") as f:
+            f.write("kept\n")
+        with patch.object(FileStorage, "export", side_effect=OSError), \
+                patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "export Review reviews.jsonl"))
+            self.assertEqual("** cannot write file **",
+                             output.getvalue().strip())
+        with open("reviews.jsonl", "r") as f:
+            self.assertEqual("kept\n", f.read())
+        self.assertFalse(os.path.exists("reviews.jsonl.tmp"))
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "export Review missing/reviews.jsonl"))
+            self.assertEqual("** cannot write file **",
+                             output.getvalue().strip())
+
+    def test_db_storage_unsupported(self):
+        db = DBStorage(":memory:")
+        self.addCleanup(db.close)
+        with patch("console.storage", db), \
+                patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "export Review reviews.jsonl"))
+            self.assertEqual("** not supported by this storage **",
+                             output.getvalue().strip())
+        self.assertFalse(os.path.exists("reviews.jsonl"))
+
+    def test_export_jsonl(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "export Review reviews.jsonl"))
+            self.assertEqual("1", output.getvalue().strip())
+        with open("reviews.jsonl", "r") as f:
+            self.assertIn('"text": "Great"', f.read())
+
+    def test_export_csv_attributes(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "export Review reviews.csv id text"))
+            self.assertEqual("1", output.getvalue().strip())
+        with open("reviews.csv", "r", newline="") as f:
+            self.assertEqual("id,text\r\n{},Great\r\n".format(
+                self.review.id), f.read())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/async_storage.py.
+
+Unittest classes:
+    TestAsyncStorage
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+import models
+from unittest.mock import patch
+from models.base_model import BaseModel
+from models.engine.async_storage import AsyncStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+
+class TestAsyncStorage(unittest.IsolatedAsyncioTestCase):
+    """Unittests for testing the AsyncStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(thread_safe=True)
+        patcher = patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.astorage = AsyncStorage(self.storage)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def slow_saves(self, delay):
+        """Patch save() to take delay seconds, and return its calls."""
+        save = FileStorage.save
+        calls = []
+
+        def slow(storage):
+            calls.append(threading.get_ident())
+            time.sleep(delay)
+            save(storage)
+
+        patcher = patch.object(FileStorage, "save", slow)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return calls
+
+    def saved(self):
+        with open("file.json", "r") as f:
+            return json.load(f)
+
+    async def test_aall_aget_acount(self):
+        pl = Place()
+        us = User()
+        objs = await self.astorage.aall()
+        self.assertEqual({"Place." + pl.id, "User." + us.id}, set(objs))
+        self.assertIsNot(objs, self.storage.all())
+        self.assertEqual({"Place." + pl.id}, set(await self.astorage.aall(
+            Place)))
+        self.assertIs(us, await self.astorage.aget(User, us.id))
+        self.assertIsNone(await self.astorage.aget(Place, us.id))
+        self.assertEqual(1, await self.astorage.acount("User"))
+
+    async def test_reads_run_off_loop_during_save(self):
+        pl = Place()
+        to_dict = Place.to_dict
+
+        def slow(obj):
+            time.sleep(0.2)
+            return to_dict(obj)
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        with patch.object(Place, "to_dict", slow):
+            save = asyncio.ensure_future(self.astorage.asave())
+            await asyncio.sleep(0.05)
+            ticker = asyncio.ensure_future(tick())
+            self.assertIs(pl, await self.astorage.aget(Place, pl.id))
+            self.assertEqual(1, await self.astorage.acount(Place))
+            ticker.cancel()
+            await save
+        self.assertGreater(ticks, 5)
+
+    async def test_aiter(self):
+        places = {Place() for i in range(25)}
+        User()
+        seen = [obj async for obj in self.astorage.aiter(Place, batch=10)]
+        self.assertEqual(places, set(seen))
+
+    async def test_asave_runs_off_loop(self):
+        calls = self.slow_saves(0.1)
+        bm = BaseModel()
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        await self.astorage.asave()
+        ticker.cancel()
+        self.assertGreater(ticks, 3)
+        self.assertNotEqual(threading.get_ident(), calls[0])
+        self.assertIn("BaseModel." + bm.id, self.saved())
+
+    async def test_asave_coalesces(self):
+        calls = self.slow_saves(0.05)
+        BaseModel()
+        first = asyncio.ensure_future(self.astorage.asave())
+        await asyncio.sleep(0.01)
+        for i in range(10):
+            BaseModel()
+        await asyncio.gather(*[self.astorage.asave() for i in range(10)])
+        await first
+        self.assertEqual(2, len(calls))
+        self.assertEqual(11, len(self.saved()))
+
+    async def test_asave_raises(self):
+        BaseModel()
+        with patch.object(FileStorage, "save",
+                          side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                await self.astorage.asave()
+        await self.astorage.asave()
+        self.assertEqual(1, len(self.saved()))
+
+    async def test_areload(self):
+        bm = BaseModel()
+        await self.astorage.asave()
+        FileStorage._FileStorage__objects = {}
+        await self.astorage.areload()
+        self.assertIn("BaseModel." + bm.id, self.storage.all())
+
+    async def test_aflush(self):
+        storage = FileStorage(thread_safe=True, autosave=60)
+        BaseModel()
+        storage.save()
+        await AsyncStorage(storage).aflush()
+        self.assertEqual(1, len(self.saved()))
+
+
+if __name__ == "__main__":
+    unittest.main()
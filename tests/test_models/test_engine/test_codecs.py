@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/codecs.py.
+
+Unittest classes:
+    TestCodecs
+    TestDetect
+"""
+import json
+import mmap
+import unittest
+from io import BytesIO
+from models.engine.codecs import CODECS, detect
+
+
+class TestCodecs(unittest.TestCase):
+    """Unittests for testing the encoding and decoding of each codec."""
+
+    records = {
+        "User.1": {"id": "1", "first_name": "Bétty", "__class__": "User"},
+        "Place.2": {"id": "2", "amenity_ids": ["a", "b"], "max_guest": 4,
+                    "latitude": 37.77, "__class__": "Place"}
+    }
+
+    def dumped(self, codec):
+        f = BytesIO()
+        codec.dump(f, ((key, codec.encode(record))
+                       for key, record in self.records.items()))
+        return f.getvalue()
+
+    def test_encode_decode(self):
+        for codec in CODECS.values():
+            for record in self.records.values():
+                self.assertEqual(record, codec.decode(codec.encode(record)))
+
+    def test_dump_load(self):
+        for codec in CODECS.values():
+            f = BytesIO(self.dumped(codec))
+            self.assertIs(codec, detect(f))
+            self.assertEqual(list(self.records.items()), list(codec.load(f)))
+
+    def test_dump_load_empty(self):
+        for codec in CODECS.values():
+            f = BytesIO()
+            codec.dump(f, [])
+            f.seek(0)
+            self.assertEqual([], list(detect(f).load(f)))
+
+    def test_json_is_plain_json(self):
+        data = self.dumped(CODECS["json"])
+        self.assertEqual(self.records, json.loads(data))
+
+    def test_index(self):
+        for codec in CODECS.values():
+            data = self.dumped(codec)
+            f = BytesIO(data)
+            detect(f)
+            buf = mmap.mmap(-1, len(data))
+            buf.write(data)
+            offsets = list(codec.index(buf, f.tell()))
+            self.assertEqual(list(self.records), [o[0] for o in offsets])
+            for key, start, end in offsets:
+                self.assertEqual(self.records[key],
+                                 codec.decode(buf[start:end]))
+
+    def test_binary_is_compact_json(self):
+        record = self.records["Place.2"]
+        self.assertEqual(json.dumps(record, separators=(",", ":")).encode(),
+                         CODECS["binary"].encode(record))
+
+    def test_json_index_other_layout(self):
+        data = json.dumps(self.records).encode()
+        with self.assertRaises(ValueError):
+            list(CODECS["json"].index(data, 0))
+
+
+class TestDetect(unittest.TestCase):
+    """Unittests for testing the detect function."""
+
+    def test_headerless_is_json(self):
+        f = BytesIO(b'{"a": {}}')
+        self.assertIs(CODECS["json"], detect(f))
+        self.assertEqual(0, f.tell())
+
+    def test_unknown_codec(self):
+        with self.assertRaises(KeyError):
+            detect(BytesIO(b"HBNB yaml\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/columns.py.
+
+Unittest classes:
+    TestColumns
+"""
+import os
+import unittest
+from array import array
+from models.engine.columns import Columns
+from models.place import Place
+
+
+class TestColumns(unittest.TestCase):
+    """Unittests for testing the Columns class."""
+
+    path = "test.columns"
+
+    records = [
+        {"id": "1", "name": "Loft", "price_by_night": 120,
+         "latitude": 37.77, "amenity_ids": ["a"], "__class__": "Place"},
+        {"id": "2", "name": "Été", "number_rooms": 3, "latitude": 1,
+         "amenity_ids": [], "__class__": "Place"}
+    ]
+
+    def tearDown(self):
+        try:
+            os.remove(self.path)
+        except IOError:
+            pass
+
+    def test_numeric_columns(self):
+        Columns(self.path).write(Place, self.records)
+        price = Columns(self.path).column("price_by_night")
+        self.assertEqual(array("q", [120, 0]), price)
+        latitude = Columns(self.path).column("latitude")
+        self.assertEqual(array("d", [37.77, 1.0]), latitude)
+        self.assertEqual(array("d", [0.0, 0.0]),
+                         Columns(self.path).column("longitude"))
+
+    def test_other_columns(self):
+        Columns(self.path).write(Place, self.records)
+        self.assertEqual(["Loft", "Été"], Columns(self.path).column("name"))
+        self.assertEqual([["a"], []],
+                         Columns(self.path).column("amenity_ids"))
+
+    def test_mixed_column(self):
+        records = [{"id": "1", "max_guest": "many"}, {"id": "2"}]
+        Columns(self.path).write(Place, records)
+        self.assertEqual(["many", 0], Columns(self.path).column("max_guest"))
+
+    def test_names_rows(self):
+        Columns(self.path).write(Place, self.records)
+        columns = Columns(self.path)
+        self.assertEqual("id", columns.names()[0])
+        self.assertIn("number_bathrooms", columns.names())
+        self.assertNotIn("__class__", columns.names())
+        self.assertEqual(2, columns.rows())
+
+    def test_records(self):
+        Columns(self.path).write(Place, self.records)
+        records = dict(Columns(self.path).records())
+        self.assertEqual(["Place.1", "Place.2"], list(records))
+        self.assertEqual(120, records["Place.1"]["price_by_night"])
+        self.assertEqual("Place", records["Place.2"]["__class__"])
+        self.assertEqual(3, records["Place.2"]["number_rooms"])
+
+    def test_empty(self):
+        Columns(self.path).write(Place, [])
+        self.assertEqual(0, Columns(self.path).rows())
+        self.assertEqual(array("q"), Columns(self.path).column("max_guest"))
+
+    def test_unknown_column(self):
+        Columns(self.path).write(Place, self.records)
+        with self.assertRaises(KeyError):
+            Columns(self.path).column("color")
+
+    def test_not_a_snapshot(self):
+        with open(self.path, "w") as f:
+            f.write("{}")
+        with self.assertRaises(ValueError):
+            Columns(self.path).rows()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/compression.py.
+
+Unittest classes:
+    TestCompression
+"""
+import unittest
+from io import BytesIO
+from models.engine.compression import COMPRESSIONS, compressor, decompressor
+
+
+class TestCompression(unittest.TestCase):
+    """Unittests for testing the compressions of FileStorage files."""
+
+    data = b'{\n"User.1": {"id": "1", "__class__": "User"}\n}' * 100
+
+    def compressed(self, name, level=None):
+        f = BytesIO()
+        with compressor(name, f, level) as cf:
+            cf.write(self.data)
+        self.assertFalse(f.closed)
+        return f.getvalue()
+
+    def test_round_trip(self):
+        for name in COMPRESSIONS:
+            found, f = decompressor(BytesIO(self.compressed(name)))
+            self.assertEqual(name, found)
+            self.assertEqual(self.data, f.read())
+
+    def test_compresses(self):
+        for name in COMPRESSIONS:
+            self.assertLess(len(self.compressed(name)), len(self.data))
+
+    def test_level(self):
+        for name in COMPRESSIONS:
+            found, f = decompressor(BytesIO(self.compressed(name, 1)))
+            self.assertEqual(self.data, f.read())
+
+    def test_uncompressed(self):
+        raw = BytesIO(self.data)
+        found, f = decompressor(raw)
+        self.assertIsNone(found)
+        self.assertIs(raw, f)
+        self.assertEqual(0, f.tell())
+
+    def test_empty(self):
+        found, f = decompressor(BytesIO())
+        self.assertIsNone(found)
+
+
+if __name__ == "__main__":
+    unittest.main()
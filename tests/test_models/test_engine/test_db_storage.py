@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+
+Unittest classes:
+    TestDBStorage_instantiation
+    TestDBStorage_methods
+"""
+import os
+import sqlite3
+import threading
+import unittest
+from models.base_model import BaseModel
+from models.engine.db_storage import DBStorage
+from models.user import User
+from models.place import Place
+from models.review import Review
+
+
+class TestDBStorage_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the DBStorage class."""
+
+    def tearDown(self):
+        try:
+            os.remove("test.db")
+        except IOError:
+            pass
+
+    def test_DBStorage_instantiation_no_args(self):
+        with self.assertRaises(TypeError):
+            DBStorage()
+
+    def test_creates_one_table_per_class(self):
+        DBStorage("test.db").close()
+        conn = sqlite3.connect("test.db")
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        self.assertEqual({"BaseModel", "User", "State", "City",
+                          "Place", "Amenity", "Review"}, tables)
+
+
+class TestDBStorage_methods(unittest.TestCase):
+    """Unittests for testing methods of the DBStorage class."""
+
+    def setUp(self):
+        self.storage = DBStorage("test.db")
+
+    def tearDown(self):
+        self.storage.close()
+        try:
+            os.remove("test.db")
+        except IOError:
+            pass
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = DBStorage("test.db")
+        self.storage.reload()
+        return self.storage.all()
+
+    def test_all(self):
+        self.assertEqual(dict, type(self.storage.all()))
+
+    def test_all_cls_and_count(self):
+        us = User()
+        self.storage.new(us)
+        self.storage.new(Place())
+        self.assertEqual({"User." + us.id: us}, self.storage.all(User))
+        self.assertEqual(1, self.storage.count("Place"))
+        self.assertEqual(2, self.storage.count())
+
+    def test_get(self):
+        us = User()
+        self.storage.new(us)
+        self.assertIs(us, self.storage.get(User, us.id))
+        self.assertIsNone(self.storage.get("Place", us.id))
+
+    def test_new(self):
+        us = User()
+        self.storage.new(us)
+        self.assertIn("User." + us.id, self.storage.all())
+
+    def test_query(self):
+        for price in (120, 60, 80):
+            pl = Place()
+            pl.price_by_night = price
+            self.storage.new(pl)
+        query = self.storage.query(Place).where(price_by_night__gt=70)
+        self.assertEqual([80, 120], [pl.price_by_night for pl in
+                                     query.order_by("price_by_night")])
+        self.assertEqual("PartitionScan Place (3 keys)",
+                         query.explain().splitlines()[0])
+
+    def test_save_reload(self):
+        bm = BaseModel()
+        us = User()
+        self.storage.new(bm)
+        self.storage.new(us)
+        self.storage.save()
+        objs = self.reopen()
+        self.assertIn("BaseModel." + bm.id, objs)
+        self.assertEqual(User, type(objs["User." + us.id]))
+        self.assertEqual(us.created_at, objs["User." + us.id].created_at)
+
+    def test_save_update(self):
+        pl = Place()
+        self.storage.new(pl)
+        self.storage.save()
+        pl.name = "Loft"
+        self.storage.touch(pl)
+        self.storage.save()
+        self.assertEqual("Loft", self.reopen()["Place." + pl.id].name)
+
+    def test_save_delete(self):
+        rv = Review()
+        self.storage.new(rv)
+        self.storage.save()
+        self.storage.delete(rv)
+        self.storage.save()
+        self.assertNotIn("Review." + rv.id, self.reopen())
+
+    def test_change_while_reading(self):
+        pl = Place()
+
+        def change():
+            with self.storage.reading():
+                self.storage.new(pl)
+                pl.name = "Loft"
+                self.storage.touch(pl)
+        t = threading.Thread(target=change, daemon=True)
+        t.start()
+        t.join(5)
+        self.assertFalse(t.is_alive())
+        self.assertIs(pl, self.storage.get(Place, pl.id))
+
+    def test_save_from_threads(self):
+        def create():
+            for i in range(20):
+                self.storage.new(BaseModel())
+                self.storage.save()
+        threads = [threading.Thread(target=create) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(80, len(self.reopen()))
+
+
+if __name__ == "__main__":
+    unittest.main()
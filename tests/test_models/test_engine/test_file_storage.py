@@ -4,14 +4,44 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_dirty
+    TestFileStorage_sharded
+    TestFileStorage_lazy
+    TestFileStorage_atomic
+    TestFileStorage_autosave
+    TestFileStorage_by_ref
+    TestFileStorage_codecs
+    TestFileStorage_compression
+    TestFileStorage_columns
+    TestFileStorage_by_range
+    TestFileStorage_places_near
+    TestFileStorage_search
+    TestFileStorage_amenities
+    TestFileStorage_views
+    TestFileStorage_shared
+    TestFileStorage_snapshot
+    TestFileStorage_thread_safe
+    TestFileStorage_bulk_load
+    TestFileStorage_export
 """
 import os
 import json
+import random
+import subprocess
+import sys
 import models
+import threading
 import unittest
 from datetime import datetime
+from time import sleep
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
+from models.engine.indexes import RangeIndex
+from models.engine.text_index import TextIndex
 from models.user import User
 from models.state import State
 from models.place import Place
@@ -66,8 +96,44 @@ class TestFileStorage_methods(unittest.TestCase):
         self.assertEqual(dict, type(models.storage.all()))
 
     def test_all_with_arg(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_two_args(self):
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(None, None)
+
+    def test_all_cls(self):
+        bm = BaseModel()
+        us1 = User()
+        us2 = User()
+        self.assertEqual({"User." + us1.id: us1, "User." + us2.id: us2},
+                         models.storage.all(User))
+        self.assertEqual({"BaseModel." + bm.id: bm},
+                         models.storage.all("BaseModel"))
+        self.assertEqual({}, models.storage.all(Review))
+
+    def test_all_cls_follows_delete(self):
+        us = User()
+        models.storage.all(User)
+        models.storage.delete(us)
+        self.assertEqual({}, models.storage.all(User))
+
+    def test_count(self):
+        BaseModel()
+        User()
+        User()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("BaseModel"))
+        self.assertEqual(0, models.storage.count(Review))
+        User()
+        self.assertEqual(3, models.storage.count(User))
+
+    def test_count_after_objects_replaced(self):
+        User()
+        self.assertEqual(1, models.storage.count(User))
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(0, models.storage.count(User))
 
     def test_new(self):
         bm = BaseModel()
@@ -169,5 +235,1777 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(unittest.TestCase):
+    """Unittests for testing the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(journal=True, compact_threshold=1 << 20)
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.journal",
+                     "file.json.journal.old"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_appends_to_journal(self):
+        bm = BaseModel()
+        self.storage.save()
+        self.assertFalse(os.path.exists("file.json"))
+        with open("file.json.journal", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_save_appends_only_changes(self):
+        BaseModel()
+        self.storage.save()
+        us = User()
+        self.storage.save()
+        self.storage.save()
+        with open("file.json.journal", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(2, len(lines))
+        self.assertIn("User." + us.id, lines[1])
+
+    def test_reload_replays_journal(self):
+        bm = BaseModel()
+        us = User()
+        self.storage.save()
+        bm.name = "Betty"
+        self.storage.delete(us)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertEqual("Betty", objs["BaseModel." + bm.id].name)
+        self.assertNotIn("User." + us.id, objs)
+
+    def test_reload_drops_tombstoned_from_indexes(self):
+        rv = Review()
+        rv.place_id = "p1"
+        self.storage.save()
+        self.storage.delete(rv)
+        self.storage.save()
+        self.storage.new(rv)
+        self.assertEqual([rv], self.storage.by_ref(Review, "place_id", "p1"))
+        self.storage.reload()
+        self.assertEqual({}, self.storage.all(Review))
+        self.assertEqual(0, self.storage.count(Review))
+        self.assertEqual([], self.storage.by_ref(Review, "place_id", "p1"))
+        self.storage.reload()
+        self.assertEqual({}, self.storage.all(Review))
+        self.assertNotIn("Review." + rv.id, FileStorage._FileStorage__dirty)
+
+    def test_compact(self):
+        bm = BaseModel()
+        self.storage.save()
+        self.storage.compact()
+        self.assertFalse(os.path.exists("file.json.journal"))
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn("BaseModel." + bm.id, FileStorage._FileStorage__objects)
+
+
+class TestFileStorage_dirty(unittest.TestCase):
+    """Unittests for testing the dirty tracking of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_new_marks_dirty(self):
+        bm = BaseModel()
+        self.assertIn("BaseModel." + bm.id, FileStorage._FileStorage__dirty)
+
+    def test_save_clears_dirty(self):
+        BaseModel()
+        models.storage.save()
+        self.assertEqual(set(), FileStorage._FileStorage__dirty)
+
+    def test_setattr_marks_dirty(self):
+        bm = BaseModel()
+        models.storage.save()
+        bm.name = "Betty"
+        self.assertIn("BaseModel." + bm.id, FileStorage._FileStorage__dirty)
+
+    def test_delete_marks_dirty(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.delete(bm)
+        self.assertNotIn("BaseModel." + bm.id, models.storage.all())
+        self.assertIn("BaseModel." + bm.id, FileStorage._FileStorage__dirty)
+
+    def test_delete_None(self):
+        BaseModel()
+        models.storage.delete(None)
+        self.assertEqual(1, len(models.storage.all()))
+
+    def test_save_reencodes_only_dirty(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        encoded = FileStorage._FileStorage__encoded
+        cached = encoded["User." + us.id]
+        bm.name = "Betty"
+        models.storage.save()
+        self.assertIs(cached, encoded["User." + us.id])
+        self.assertIn(b"Betty", encoded["BaseModel." + bm.id])
+
+    def test_save_matches_json_dump(self):
+        bm = BaseModel()
+        User()
+        models.storage.save()
+        bm.name = "Betty"
+        models.storage.save()
+        expected = {k: v.to_dict() for k, v in models.storage.all().items()}
+        with open("file.json", "r") as f:
+            self.assertEqual(expected, json.load(f))
+
+    def test_save_drops_deleted(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.delete(bm)
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertNotIn("BaseModel." + bm.id, f.read())
+
+
+class TestFileStorage_sharded(unittest.TestCase):
+    """Unittests for testing the sharded mode of the FileStorage class."""
+
+    shards = ["file.{}.json".format(name) for name in
+              ("BaseModel", "User", "State", "City",
+               "Place", "Amenity", "Review")]
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(sharded=True)
+
+    def tearDown(self):
+        for name in self.shards + ["file.json"]:
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_journal_and_sharded(self):
+        with self.assertRaises(ValueError):
+            FileStorage(journal=True, sharded=True)
+
+    def test_save_writes_one_file_per_class(self):
+        bm = BaseModel()
+        rv = Review()
+        self.storage.save()
+        with open("file.BaseModel.json", "r") as f:
+            self.assertEqual(["BaseModel." + bm.id], list(json.load(f)))
+        with open("file.Review.json", "r") as f:
+            self.assertEqual(["Review." + rv.id], list(json.load(f)))
+        self.assertFalse(os.path.exists("file.User.json"))
+
+    def test_save_rewrites_only_changed_shards(self):
+        BaseModel()
+        rv = Review()
+        self.storage.save()
+        os.remove("file.BaseModel.json")
+        rv.text = "Great"
+        self.storage.save()
+        self.assertFalse(os.path.exists("file.BaseModel.json"))
+        with open("file.Review.json", "r") as f:
+            self.assertIn("Great", f.read())
+
+    def test_reload(self):
+        bm = BaseModel()
+        rv = Review()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = FileStorage._FileStorage__objects
+        self.assertIn("BaseModel." + bm.id, objs)
+        self.assertIn("Review." + rv.id, objs)
+
+    def test_reload_migrates_unsharded_store(self):
+        bm = BaseModel()
+        rv = Review()
+        FileStorage().save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(1, self.storage.count(Review))
+        self.assertIn("BaseModel." + bm.id, self.storage.all())
+        self.storage.save()
+        self.assertTrue(os.path.exists("file.BaseModel.json"))
+        self.assertFalse(os.path.exists("file.User.json"))
+        os.remove("file.json")
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual({"BaseModel." + bm.id, "Review." + rv.id},
+                         set(self.storage.all()))
+
+    def test_reload_shard(self):
+        bm = BaseModel()
+        rv = Review()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload_shard(Review)
+        objs = FileStorage._FileStorage__objects
+        self.assertNotIn("BaseModel." + bm.id, objs)
+        self.assertIn("Review." + rv.id, objs)
+
+
+class TestFileStorage_lazy(unittest.TestCase):
+    """Unittests for testing the lazy mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(lazy=True)
+        self.bm = BaseModel()
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_one_record_per_line(self):
+        with open("file.json", "r") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(4, len(lines))
+        self.assertIn("BaseModel." + self.bm.id, lines[1])
+        self.assertIn("User." + self.us.id, lines[2])
+
+    def test_reload_does_not_instantiate(self):
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertEqual(2, len(objs))
+        self.assertIn("User." + self.us.id, objs)
+        self.assertTrue(objs.is_pending("User." + self.us.id))
+
+    def test_access_instantiates(self):
+        self.storage.reload()
+        objs = self.storage.all()
+        us = objs["User." + self.us.id]
+        self.assertEqual(User, type(us))
+        self.assertEqual("Betty", us.first_name)
+        self.assertEqual(self.us.created_at, us.created_at)
+        self.assertIs(us, objs["User." + self.us.id])
+        self.assertFalse(objs.is_pending("User." + self.us.id))
+        self.assertTrue(objs.is_pending("BaseModel." + self.bm.id))
+
+    def test_iteration_instantiates(self):
+        self.storage.reload()
+        types = {type(obj) for obj in self.storage.all().values()}
+        self.assertEqual({BaseModel, User}, types)
+
+    def test_save_keeps_pending_records(self):
+        self.storage.reload()
+        objs = self.storage.all()
+        objs["User." + self.us.id].last_name = "Holberton"
+        self.storage.save()
+        self.assertTrue(objs.is_pending("BaseModel." + self.bm.id))
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertIn("BaseModel." + self.bm.id, saved)
+        self.assertEqual("Holberton",
+                         saved["User." + self.us.id]["last_name"])
+
+    def test_delete_pending(self):
+        self.storage.reload()
+        self.storage.delete(self.bm)
+        self.storage.save()
+        with open("file.json", "r") as f:
+            self.assertNotIn("BaseModel." + self.bm.id, f.read())
+
+    def test_record_does_not_instantiate(self):
+        self.storage.reload()
+        objs = self.storage.all()
+        record = objs.record("User." + self.us.id)
+        self.assertEqual("Betty", record["first_name"])
+        self.assertEqual("User", record["__class__"])
+        self.assertTrue(objs.is_pending("User." + self.us.id))
+
+    def test_reload_other_layout(self):
+        with open("file.json", "w") as f:
+            json.dump({"BaseModel." + self.bm.id: self.bm.to_dict()}, f)
+        self.storage.reload()
+        objs = self.storage.all()
+        self.assertFalse(objs.is_pending("BaseModel." + self.bm.id))
+        self.assertEqual(BaseModel, type(objs["BaseModel." + self.bm.id]))
+
+
+class TestFileStorage_atomic(unittest.TestCase):
+    """Unittests for testing atomic and group committed saves."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_leaves_no_temporary_file(self):
+        BaseModel()
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.tmp"))
+
+    def test_crash_keeps_previous_file(self):
+        bm = BaseModel()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            before = f.read()
+        bm.name = "Betty"
+        with patch("os.replace", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(before, f.read())
+        os.remove("file.json.tmp")
+
+    def test_failed_save_is_retried(self):
+        bm = BaseModel()
+        with patch("os.replace", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                models.storage.save()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_failed_encode_keeps_changes(self):
+        users = [User() for i in range(50)]
+        models.storage.save()
+        for us in users:
+            us.first_name = "Betty"
+        users[25].tags = {"a"}
+        with self.assertRaises(TypeError):
+            models.storage.save()
+        users[25].tags = ["a"]
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(["Betty"] * 50, [
+            saved["User." + us.id].get("first_name") for us in users])
+
+    def test_group_commit_coalesces_saves(self):
+        storage = FileStorage(group_commit=0.05)
+        write = FileStorage._FileStorage__write
+        writes = []
+
+        def counted(self):
+            writes.append(1)
+            write(self)
+
+        def create():
+            BaseModel()
+            storage.save()
+
+        with patch.object(FileStorage, "_FileStorage__write", counted):
+            threads = [threading.Thread(target=create) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertLess(len(writes), 8)
+        with open("file.json", "r") as f:
+            self.assertEqual(8, len(json.load(f)))
+
+
+class TestFileStorage_autosave(unittest.TestCase):
+    """Unittests for testing the autosave mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        for path in ("file.json", "file.Review.text.idx"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_is_deferred(self):
+        storage = FileStorage(autosave=60)
+        BaseModel()
+        storage.save()
+        self.assertFalse(os.path.exists("file.json"))
+        storage.flush()
+
+    def test_flush(self):
+        storage = FileStorage(autosave=60)
+        bm = BaseModel()
+        storage.save()
+        storage.flush()
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_flush_without_save(self):
+        storage = FileStorage(autosave=60)
+        BaseModel()
+        storage.flush()
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_writer_saves_after_delay(self):
+        storage = FileStorage(autosave=0.05)
+        bm = BaseModel()
+        storage.save()
+        for i in range(100):
+            if os.path.exists("file.json"):
+                break
+            sleep(0.02)
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_writer_does_not_save_indexes(self):
+        storage = FileStorage(autosave=0.01)
+        with patch.object(models, "storage", storage):
+            Review().text = "Lovely garden"
+            storage.search("garden")
+        with patch.object(TextIndex, "dump") as dump:
+            storage.save()
+            for i in range(100):
+                if os.path.exists("file.json"):
+                    break
+                sleep(0.02)
+            sleep(0.05)
+            dump.assert_not_called()
+        storage.flush()
+        self.assertTrue(os.path.exists("file.Review.text.idx"))
+
+    def test_autosave_is_thread_safe(self):
+        self.assertTrue(FileStorage(autosave=60)._FileStorage__thread_safe)
+
+    def test_autosave_with_lazy(self):
+        with self.assertRaises(ValueError):
+            FileStorage(autosave=60, lazy=True)
+
+    def test_writes_while_creating(self):
+        storage = FileStorage(autosave=0.001)
+        for i in range(2000):
+            BaseModel()
+            storage.save()
+        storage.flush()
+        self.assertIsNone(storage._FileStorage__writer_error)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(2000, storage.count(BaseModel))
+
+    def test_writer_error_is_reported(self):
+        storage = FileStorage(autosave=0.01)
+        BaseModel()
+        with patch("os.replace", side_effect=OSError("disk full")):
+            storage.save()
+            for i in range(100):
+                if storage._FileStorage__writer_error is not None:
+                    break
+                sleep(0.02)
+            with self.assertRaises(OSError):
+                storage.save()
+        storage.flush()
+        self.assertTrue(os.path.exists("file.json"))
+
+
+class TestFileStorage_by_ref(unittest.TestCase):
+    """Unittests for testing the foreign key indexes of FileStorage."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.rv1 = Review()
+        self.rv1.place_id = self.pl.id
+        self.rv2 = Review()
+        self.rv2.place_id = self.pl.id
+        self.rv3 = Review()
+        self.rv3.place_id = "other"
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_by_ref(self):
+        reviews = models.storage.by_ref(Review, "place_id", self.pl.id)
+        self.assertCountEqual([self.rv1, self.rv2], reviews)
+
+    def test_by_ref_no_match(self):
+        self.assertEqual([], models.storage.by_ref(City, "state_id", "x"))
+
+    def test_by_ref_not_indexed(self):
+        with self.assertRaises(KeyError):
+            models.storage.by_ref(Review, "text", "x")
+
+    def test_by_ref_follows_new(self):
+        models.storage.by_ref(Review, "place_id", self.pl.id)
+        rv = Review()
+        rv.place_id = self.pl.id
+        reviews = models.storage.by_ref(Review, "place_id", self.pl.id)
+        self.assertCountEqual([self.rv1, self.rv2, rv], reviews)
+
+    def test_by_ref_follows_update(self):
+        models.storage.by_ref(Review, "place_id", self.pl.id)
+        self.rv1.place_id = "other"
+        reviews = models.storage.by_ref(Review, "place_id", self.pl.id)
+        self.assertEqual([self.rv2], reviews)
+        reviews = models.storage.by_ref(Review, "place_id", "other")
+        self.assertCountEqual([self.rv1, self.rv3], reviews)
+
+    def test_by_ref_follows_delete(self):
+        models.storage.by_ref(Review, "place_id", self.pl.id)
+        models.storage.delete(self.rv2)
+        reviews = models.storage.by_ref(Review, "place_id", self.pl.id)
+        self.assertEqual([self.rv1], reviews)
+
+    def test_by_ref_after_objects_replaced(self):
+        models.storage.by_ref(Review, "place_id", self.pl.id)
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(
+            [], models.storage.by_ref(Review, "place_id", self.pl.id))
+
+
+class TestFileStorage_codecs(unittest.TestCase):
+    """Unittests for testing the codecs of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            FileStorage(codec="yaml")
+
+    def test_journal_requires_json(self):
+        with self.assertRaises(ValueError):
+            FileStorage(journal=True, codec="pickle")
+
+    def test_save_writes_header(self):
+        FileStorage(codec="binary").save()
+        with open("file.json", "rb") as f:
+            self.assertEqual(b"HBNB binary\n", f.readline())
+
+    def test_save_reload(self):
+        for codec in ("json", "binary", "pickle"):
+            for lazy in (False, True):
+                FileStorage._FileStorage__objects = {}
+                storage = FileStorage(codec=codec, lazy=lazy)
+                pl = Place()
+                pl.amenity_ids = ["a", "b"]
+                pl.latitude = 37.77
+                storage.save()
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                reloaded = storage.all()["Place." + pl.id]
+                self.assertEqual(pl.to_dict(), reloaded.to_dict())
+
+    def test_reload_detects_codec(self):
+        bm = BaseModel()
+        FileStorage(codec="pickle").save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage(codec="json").reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+
+    def test_lazy_save_converts_pending_records(self):
+        bm = BaseModel()
+        FileStorage(codec="binary").save()
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage(codec="json", lazy=True)
+        storage.reload()
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+
+
+class TestFileStorage_compression(unittest.TestCase):
+    """Unittests for testing the compression of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        for path in ("file.json", "file.json.journal"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            FileStorage(compression="zstd")
+
+    def test_save_compresses(self):
+        for _ in range(50):
+            BaseModel()
+        FileStorage().save()
+        size = os.path.getsize("file.json")
+        FileStorage(compression="zlib", compression_level=9).save()
+        with open("file.json", "rb") as f:
+            self.assertEqual(b"\x1f\x8b", f.read(2))
+        self.assertLess(os.path.getsize("file.json"), size)
+
+    def test_save_reload(self):
+        for compression in ("zlib", "lzma", "bz2"):
+            for codec in ("json", "binary"):
+                for lazy in (False, True):
+                    FileStorage._FileStorage__objects = {}
+                    storage = FileStorage(codec=codec, lazy=lazy,
+                                          compression=compression,
+                                          compression_level=1)
+                    us = User()
+                    us.first_name = "Betty"
+                    storage.save()
+                    FileStorage._FileStorage__objects = {}
+                    storage.reload()
+                    reloaded = storage.all()["User." + us.id]
+                    self.assertEqual(us.to_dict(), reloaded.to_dict())
+
+    def test_reload_ignores_configured_compression(self):
+        bm = BaseModel()
+        FileStorage(compression="bz2").save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage().reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+
+    def test_compact_compresses(self):
+        storage = FileStorage(journal=True, compression="lzma")
+        bm = BaseModel()
+        storage.save()
+        storage.compact()
+        with open("file.json", "rb") as f:
+            self.assertEqual(b"\xfd7zXZ\x00", f.read(6))
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertIn("BaseModel." + bm.id, storage.all())
+
+
+class TestFileStorage_columns(unittest.TestCase):
+    """Unittests for testing the columnar snapshots of FileStorage."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.Place.columns")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_columns_column(self):
+        pl = Place()
+        pl.price_by_night = 80
+        Place().latitude = 1.5
+        User()
+        models.storage.save_columns(Place)
+        FileStorage._FileStorage__objects = {}
+        price = models.storage.column(Place, "price_by_night")
+        self.assertEqual([80, 0], list(price))
+        self.assertEqual([0.0, 1.5],
+                         list(models.storage.column("Place", "latitude")))
+        self.assertEqual(0, models.storage.count())
+
+    def test_column_without_snapshot(self):
+        with self.assertRaises(FileNotFoundError):
+            models.storage.column(Place, "max_guest")
+
+    def test_reload_columns(self):
+        pl = Place()
+        pl.name = "Loft"
+        pl.max_guest = 4
+        models.storage.save_columns(Place)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload_columns(Place)
+        reloaded = models.storage.all()["Place." + pl.id]
+        self.assertEqual("Loft", reloaded.name)
+        self.assertEqual(4, reloaded.max_guest)
+        self.assertEqual(pl.created_at, reloaded.created_at)
+
+    def test_reload_columns_without_snapshot(self):
+        models.storage.reload_columns(Place)
+        self.assertEqual(0, models.storage.count())
+
+
+class TestFileStorage_by_range(unittest.TestCase):
+    """Unittests for testing the sorted indexes of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        self.indexes = dict(FileStorage._FileStorage__indexes)
+        self.class_indexes = {name: list(indexes) for name, indexes in
+                              FileStorage._FileStorage__class_indexes.items()}
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(range_indexes=["Place.price_by_night"])
+        self.places = []
+        for price in (120, 50, 80, 200):
+            pl = Place()
+            pl.price_by_night = price
+            self.places.append(pl)
+
+    def tearDown(self):
+        FileStorage._FileStorage__indexes = self.indexes
+        FileStorage._FileStorage__class_indexes = self.class_indexes
+        FileStorage._FileStorage__stale = True
+        FileStorage._FileStorage__objects = {}
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def prices(self, places):
+        return [pl.price_by_night for pl in places]
+
+    def test_by_range(self):
+        self.assertEqual([80, 120], self.prices(
+            self.storage.by_range(Place, "price_by_night", 60, 120)))
+        self.assertEqual([50, 80, 120, 200], self.prices(
+            self.storage.by_range(Place, "price_by_night")))
+
+    def test_by_range_not_indexed(self):
+        with self.assertRaises(KeyError):
+            self.storage.by_range(Place, "max_guest", 1, 2)
+
+    def test_by_range_follows_changes(self):
+        self.storage.by_range(Place, "price_by_night")
+        self.places[0].price_by_night = 10
+        self.storage.delete(self.places[3])
+        Place().price_by_night = 90
+        self.assertEqual([10, 50, 80, 90], self.prices(
+            self.storage.by_range(Place, "price_by_night")))
+
+    def test_by_range_follows_do_update(self):
+        self.storage.by_range(Place, "price_by_night")
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("update Place {} price_by_night 70".format(
+                self.places[3].id))
+        self.assertEqual([50, 70, 80, 120], self.prices(
+            self.storage.by_range(Place, "price_by_night", 0, 150)))
+
+    def test_query_range(self):
+        query = self.storage.query(Place).where(
+            price_by_night__gte=60, price_by_night__lt=200)
+        self.assertEqual([80, 120], sorted(self.prices(query)))
+        self.assertEqual(
+            "IndexScan Place.price_by_night:range (price_by_night gte 60, "
+            "price_by_night lt 200) (2 keys)", query.explain())
+
+    def test_query_top_k(self):
+        query = self.storage.query(Place).order_by("-price_by_night").limit(2)
+        self.assertEqual([200, 120], self.prices(query))
+        self.assertEqual(["IndexOrderScan Place.price_by_night:range "
+                          "(4 keys)", "IndexOrder -price_by_night",
+                          "Limit 2"], query.explain().splitlines())
+        query = self.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([50, 80, 120, 200], self.prices(query))
+
+    def test_query_does_not_copy_unused_range_index(self):
+        self.places[2].name = "Loft"
+        with patch.object(RangeIndex, "range", side_effect=AssertionError):
+            self.assertEqual(4, len(self.storage.query(Place).where(
+                city_id="").all()))
+            self.assertEqual([self.places[2]], self.storage.query(
+                Place).where(name="Loft").all())
+
+    def test_query_top_k_filtered(self):
+        query = self.storage.query(Place).where(price_by_night__ne=50) \
+            .order_by("price_by_night").limit(2)
+        self.assertEqual([80, 120], self.prices(query))
+
+    def test_query_order_not_numeric(self):
+        self.places[0].price_by_night = None
+        query = self.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([50, 80, 200, None], self.prices(query))
+        self.assertTrue(query.explain().startswith("PartitionScan"))
+
+
+class TestFileStorage_places_near(unittest.TestCase):
+    """Unittests for testing the geospatial index of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.sf = Place()
+        self.sf.latitude, self.sf.longitude = 37.7749, -122.4194
+        self.oakland = Place()
+        self.oakland.latitude, self.oakland.longitude = 37.8044, -122.2712
+        self.la = Place()
+        self.la.latitude, self.la.longitude = 34.0522, -118.2437
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_places_near(self):
+        self.assertEqual([self.sf, self.oakland],
+                         models.storage.places_near(37.78, -122.41, 50))
+        self.assertEqual([self.sf],
+                         models.storage.places_near(37.78, -122.41, 50, 1))
+
+    def test_places_in_bbox(self):
+        self.assertCountEqual([self.sf, self.oakland],
+                              models.storage.places_in_bbox(37, -123, 38,
+                                                            -122))
+
+    def test_places_near_follows_changes(self):
+        models.storage.places_near(0, 0, 1)
+        self.la.latitude, self.la.longitude = 37.78, -122.41
+        models.storage.delete(self.oakland)
+        self.assertEqual([self.la, self.sf],
+                         models.storage.places_near(37.78, -122.41, 50))
+
+    def test_places_near_after_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual([self.sf.id, self.oakland.id], [
+            pl.id for pl in models.storage.places_near(37.78, -122.41, 50)])
+
+
+class TestFileStorage_search(unittest.TestCase):
+    """Unittests for testing the full-text indexes of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.pl.name = "Garden loft"
+        self.pl.description = "A quiet loft with a garden"
+        self.rv = Review()
+        self.rv.text = "Lovely garden"
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.us.last_name = "Garden"
+
+    def tearDown(self):
+        for path in ("file.json", "file.Place.text.idx",
+                     "file.Review.text.idx", "file.User.text.idx"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_search(self):
+        self.assertEqual([self.pl], models.storage.search("loft"))
+        self.assertCountEqual([self.pl, self.rv, self.us],
+                              models.storage.search("garden"))
+        self.assertEqual([], models.storage.search("pool"))
+
+    def test_search_class_limit(self):
+        self.assertEqual([self.rv], models.storage.search("garden", Review))
+        self.assertEqual([self.us], models.storage.search("betty", "User"))
+        self.assertEqual(2, len(models.storage.search("garden", limit=2)))
+
+    def test_search_follows_changes(self):
+        models.storage.search("garden")
+        self.rv.text = "Noisy street"
+        models.storage.delete(self.us)
+        self.assertEqual([self.pl], models.storage.search("garden"))
+        self.assertEqual([self.rv], models.storage.search("street"))
+
+    def test_flush_persists_indexes(self):
+        models.storage.save()
+        models.storage.search("garden")
+        models.storage.flush()
+        self.assertTrue(os.path.exists("file.Review.text.idx"))
+        FileStorage._FileStorage__objects = {}
+        with patch.object(TextIndex, "load") as load:
+            models.storage.reload()
+            load.assert_not_called()
+        self.assertIn("Review:text", FileStorage._FileStorage__restorable)
+        with patch.object(TextIndex, "build", side_effect=AssertionError):
+            self.assertEqual([self.rv.id], [
+                rv.id for rv in models.storage.search("lovely")])
+
+    def test_flush_keeps_unused_indexes(self):
+        models.storage.save()
+        models.storage.search("garden")
+        models.storage.flush()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        Amenity()
+        models.storage.save()
+        with patch.object(TextIndex, "load") as load:
+            models.storage.flush()
+            load.assert_not_called()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("Review:text", FileStorage._FileStorage__restorable)
+        with patch.object(TextIndex, "build", side_effect=AssertionError):
+            self.assertEqual([self.rv.id], [
+                rv.id for rv in models.storage.search("lovely")])
+
+    def test_flush_skips_unsaved_changes(self):
+        models.storage.search("garden")
+        models.storage.flush()
+        self.assertFalse(os.path.exists("file.Review.text.idx"))
+
+    def test_restored_index_follows_changes(self):
+        models.storage.save()
+        models.storage.search("garden")
+        models.storage.flush()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        rv = models.storage.all()["Review." + self.rv.id]
+        rv.text = "Noisy street"
+        Review().text = "Lovely view"
+        self.assertEqual([], models.storage.search("garden", Review))
+        self.assertEqual(1, len(models.storage.search("lovely")))
+
+    def test_reload_ignores_outdated_index(self):
+        models.storage.save()
+        models.storage.search("garden")
+        models.storage.flush()
+        self.rv.text = "Noisy street"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertNotIn("Review:text", FileStorage._FileStorage__restorable)
+        self.assertEqual([], models.storage.search("lovely"))
+
+
+class TestFileStorage_amenities(unittest.TestCase):
+    """Unittests for testing the amenity index of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.wifi = Amenity()
+        self.pool = Amenity()
+        self.pl1 = Place()
+        self.pl1.amenity_ids = [self.wifi.id, self.pool.id]
+        self.pl2 = Place()
+        self.pl2.amenity_ids = [self.wifi.id]
+        self.pl3 = Place()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_places_with_amenities(self):
+        self.assertEqual([self.pl1], models.storage.places_with_amenities(
+            [self.wifi, self.pool]))
+        self.assertEqual([self.pl1, self.pl2],
+                         models.storage.places_with_amenities(
+                             any_of=[self.wifi.id, self.pool.id]))
+        self.assertEqual(3, len(models.storage.places_with_amenities()))
+
+    def test_follows_do_update(self):
+        models.storage.places_with_amenities()
+        cmd = 'Place.update("{}", {{"amenity_ids": ["{}"]}})'.format(
+            self.pl3.id, self.pool.id)
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd(cmd)
+        self.assertEqual([self.pl1, self.pl3],
+                         models.storage.places_with_amenities([self.pool]))
+        models.storage.delete(self.pl1)
+        self.assertEqual([self.pl3],
+                         models.storage.places_with_amenities([self.pool]))
+
+    def test_query_contains(self):
+        query = models.storage.query(Place).where(
+            amenity_ids__contains=self.wifi.id,
+            amenity_ids__contains_any=[self.pool.id, "spa"])
+        self.assertEqual([self.pl1], query.all())
+        self.assertTrue(query.explain().startswith(
+            "IndexScan Place:amenities"))
+        query = models.storage.query(Place).where(
+            amenity_ids__contains_all=[self.wifi.id])
+        self.assertCountEqual([self.pl1, self.pl2], query.all())
+
+
+class TestFileStorage_views(unittest.TestCase):
+    """Unittests for testing the materialized views of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.st = State()
+        self.sf = City()
+        self.sf.state_id = self.st.id
+        self.la = City()
+        self.la.state_id = self.st.id
+        self.places = []
+        for price, city in ((100, self.sf), (50, self.sf), (80, self.la)):
+            pl = Place()
+            pl.city_id = city.id
+            pl.price_by_night = price
+            self.places.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_aggregate(self):
+        stats = models.storage.aggregate("price_by_city", self.sf.id)
+        self.assertEqual({"count": 2, "sum": 150, "avg": 75.0, "min": 50,
+                          "max": 100}, stats)
+
+    def test_aggregate_unknown_view(self):
+        with self.assertRaises(KeyError):
+            models.storage.aggregate("price_by_state", self.st.id)
+
+    def test_reviews_by_place(self):
+        for i in range(3):
+            Review().place_id = self.places[0].id
+        stats = models.storage.aggregate("reviews_by_place",
+                                         self.places[0].id)
+        self.assertEqual(3, stats["count"])
+
+    def test_places_per_state(self):
+        self.assertEqual(3, models.storage.places_per_state(self.st.id))
+        self.la.state_id = "other"
+        self.assertEqual(2, models.storage.places_per_state(self.st.id))
+
+    def test_follows_console(self):
+        models.storage.aggregate("price_by_city", self.sf.id)
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("update Place {} price_by_night 20".format(
+                self.places[0].id))
+            HBNBCommand().onecmd("update Place {} city_id {}".format(
+                self.places[2].id, self.sf.id))
+            HBNBCommand().onecmd("destroy Place {}".format(
+                self.places[1].id))
+        stats = models.storage.aggregate("price_by_city", self.sf.id)
+        self.assertEqual({"count": 2, "sum": 100, "avg": 50.0, "min": 20,
+                          "max": 80}, stats)
+        self.assertEqual(0, models.storage.aggregate(
+            "price_by_city", self.la.id)["count"])
+
+    def test_rebuild_matches_incremental(self):
+        view = models.storage.index("price_by_city")
+        rng = random.Random(0)
+        cities = [self.sf.id, self.la.id, "ny"]
+        for i in range(300):
+            op = rng.random()
+            if op < 0.4 or not self.places:
+                pl = Place()
+                pl.city_id = rng.choice(cities)
+                pl.price_by_night = rng.randrange(300)
+                self.places.append(pl)
+            elif op < 0.8:
+                pl = rng.choice(self.places)
+                pl.price_by_night = rng.randrange(300)
+                pl.city_id = rng.choice(cities)
+            else:
+                pl = self.places.pop(rng.randrange(len(self.places)))
+                models.storage.delete(pl)
+        incremental = view.groups()
+        rebuilt = models.storage.rebuild_index("price_by_city").groups()
+        self.assertEqual(incremental, rebuilt)
+
+
+class TestFileStorage_shared(unittest.TestCase):
+    """Unittests for testing FileStorage shared between processes."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(shared=True)
+        self.storage.reload()
+
+    def tearDown(self):
+        for name in ("file.json", "file.json.version", "file.json.lock"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__generation = None
+
+    def run_process(self, code):
+        """Run code in another process sharing file.json."""
+        env = dict(os.environ, HBNB_STORAGE_SHARED="1")
+        script = "from models import storage\n" + code
+        return subprocess.run([sys.executable, "-c", script], env=env,
+                              check=True, capture_output=True,
+                              text=True).stdout.strip()
+
+    def saved(self):
+        with open("file.json", "r") as f:
+            return json.load(f)
+
+    def test_shared_requires_snapshot_saves(self):
+        for mode in ("journal", "sharded", "lazy"):
+            with self.assertRaises(ValueError):
+                FileStorage(shared=True, **{mode: True})
+
+    def test_save_bumps_generation(self):
+        BaseModel()
+        self.storage.save()
+        self.storage.save()
+        with open("file.json.version", "r") as f:
+            self.assertEqual("2", f.read())
+
+    def test_save_merges_other_process(self):
+        bm = BaseModel()
+        self.storage.save()
+        uid = self.run_process("from models.user import User\n"
+                               "us = User()\nstorage.save()\nprint(us.id)")
+        pl = Place()
+        self.storage.save()
+        keys = {"BaseModel." + bm.id, "User." + uid, "Place." + pl.id}
+        self.assertEqual(keys, set(self.saved()))
+        self.assertEqual(keys, set(self.storage.all()))
+
+    def test_save_drops_objects_destroyed_elsewhere(self):
+        bm = BaseModel()
+        kept = BaseModel()
+        self.storage.save()
+        self.run_process("storage.delete(storage.all()['BaseModel.{}'])\n"
+                         "storage.save()".format(bm.id))
+        pl = Place()
+        self.storage.save()
+        keys = {"BaseModel." + kept.id, "Place." + pl.id}
+        self.assertEqual(keys, set(self.saved()))
+        self.assertEqual(keys, set(self.storage.all()))
+
+    def test_local_changes_win(self):
+        mine = BaseModel()
+        theirs = BaseModel()
+        self.storage.save()
+        self.run_process("for key in ('BaseModel.{}', 'BaseModel.{}'):\n"
+                         "    storage.all()[key].name = 'other'\n"
+                         "storage.save()".format(mine.id, theirs.id))
+        mine.name = "mine"
+        self.storage.save()
+        saved = self.saved()
+        self.assertEqual("mine", saved["BaseModel." + mine.id]["name"])
+        self.assertEqual("other", saved["BaseModel." + theirs.id]["name"])
+        adopted = self.storage.all()["BaseModel." + theirs.id]
+        self.assertEqual("other", adopted.name)
+
+    def test_same_object_changes_merge(self):
+        pl = Place()
+        pl.name = "Loft"
+        self.storage.save()
+        self.run_process("pl = storage.all()['Place.{}']\n"
+                         "pl.price_by_night = 99\n"
+                         "pl.description = 'theirs'\n"
+                         "storage.save()".format(pl.id))
+        pl.name = "Cabin"
+        pl.description = "mine"
+        self.storage.save()
+        saved = self.saved()["Place." + pl.id]
+        self.assertEqual("Cabin", saved["name"])
+        self.assertEqual("mine", saved["description"])
+        self.assertEqual(99, saved["price_by_night"])
+        self.assertEqual(99, pl.price_by_night)
+        self.assertEqual([pl], self.storage.by_ref(Place, "city_id", ""))
+
+    def test_reload_merges_same_object(self):
+        pl = Place()
+        self.storage.save()
+        self.run_process("pl = storage.all()['Place.{}']\n"
+                         "pl.price_by_night = 99\n"
+                         "storage.save()".format(pl.id))
+        pl.name = "Loft"
+        self.storage.reload()
+        self.assertEqual(99, pl.price_by_night)
+        self.assertEqual("Loft", pl.name)
+        self.storage.save()
+        saved = self.saved()["Place." + pl.id]
+        self.assertEqual(("Loft", 99), (saved["name"],
+                                        saved["price_by_night"]))
+
+    def test_reload_merges(self):
+        bm = BaseModel()
+        self.storage.save()
+        uid = self.run_process("from models.user import User\n"
+                               "us = User()\n"
+                               "storage.delete(storage.all()"
+                               "['BaseModel.{}'])\n"
+                               "storage.save()\nprint(us.id)".format(bm.id))
+        self.storage.reload()
+        self.assertEqual({"User." + uid}, set(self.storage.all()))
+
+    def test_concurrent_processes_lose_no_save(self):
+        env = dict(os.environ, HBNB_STORAGE_SHARED="1")
+        script = ("from models import storage\n"
+                  "from models.base_model import BaseModel\n"
+                  "for i in range(10):\n"
+                  "    BaseModel()\n"
+                  "    storage.save()\n")
+        procs = [subprocess.Popen([sys.executable, "-c", script], env=env)
+                 for i in range(4)]
+        for proc in procs:
+            self.assertEqual(0, proc.wait())
+        self.assertEqual(40, len(self.saved()))
+        with open("file.json.version", "r") as f:
+            self.assertEqual("40", f.read())
+
+
+class TestFileStorage_snapshot(unittest.TestCase):
+    """Unittests for testing the snapshots of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_snapshot_as_of_last_save(self):
+        bm = BaseModel()
+        models.storage.save()
+        unsaved = BaseModel()
+        bm.name = "Betty"
+        snap = models.storage.snapshot()
+        self.assertEqual({"BaseModel." + bm.id}, set(snap))
+        self.assertFalse(hasattr(snap["BaseModel." + bm.id], "name"))
+        models.storage.save()
+        self.assertNotIn("BaseModel." + unsaved.id, snap)
+        new = models.storage.snapshot()
+        self.assertEqual("Betty", new["BaseModel." + bm.id].name)
+        self.assertEqual(2, len(new))
+        self.assertGreater(new.version, snap.version)
+
+    def test_snapshot_keeps_deleted_objects(self):
+        pl = Place()
+        models.storage.save()
+        snap = models.storage.snapshot()
+        models.storage.delete(pl)
+        self.assertIn("Place." + pl.id, models.storage.snapshot())
+        models.storage.save()
+        self.assertIn("Place." + pl.id, snap)
+        self.assertEqual(0, models.storage.snapshot().count(Place))
+
+    def test_snapshot_shares_unchanged_version(self):
+        BaseModel()
+        models.storage.save()
+        snap = models.storage.snapshot()
+        self.assertEqual(snap.version, models.storage.snapshot().version)
+
+    def test_snapshot_copies_only_changed_classes(self):
+        us = User()
+        Place()
+        models.storage.save()
+        snap = models.storage.snapshot()
+        us.first_name = "Betty"
+        models.storage.save()
+        partitions = snap._Snapshot__partitions
+        new = models.storage.snapshot()._Snapshot__partitions
+        self.assertIs(partitions["Place"], new["Place"])
+        self.assertIsNot(partitions["User"], new["User"])
+
+    def test_snapshot_objects_are_detached(self):
+        bm = BaseModel()
+        models.storage.save()
+        copy = models.storage.snapshot()["BaseModel." + bm.id]
+        self.assertIsNot(bm, copy)
+        copy.name = "Betty"
+        self.assertIs(bm, models.storage.all()["BaseModel." + bm.id])
+        self.assertEqual(set(), FileStorage._FileStorage__dirty)
+
+    def test_snapshot_after_reload(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.snapshot()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        snap = models.storage.snapshot()
+        self.assertEqual({"BaseModel." + bm.id}, set(snap))
+        self.assertEqual(bm.created_at,
+                         snap["BaseModel." + bm.id].created_at)
+
+    def test_iterate_while_destroying(self):
+        places = [Place() for i in range(200)]
+        models.storage.save()
+        snap = models.storage.snapshot()
+
+        def destroy():
+            for pl in places:
+                models.storage.delete(pl)
+                models.storage.save()
+
+        writer = threading.Thread(target=destroy)
+        writer.start()
+        seen = [key for key in snap]
+        writer.join()
+        self.assertEqual(200, len(seen))
+        self.assertEqual(200, len(snap.all(Place)))
+        self.assertEqual(0, len(models.storage.snapshot()))
+
+
+class TestFileStorage_thread_safe(unittest.TestCase):
+    """Unittests for testing the thread-safe mode of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage(thread_safe=True)
+        patcher = patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_thread_safe_requires_eager_reloads(self):
+        with self.assertRaises(ValueError):
+            FileStorage(thread_safe=True, lazy=True)
+
+    def test_get(self):
+        pl = Place()
+        self.assertIs(pl, self.storage.get(Place, pl.id))
+        self.assertIs(pl, self.storage.get("Place", pl.id))
+        self.assertIsNone(self.storage.get(User, pl.id))
+
+    def test_new_object_takes_lock_once(self):
+        rw = self.storage._FileStorage__rw
+        with patch.object(rw, "write", wraps=rw.write) as write:
+            Place(name="Home", city_id="c1", latitude=1.0)
+        self.assertEqual(1, write.call_count)
+
+    def test_no_change_while_reading(self):
+        bm = BaseModel()
+        with self.storage.reading():
+            with self.assertRaises(RuntimeError):
+                bm.name = "Betty"
+
+    def test_reading_blocks_writers(self):
+        created = threading.Event()
+
+        def create():
+            BaseModel()
+            created.set()
+
+        with self.storage.reading():
+            t = threading.Thread(target=create)
+            t.start()
+            self.assertFalse(created.wait(0.05))
+            self.assertEqual(0, len(self.storage.all()))
+        t.join()
+        self.assertEqual(1, len(self.storage.all()))
+
+    def test_locked_updates(self):
+        pl = Place()
+        pl.number_rooms = 0
+
+        def increment():
+            for i in range(200):
+                with self.storage.locked(pl):
+                    pl.number_rooms = pl.number_rooms + 1
+
+        threads = [threading.Thread(target=increment) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(800, pl.number_rooms)
+        self.assertIs(self.storage.locked(pl),
+                      self.storage.locked("Place." + pl.id))
+
+    def test_concurrent_readers_and_writers(self):
+        errors = []
+        for i in range(1000):
+            BaseModel()
+
+        def writer():
+            try:
+                for i in range(50):
+                    pl = Place()
+                    pl.price_by_night = i
+                    self.storage.save()
+                    if i % 2:
+                        self.storage.delete(pl)
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for i in range(50):
+                    with self.storage.reading():
+                        for obj in self.storage.all().values():
+                            pass
+                    self.storage.query(Place).where(
+                        price_by_night__lt=10).all()
+                    self.storage.count(Place)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=f) for f in (writer, reader) * 4]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([], errors)
+        self.storage.save()
+        self.assertEqual(100, self.storage.count(Place))
+        with open("file.json", "r") as f:
+            self.assertEqual(1100, len(json.load(f)))
+
+
+class TestFileStorage_bulk_load(unittest.TestCase):
+    """Unittests for testing bulk loads into FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.paths = []
+
+    def tearDown(self):
+        for path in ["file.json"] + self.paths:
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def write(self, path, text):
+        self.paths.append(path)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def saved(self):
+        with open("file.json", "r") as f:
+            return json.load(f)
+
+    def test_bulk_load_jsonl(self):
+        path = self.write("reviews.jsonl", "".join(
+            json.dumps({"id": str(i), "text": "review {}".format(i),
+                        "__class__": "Review"}) + "\n"
+            for i in range(5)) + "\n")
+        self.assertEqual(5, models.storage.bulk_load(path, Review))
+        rv = models.storage.all()["Review.3"]
+        self.assertEqual(Review, type(rv))
+        self.assertEqual("review 3", rv.text)
+        self.assertEqual(5, len(self.saved()))
+
+    def test_bulk_load_csv(self):
+        path = self.write("places.csv",
+                          "id,name,number_rooms,latitude,amenity_ids,city_id"
+                          "\np1,Loft,3,37.77,\"[\"\"a1\"\"]\",\n"
+                          "p2,Cabin,,1.5,,c1\n")
+        self.assertEqual(2, models.storage.bulk_load(path, "Place"))
+        p1 = models.storage.all()["Place.p1"]
+        p2 = models.storage.all()["Place.p2"]
+        self.assertEqual((3, 37.77, ["a1"], "Loft"), (
+            p1.number_rooms, p1.latitude, p1.amenity_ids, p1.name))
+        self.assertEqual((0, "c1"), (p2.number_rooms, p2.city_id))
+        self.assertNotIn("city_id", p1.__dict__)
+
+    def test_bulk_load_batches(self):
+        path = self.write("users.ndjson", "".join(
+            '{{"id": "{}"}}\n'.format(i) for i in range(10)))
+        saves = []
+        save = FileStorage.save
+
+        def counted(storage):
+            saves.append(storage.count(User))
+            save(storage)
+
+        with patch.object(FileStorage, "save", counted):
+            models.storage.bulk_load(path, User, batch=4)
+        self.assertEqual([4, 8, 10], saves)
+
+    def test_bulk_load_errors(self):
+        with self.assertRaises(ValueError):
+            models.storage.bulk_load(self.write("users.txt", ""), User)
+        with self.assertRaises(KeyError):
+            models.storage.bulk_load(self.write("x.jsonl", ""), "Guest")
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            models.storage.bulk_load(self.write("bad.jsonl",
+                                                '{"id": "1"}\n[1]\n'), User)
+        with self.assertRaisesRegex(ValueError, "line 3"):
+            models.storage.bulk_load(self.write(
+                "bad.csv", "id,number_rooms\np1,2\np2,many\n"), Place)
+        with self.assertRaises(FileNotFoundError):
+            models.storage.bulk_load("missing.csv", Place)
+
+    def test_bulk_load_rebuilds_only_its_indexes(self):
+        storage = FileStorage(range_indexes=["Place.price_by_night"])
+        self.addCleanup(FileStorage._FileStorage__indexes.pop,
+                        "Place.price_by_night:range")
+        self.addCleanup(
+            FileStorage._FileStorage__class_indexes["Place"].remove,
+            FileStorage._FileStorage__indexes["Place.price_by_night:range"])
+        Review().place_id = "p1"
+        storage.index("Review.place_id")
+        path = self.write("places.csv", "id,price_by_night\n" + "".join(
+            "p{},{}\n".format(i, (i * 37) % 100) for i in range(50)))
+        storage.bulk_load(path, Place)
+        fresh = FileStorage._FileStorage__fresh
+        self.assertIn("Review.place_id", fresh)
+        self.assertNotIn("Place.price_by_night:range", fresh)
+        prices = [pl.price_by_night
+                  for pl in storage.by_range(Place, "price_by_night", 90)]
+        self.assertEqual(sorted(prices), prices)
+        self.assertEqual(5, len(prices))
+        self.assertEqual(1, len(storage.by_ref(Review, "place_id", "p1")))
+
+
+class TestFileStorage_export(unittest.TestCase):
+    """Unittests for testing streaming exports of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.loft = Place()
+        self.loft.name = "Loft"
+        self.loft.amenity_ids = ["a1", "a2"]
+        self.cabin = Place()
+        self.cabin.price_by_night = 80
+        self.us = User()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_records(self):
+        records = dict(models.storage.records(Place))
+        self.assertEqual({"Place." + self.loft.id, "Place." + self.cabin.id},
+                         set(records))
+        self.assertEqual(self.loft.to_dict(),
+                         records["Place." + self.loft.id])
+        self.assertEqual(3, len(list(models.storage.records())))
+
+    def test_records_fields(self):
+        records = dict(models.storage.records("Place", ["name", "id"]))
+        self.assertEqual({"name": "Loft", "id": self.loft.id},
+                         records["Place." + self.loft.id])
+        self.assertEqual(["id"], list(records["Place." + self.cabin.id]))
+
+    def test_records_is_a_generator(self):
+        records = models.storage.records(Place)
+        next(records)
+        models.storage.delete(self.cabin)
+        models.storage.delete(self.loft)
+        self.assertEqual([], list(records))
+
+    def test_export_jsonl(self):
+        f = StringIO()
+        self.assertEqual(2, models.storage.export(Place, "jsonl", f))
+        lines = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual([self.loft.to_dict(), self.cabin.to_dict()], lines)
+
+    def test_export_jsonl_fields(self):
+        f = StringIO()
+        models.storage.export("Place", "ndjson", f, ["id", "name"])
+        self.assertEqual('{{"id": "{}", "name": "Loft"}}'.format(
+            self.loft.id), f.getvalue().splitlines()[0])
+
+    def test_export_csv(self):
+        f = StringIO(newline="")
+        self.assertEqual(2, models.storage.export(Place, "csv", f))
+        lines = f.getvalue().splitlines()
+        self.assertEqual("id,created_at,updated_at,city_id,user_id,name,"
+                         "description,number_rooms,number_bathrooms,"
+                         "max_guest,price_by_night,latitude,longitude,"
+                         "amenity_ids", lines[0])
+        self.assertEqual(3, len(lines))
+        self.assertIn('Loft,,,,,,,,"[""a1"", ""a2""]"', lines[1])
+
+    def test_export_csv_fields(self):
+        f = StringIO(newline="")
+        models.storage.export(Place, "csv", f, ["id", "price_by_night"])
+        self.assertEqual(["id,price_by_night", self.loft.id + ",",
+                          self.cabin.id + ",80"], f.getvalue().splitlines())
+
+    def test_export_errors(self):
+        with self.assertRaises(ValueError):
+            models.storage.export(Place, "xml", StringIO())
+        with self.assertRaises(KeyError):
+            models.storage.export("Guest", "csv", StringIO())
+
+    def test_export_then_bulk_load(self):
+        for fmt in ("jsonl", "csv"):
+            with open("places." + fmt, "w", newline="") as f:
+                models.storage.export(Place, fmt, f)
+            self.addCleanup(os.remove, "places." + fmt)
+        expected = {key: obj.to_dict()
+                    for key, obj in models.storage.all(Place).items()}
+        for fmt in ("jsonl", "csv"):
+            FileStorage._FileStorage__objects = {}
+            models.storage.bulk_load("places." + fmt, Place)
+            self.assertEqual(expected, {
+                key: obj.to_dict()
+                for key, obj in models.storage.all(Place).items()})
+
+    def test_export_lazy_does_not_instantiate(self):
+        storage = FileStorage(lazy=True)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        f = StringIO()
+        self.assertEqual(2, storage.export(Place, "jsonl", f))
+        self.assertIn("Loft", f.getvalue())
+        objs = storage.all()
+        self.assertTrue(objs.is_pending("Place." + self.loft.id))
+
+
 if __name__ == "__main__":
     unittest.main()
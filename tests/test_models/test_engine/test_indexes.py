@@ -0,0 +1,301 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/indexes.py.
+
+Unittest classes:
+    TestIndex
+    TestRefIndex
+    TestRangeIndex
+    TestGeoIndex
+    TestAmenityIndex
+"""
+import unittest
+from models.engine.indexes import AmenityIndex, GeoIndex, Index, \
+    RangeIndex, RefIndex, distance_km
+from models.place import Place
+
+
+class TestIndex(unittest.TestCase):
+    """Unittests for testing the Index base class."""
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            Index("Place:x", "Place", ())
+
+        class Partial(Index):
+            def update(self, key, obj):
+                pass
+
+        with self.assertRaises(TypeError):
+            Partial("Place:x", "Place", ())
+
+    def test_only_persistent_indexes_dump(self):
+        for index in (RefIndex("Place", "city_id"), GeoIndex("Place"),
+                      RangeIndex("Place", "max_guest"), AmenityIndex()):
+            self.assertFalse(index.persistent)
+            self.assertFalse(hasattr(index, "dump"))
+            self.assertFalse(hasattr(index, "load"))
+
+
+class TestRefIndex(unittest.TestCase):
+    """Unittests for testing the RefIndex class."""
+
+    def setUp(self):
+        self.index = RefIndex("Place", "city_id")
+        for key, city_id in (("a", "sf"), ("b", "sf"), ("c", "la")):
+            pl = Place()
+            pl.city_id = city_id
+            self.index.update(key, pl)
+
+    def test_lookup(self):
+        self.assertEqual({"a", "b"}, self.index.lookup("sf"))
+        self.assertEqual(set(), self.index.lookup("ny"))
+
+    def test_update_delete(self):
+        self.index.update("a", None)
+        self.assertEqual({"b"}, self.index.lookup("sf"))
+
+    def test_match(self):
+        cond = ("city_id", "in", ["la", "ny"])
+        self.assertEqual(({"c"}, (cond,)),
+                         self.index.match([("name", "eq", "x"), cond]))
+        self.assertIsNone(self.index.match([("city_id", "lt", "x")]))
+        self.assertIsNone(self.index.match([]))
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Unittests for testing the RangeIndex class."""
+
+    def setUp(self):
+        self.index = RangeIndex("Place", "price_by_night")
+        for key, price in (("a", 50), ("b", 120), ("c", 80.5), ("d", 80),
+                           ("e", 120)):
+            self.store(key, price)
+
+    def store(self, key, price):
+        pl = Place()
+        pl.price_by_night = price
+        self.index.update(key, pl)
+
+    def test_name(self):
+        self.assertEqual("Place.price_by_night:range", self.index.name)
+        self.assertEqual("price_by_night", self.index.sorted_attr)
+
+    def test_range(self):
+        self.assertEqual(["a", "d", "c", "b", "e"], self.index.range())
+        self.assertEqual(["d", "c", "b", "e"], self.index.range(80, 120))
+        self.assertEqual(["c"], self.index.range(80, 120, False, False))
+        self.assertEqual(["b", "e"], self.index.range(lo=100))
+        self.assertEqual([], self.index.range(200, 300))
+
+    def test_lowest_highest(self):
+        self.assertEqual(["a", "d"], self.index.lowest(2))
+        self.assertEqual(["e", "b", "c"], self.index.highest(3))
+        self.assertEqual([], self.index.highest(0))
+
+    def test_update(self):
+        self.store("a", 130)
+        self.index.update("b", None)
+        self.assertEqual(["d", "c", "e", "a"], self.index.range())
+
+    def test_not_numeric(self):
+        self.store("a", "cheap")
+        self.store("f", float("nan"))
+        self.assertEqual(["d", "c", "b", "e"], self.index.range())
+        self.assertIsNone(self.index.sorted_keys())
+
+    def test_match(self):
+        conds = (("price_by_night", "gte", 60), ("price_by_night", "lt", 120),
+                 ("price_by_night", "lte", 200), ("name", "eq", "x"))
+        keys, used = self.index.match(conds)
+        self.assertEqual(["d", "c"], keys)
+        self.assertEqual(conds[:3], used)
+
+    def test_match_eq(self):
+        keys, used = self.index.match([("price_by_night", "eq", 120)])
+        self.assertEqual(["b", "e"], keys)
+
+    def test_match_ignores_other_conditions(self):
+        self.assertIsNone(self.index.match(
+            [("price_by_night", "ne", 50), ("price_by_night", "lt", "x")]))
+        self.assertIsNone(self.index.match([]))
+
+    def test_sorted_keys(self):
+        self.assertEqual(["a", "d", "c", "b", "e"], self.index.sorted_keys())
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual([], self.index.range())
+
+    def test_build(self):
+        places = []
+        for key, price in (("x", 90), ("y", "free"), ("z", 10), ("a", 90)):
+            pl = Place()
+            pl.price_by_night = price
+            places.append((key, pl))
+        self.index.build(places)
+        self.assertEqual(["z", "a", "x"], self.index.range())
+        self.assertIsNone(self.index.sorted_keys())
+        self.index.update("y", None)
+        self.index.update("x", None)
+        self.assertEqual(["z", "a"], self.index.sorted_keys())
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Unittests for testing the GeoIndex class."""
+
+    points = {
+        "sf": (37.7749, -122.4194),
+        "oakland": (37.8044, -122.2712),
+        "la": (34.0522, -118.2437),
+        "fiji": (-17.7134, 178.0650),
+        "samoa": (-13.7590, -172.1046),
+        "pole": (89.99, 10.0)
+    }
+
+    def setUp(self):
+        self.index = GeoIndex("Place", cell_deg=1.0)
+        for key, (lat, lon) in self.points.items():
+            self.store(key, lat, lon)
+
+    def store(self, key, lat, lon):
+        pl = Place()
+        pl.latitude, pl.longitude = lat, lon
+        self.index.update(key, pl)
+
+    def test_distance_km(self):
+        self.assertAlmostEqual(559, distance_km(*self.points["sf"],
+                                                *self.points["la"]), -1)
+        self.assertEqual(0, distance_km(10, 20, 10, 20))
+
+    def test_near(self):
+        found = self.index.near(37.78, -122.41, 20)
+        self.assertEqual(["sf", "oakland"], [key for dist, key in found])
+        self.assertLess(found[0][0], found[1][0])
+
+    def test_near_limit(self):
+        found = self.index.near(37.78, -122.41, 1000, limit=2)
+        self.assertEqual(["sf", "oakland"], [key for dist, key in found])
+        found = self.index.near(37.78, -122.41, 1000)
+        self.assertEqual(["sf", "oakland", "la"],
+                         [key for dist, key in found])
+        self.assertEqual([], self.index.near(37.78, -122.41, 1000, limit=0))
+        self.assertEqual([], self.index.near(37.78, -122.41, 1000, limit=-1))
+
+    def test_near_antimeridian(self):
+        found = self.index.near(-16, 179.9, 1500)
+        self.assertEqual(["fiji", "samoa"], sorted(k for d, k in found))
+
+    def test_near_pole(self):
+        found = self.index.near(89.5, -170, 100)
+        self.assertEqual(["pole"], [key for dist, key in found])
+
+    def test_default_coordinates_skipped(self):
+        self.index.update("unset", Place())
+        self.assertEqual([], self.index.near(0.0, 0.0, 1))
+        self.assertEqual([], self.index.in_bbox(-1, -1, 1, 1))
+
+    def test_in_bbox(self):
+        self.assertEqual(["sf"], self.index.in_bbox(37, -123, 38, -122.3))
+        self.assertCountEqual(["sf", "oakland", "la"],
+                              self.index.in_bbox(30, -125, 40, -110))
+        self.assertEqual([], self.index.in_bbox(0, 0, 1, 1))
+
+    def test_in_bbox_antimeridian(self):
+        self.assertCountEqual(["fiji", "samoa"],
+                              self.index.in_bbox(-20, 170, -10, -170))
+
+    def test_in_bbox_large(self):
+        self.assertEqual(6, len(self.index.in_bbox(-90, -180, 90, 180)))
+
+    def test_update(self):
+        self.store("sf", 34.05, -118.25)
+        self.index.update("la", None)
+        self.assertEqual(["sf"], [k for d, k in
+                                  self.index.near(34.05, -118.24, 5)])
+        self.assertEqual([], self.index.near(37.78, -122.41, 5))
+
+    def test_invalid_coordinates(self):
+        self.store("sf", "north", -122.4)
+        self.store("la", 91.0, -118.2)
+        self.assertEqual(["oakland"], self.index.in_bbox(30, -125, 40,
+                                                         -110))
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual([], self.index.near(37.78, -122.41, 1000))
+
+
+class TestAmenityIndex(unittest.TestCase):
+    """Unittests for testing the AmenityIndex class."""
+
+    def setUp(self):
+        self.index = AmenityIndex()
+        self.store("a", ["wifi", "pool"])
+        self.store("b", ["wifi"])
+        self.store("c", ["pool", "gym"])
+        self.store("d", [])
+
+    def store(self, key, amenity_ids):
+        pl = Place()
+        pl.amenity_ids = amenity_ids
+        self.index.update(key, pl)
+
+    def test_name(self):
+        self.assertEqual("Place:amenities", self.index.name)
+        self.assertEqual(("amenity_ids",), self.index.attrs)
+
+    def test_mask(self):
+        self.assertEqual(0b11, self.index.mask("a"))
+        self.assertEqual(0b1, self.index.mask("b"))
+        self.assertEqual(0b110, self.index.mask("c"))
+        self.assertEqual(0, self.index.mask("d"))
+        self.assertEqual(["pool", "gym"], self.index.amenities(0b110))
+
+    def test_having(self):
+        self.assertEqual(["a"], self.index.having(["wifi", "pool"]))
+        self.assertEqual(["a", "b", "c"],
+                         self.index.having(any_of=["wifi", "gym"]))
+        self.assertEqual(["a"], self.index.having(["pool"], ["wifi", "spa"]))
+        self.assertEqual(["a", "b", "c", "d"], self.index.having())
+        self.assertEqual([], self.index.having(["spa"]))
+
+    def test_update(self):
+        self.store("b", ["gym"])
+        self.index.update("c", None)
+        self.assertEqual(["b"], self.index.having(["gym"]))
+        self.assertEqual(["a"], self.index.having(["pool"]))
+        self.assertEqual(0b100, self.index.mask("b"))
+        self.assertEqual(0, self.index.mask("c"))
+
+    def test_reuses_slots(self):
+        self.index.update("a", None)
+        self.store("e", ["spa"])
+        self.assertEqual(["e", "b", "c", "d"], self.index.having())
+        self.assertEqual(["e"], self.index.having(["spa"]))
+
+    def test_match(self):
+        conds = (("amenity_ids", "contains", "pool"),
+                 ("amenity_ids", "contains_any", ["wifi", "spa"]),
+                 ("name", "eq", "x"))
+        self.assertEqual((["a"], conds[:2]), self.index.match(conds))
+        self.assertEqual(
+            (["a"], (("amenity_ids", "contains_all", ["wifi", "pool"]),)),
+            self.index.match([("amenity_ids", "contains_all",
+                               ["wifi", "pool"])]))
+        self.assertIsNone(self.index.match([("amenity_ids", "eq", [])]))
+
+    def test_not_a_list(self):
+        self.store("b", "wifi")
+        self.assertEqual(["a"], self.index.having(["wifi"]))
+        self.assertIsNone(self.index.match(
+            [("amenity_ids", "contains", "wifi")]))
+        self.store("b", ["wifi"])
+        self.assertEqual(["a", "b"], self.index.having(["wifi"]))
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual([], self.index.having())
+
+
+if __name__ == "__main__":
+    unittest.main()
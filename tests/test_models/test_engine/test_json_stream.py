@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/json_stream.py.
+
+Unittest classes:
+    TestIterRecords
+"""
+import json
+import unittest
+from io import StringIO
+from models.engine.json_stream import iter_records
+
+
+class TestIterRecords(unittest.TestCase):
+    """Unittests for testing the iter_records function."""
+
+    saved = {
+        "User.1": {"id": "1", "first_name": "Betty", "__class__": "User"},
+        "Place.2": {"id": "2", "amenity_ids": ["a", "b"], "max_guest": 4,
+                    "description": "A \"cosy\" {flat}", "__class__": "Place"}
+    }
+
+    def test_compact_layout(self):
+        text = json.dumps(self.saved)
+        for chunk_size in (1, 2, 7, 1 << 16):
+            records = iter_records(StringIO(text), chunk_size)
+            self.assertEqual(self.saved, dict(records))
+
+    def test_indented_layout(self):
+        text = json.dumps(self.saved, indent=4)
+        self.assertEqual(self.saved, dict(iter_records(StringIO(text), 3)))
+
+    def test_yields_in_order(self):
+        text = json.dumps(self.saved)
+        keys = [key for key, value in iter_records(StringIO(text), 5)]
+        self.assertEqual(["User.1", "Place.2"], keys)
+
+    def test_is_incremental(self):
+        f = StringIO(json.dumps(self.saved))
+        records = iter_records(f, 8)
+        self.assertEqual("User.1", next(records)[0])
+        self.assertLess(f.tell(), len(f.getvalue()))
+
+    def test_empty_object(self):
+        self.assertEqual([], list(iter_records(StringIO(" { } "))))
+
+    def test_number_across_chunks(self):
+        text = '{"a": 12345}'
+        self.assertEqual([("a", 12345)], list(iter_records(StringIO(text), 2)))
+
+    def test_truncated(self):
+        text = json.dumps(self.saved)[:-10]
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_records(StringIO(text), 4))
+
+    def test_not_an_object(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_records(StringIO("[1, 2]")))
+
+    def test_empty_file(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_records(StringIO("")))
+
+
+if __name__ == "__main__":
+    unittest.main()
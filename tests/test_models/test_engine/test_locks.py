@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/locks.py.
+
+Unittest classes:
+    TestRWLock
+    TestNoLock
+    TestKeyLocks
+"""
+import threading
+import unittest
+from models.engine.locks import KeyLocks, NoLock, RWLock
+
+
+class TestRWLock(unittest.TestCase):
+    """Unittests for testing the RWLock class."""
+
+    def setUp(self):
+        self.lock = RWLock()
+
+    def run_thread(self, target):
+        t = threading.Thread(target=target, daemon=True)
+        t.start()
+        return t
+
+    def test_readers_share(self):
+        both = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with self.lock.read():
+                both.wait()
+
+        t = self.run_thread(reader)
+        with self.lock.read():
+            both.wait()
+        t.join()
+
+    def test_writer_excludes_readers(self):
+        done = threading.Event()
+
+        def reader():
+            with self.lock.read():
+                done.set()
+
+        with self.lock.write():
+            t = self.run_thread(reader)
+            self.assertFalse(done.wait(0.05))
+        self.assertTrue(done.wait(5))
+        t.join()
+
+    def test_waiting_writer_goes_first(self):
+        order = []
+        writer_waits = threading.Event()
+
+        def writer():
+            writer_waits.set()
+            with self.lock.write():
+                order.append("writer")
+
+        def reader():
+            with self.lock.read():
+                order.append("reader")
+
+        with self.lock.read():
+            w = self.run_thread(writer)
+            writer_waits.wait(5)
+            while not self.lock._RWLock__waiting:
+                pass
+            r = self.run_thread(reader)
+            self.assertEqual([], order)
+        w.join(5)
+        r.join(5)
+        self.assertEqual(["writer", "reader"], order)
+
+    def test_reentrant(self):
+        with self.lock.read():
+            with self.lock.read():
+                pass
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    with self.lock.write():
+                        pass
+        done = threading.Event()
+
+        def writer():
+            with self.lock.write():
+                done.set()
+
+        self.run_thread(writer).join(5)
+        self.assertTrue(done.is_set())
+
+    def test_upgrade_raises(self):
+        with self.lock.read():
+            with self.assertRaises(RuntimeError):
+                with self.lock.write():
+                    pass
+
+
+class TestNoLock(unittest.TestCase):
+    """Unittests for testing the NoLock class."""
+
+    def test_does_nothing(self):
+        lock = NoLock()
+        with lock.read():
+            with lock.write():
+                with lock.read():
+                    pass
+
+
+class TestKeyLocks(unittest.TestCase):
+    """Unittests for testing the KeyLocks class."""
+
+    def test_same_key_same_lock(self):
+        locks = KeyLocks(8)
+        self.assertIs(locks.lock("Place.1"), locks.lock("Place.1"))
+        self.assertEqual(8, len({id(locks.lock("Place.{}".format(i)))
+                                 for i in range(1000)}))
+
+    def test_reentrant(self):
+        lock = KeyLocks().lock("Place.1")
+        with lock:
+            with lock:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+
+Unittest classes:
+    TestQuery
+    TestQuery_explain
+"""
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.user import User
+
+
+class TestQuery(unittest.TestCase):
+    """Unittests for testing the results of queries."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.sf = City()
+        self.la = City()
+        self.places = []
+        for price, city in ((120, self.sf), (80, self.sf), (95, self.la),
+                            (60, self.sf), (200, self.la)):
+            pl = Place()
+            pl.city_id = city.id
+            pl.price_by_night = price
+            self.places.append(pl)
+        User()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def prices(self, query):
+        return [pl.price_by_night for pl in query]
+
+    def test_query_class(self):
+        self.assertEqual(5, models.storage.query(Place).count())
+        self.assertEqual(5, models.storage.query("Place").count())
+
+    def test_where_eq(self):
+        query = models.storage.query(Place).where(city_id=self.sf.id)
+        self.assertEqual([60, 80, 120], sorted(self.prices(query)))
+
+    def test_where_operators(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([60, 80], self.prices(
+            query.where(price_by_night__lt=95)))
+        self.assertEqual([60, 80, 95], self.prices(
+            query.where(price_by_night__lte=95)))
+        self.assertEqual([120, 200], self.prices(
+            query.where(price_by_night__gt=95)))
+        self.assertEqual([95, 120, 200], self.prices(
+            query.where(price_by_night__gte=95)))
+        self.assertEqual([60, 80, 120, 200], self.prices(
+            query.where(price_by_night__ne=95)))
+        self.assertEqual([60, 200], self.prices(
+            query.where(price_by_night__in=[60, 200])))
+
+    def test_where_combined(self):
+        query = models.storage.query(Place).where(
+            city_id=self.sf.id, price_by_night__lt=100)
+        self.assertEqual([60, 80], sorted(self.prices(query)))
+
+    def test_where_in_indexed(self):
+        query = models.storage.query(Place).where(
+            city_id__in=[self.la.id, "nowhere"])
+        self.assertEqual([95, 200], sorted(self.prices(query)))
+
+    def test_where_unknown_operator(self):
+        with self.assertRaises(ValueError):
+            models.storage.query(Place).where(price_by_night__like=1)
+
+    def test_where_uncomparable(self):
+        query = models.storage.query(Place).where(price_by_night__lt="a")
+        self.assertEqual([], query.all())
+
+    def test_order_by(self):
+        query = models.storage.query(Place)
+        self.assertEqual([60, 80, 95, 120, 200],
+                         self.prices(query.order_by("price_by_night")))
+        self.assertEqual([200, 120, 95, 80, 60],
+                         self.prices(query.order_by("-price_by_night")))
+
+    def test_order_by_several(self):
+        query = models.storage.query(Place).order_by("city_id",
+                                                     "-price_by_night")
+        self.assertEqual(sorted(self.places, key=lambda pl: (
+            pl.city_id, -pl.price_by_night)), query.all())
+
+    def test_order_by_missing_last(self):
+        self.places[0].rating = 2
+        self.places[1].rating = 1
+        query = models.storage.query(Place)
+        asc = query.order_by("rating").all()
+        self.assertEqual([self.places[1], self.places[0]], asc[:2])
+        desc = query.order_by("-rating").all()
+        self.assertEqual(self.places[:2], desc[:2])
+
+    def test_limit(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual([60, 80], self.prices(query.limit(2)))
+        self.assertEqual([200, 120], self.prices(
+            models.storage.query(Place).order_by("-price_by_night").limit(2)))
+        self.assertEqual(2, len(models.storage.query(Place).limit(2).all()))
+
+    def test_first(self):
+        query = models.storage.query(Place).order_by("-price_by_night")
+        self.assertIs(self.places[4], query.first())
+        self.assertIsNone(query.where(price_by_night=1).first())
+
+    def test_immutable(self):
+        query = models.storage.query(Place)
+        query.where(city_id=self.sf.id).limit(1)
+        self.assertEqual(5, query.count())
+
+    def test_follows_changes(self):
+        query = models.storage.query(Place).where(city_id=self.la.id)
+        self.places[0].city_id = self.la.id
+        models.storage.delete(self.places[4])
+        self.assertEqual([95, 120], sorted(self.prices(query)))
+
+
+class TestQuery_explain(unittest.TestCase):
+    """Unittests for testing the plans of queries."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_partition_scan(self):
+        Place()
+        User()
+        plan = models.storage.query(Place).explain()
+        self.assertEqual("PartitionScan Place (1 keys)", plan)
+
+    def test_index_scan(self):
+        pl = Place()
+        pl.city_id = "sf"
+        plan = models.storage.query(Place).where(
+            price_by_night__lt=100, city_id="sf").explain().splitlines()
+        self.assertEqual([
+            "IndexScan Place.city_id (city_id eq 'sf') (1 keys)",
+            "Filter price_by_night lt 100"], plan)
+
+    def test_most_selective_index(self):
+        for i in range(3):
+            pl = Place()
+            pl.city_id = "sf"
+            pl.user_id = "u{}".format(i)
+        plan = models.storage.query(Place).where(
+            city_id="sf", user_id="u1").explain().splitlines()
+        self.assertEqual("IndexScan Place.user_id (user_id eq 'u1') "
+                         "(1 keys)", plan[0])
+
+    def test_sort_limit(self):
+        query = models.storage.query(Place)
+        self.assertEqual(["PartitionScan Place (0 keys)",
+                          "TopN -price_by_night", "Limit 5"],
+                         query.order_by("-price_by_night").limit(5)
+                         .explain().splitlines())
+        self.assertEqual(["PartitionScan Place (0 keys)",
+                          "Sort city_id, name"],
+                         query.order_by("city_id", "name")
+                         .explain().splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
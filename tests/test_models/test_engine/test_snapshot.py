@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/snapshot.py.
+
+Unittest classes:
+    TestSnapshot
+"""
+import unittest
+import models
+from datetime import datetime
+from models.base_model import BaseModel
+from models.engine.codecs import CODECS
+from models.engine.snapshot import Snapshot
+from models.place import Place
+from models.user import User
+
+
+class TestSnapshot(unittest.TestCase):
+    """Unittests for testing the Snapshot class."""
+
+    def setUp(self):
+        codec = CODECS["json"]
+        self.pl = {"id": "p1", "name": "Loft", "__class__": "Place",
+                   "created_at": "2017-09-28T21:05:54.119427",
+                   "updated_at": "2017-09-28T21:05:54.119572"}
+        self.us = {"id": "u1", "__class__": "User",
+                   "created_at": "2017-09-28T21:05:54.119427",
+                   "updated_at": "2017-09-28T21:05:54.119572"}
+        partitions = {"Place": {"Place.p1": codec.encode(self.pl)},
+                      "User": {"User.u1": codec.encode(self.us)}}
+        self.snap = Snapshot(3, codec, partitions,
+                             {"Place": Place, "User": User})
+
+    def test_mapping(self):
+        self.assertEqual(3, self.snap.version)
+        self.assertEqual(2, len(self.snap))
+        self.assertEqual(["Place.p1", "User.u1"], list(self.snap))
+        self.assertIn("User.u1", self.snap)
+        self.assertNotIn("User.u2", self.snap)
+        self.assertNotIn("State.s1", self.snap)
+        with self.assertRaises(KeyError):
+            self.snap["Place.p2"]
+
+    def test_getitem_detached(self):
+        count = models.storage.count()
+        pl = self.snap["Place.p1"]
+        self.assertEqual(Place, type(pl))
+        self.assertEqual("Loft", pl.name)
+        self.assertEqual(datetime(2017, 9, 28, 21, 5, 54, 119427),
+                         pl.created_at)
+        self.assertIsNot(pl, self.snap["Place.p1"])
+        self.assertEqual(count, models.storage.count())
+        self.assertNotIn("Place.p1", models.storage.all())
+
+    def test_all_and_count(self):
+        self.assertEqual({"User.u1"}, set(self.snap.all(User)))
+        self.assertEqual({"Place.p1"}, set(self.snap.all("Place")))
+        self.assertEqual(2, len(self.snap.all()))
+        self.assertEqual(1, self.snap.count(Place))
+        self.assertEqual(0, self.snap.count(BaseModel))
+        self.assertEqual(2, self.snap.count())
+
+    def test_records(self):
+        self.assertEqual([("Place.p1", self.pl)],
+                         list(self.snap.records(Place)))
+
+
+if __name__ == "__main__":
+    unittest.main()
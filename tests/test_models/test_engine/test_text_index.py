@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/text_index.py.
+
+Unittest classes:
+    TestTokenize
+    TestTextIndex
+"""
+import json
+import unittest
+from models.engine.text_index import TextIndex, tokenize
+from models.review import Review
+
+
+class TestTokenize(unittest.TestCase):
+    """Unittests for testing the tokenize function."""
+
+    def test_tokenize(self):
+        self.assertEqual(["great", "view", "5", "stars", "café"],
+                         tokenize("Great VIEW, 5 stars! Café"))
+        self.assertEqual([], tokenize(" -- "))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for testing the TextIndex class."""
+
+    texts = {
+        "a": "Quiet street, quiet neighbours",
+        "b": "Noisy street near the station",
+        "c": "Quiet",
+        "d": "Lovely garden and a long description of a lovely garden"
+    }
+
+    def setUp(self):
+        self.index = TextIndex("Review", ("text",))
+        for key, text in self.texts.items():
+            self.store(key, text)
+
+    def store(self, key, text):
+        rv = Review()
+        rv.text = text
+        self.index.update(key, rv)
+
+    def keys(self, text, limit=None):
+        return [key for score, key in self.index.search(text, limit)]
+
+    def test_name(self):
+        self.assertEqual("Review:text", self.index.name)
+        self.assertTrue(self.index.persistent)
+
+    def test_search(self):
+        self.assertEqual(["b"], self.keys("station"))
+        self.assertEqual([], self.keys("pool"))
+        self.assertEqual([], self.keys(""))
+
+    def test_search_ranks_by_bm25(self):
+        self.assertEqual(["c", "a"], self.keys("QUIET"))
+        self.assertEqual(["a", "c", "b"], self.keys("quiet street"))
+        scores = self.index.search("quiet street")
+        self.assertGreater(scores[0][0], scores[1][0])
+
+    def test_search_limit(self):
+        self.assertEqual(["a"], self.keys("quiet street", 1))
+
+    def test_update(self):
+        self.store("b", "Quiet garden")
+        self.index.update("c", None)
+        self.assertEqual(["a", "b"], self.keys("quiet"))
+        self.assertEqual([], self.keys("station"))
+
+    def test_ignores_other_values(self):
+        rv = Review()
+        rv.text = 42
+        self.index.update("a", rv)
+        self.assertEqual(["c"], self.keys("quiet"))
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual([], self.keys("quiet"))
+
+    def test_dump_load(self):
+        data = json.loads(json.dumps(self.index.dump()))
+        index = TextIndex("Review", ("text",))
+        index.load(data)
+        self.assertEqual(self.index.search("quiet garden"),
+                         index.search("quiet garden"))
+        index.update("a", None)
+        self.assertEqual(["c"], [k for s, k in index.search("quiet")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/views.py.
+
+Unittest classes:
+    TestAggregateView
+"""
+import unittest
+from models.engine.views import AggregateView
+from models.place import Place
+
+
+class TestAggregateView(unittest.TestCase):
+    """Unittests for testing the AggregateView class."""
+
+    def setUp(self):
+        self.view = AggregateView("price_by_city", "Place", "city_id",
+                                  "price_by_night")
+        self.store("a", "sf", 100)
+        self.store("b", "sf", 50)
+        self.store("c", "la", 80)
+
+    def store(self, key, city_id, price):
+        pl = Place()
+        pl.city_id = city_id
+        pl.price_by_night = price
+        self.view.update(key, pl)
+
+    def test_attrs(self):
+        self.assertEqual(("city_id", "price_by_night"), self.view.attrs)
+        view = AggregateView("reviews", "Review", "place_id")
+        self.assertEqual(("place_id",), view.attrs)
+
+    def test_get(self):
+        self.assertEqual({"count": 2, "sum": 150, "avg": 75.0, "min": 50,
+                          "max": 100}, self.view.get("sf"))
+
+    def test_get_empty_group(self):
+        self.assertEqual({"count": 0, "sum": 0, "avg": None, "min": None,
+                          "max": None}, self.view.get("ny"))
+
+    def test_groups(self):
+        self.assertEqual(["sf", "la"], list(self.view.groups()))
+        self.assertEqual(80, self.view.groups()["la"]["max"])
+
+    def test_update_moves_group(self):
+        self.store("b", "la", 60)
+        self.assertEqual({"count": 1, "sum": 100, "avg": 100.0, "min": 100,
+                          "max": 100}, self.view.get("sf"))
+        self.assertEqual(60, self.view.get("la")["min"])
+
+    def test_delete(self):
+        self.view.update("a", None)
+        self.assertEqual(50, self.view.get("sf")["max"])
+        self.view.update("b", None)
+        self.assertNotIn("sf", self.view.groups())
+
+    def test_duplicate_values(self):
+        self.store("d", "sf", 50)
+        self.view.update("b", None)
+        self.assertEqual(50, self.view.get("sf")["min"])
+
+    def test_not_numeric(self):
+        self.store("a", "sf", "expensive")
+        self.assertEqual({"count": 2, "sum": 50, "avg": 50.0, "min": 50,
+                          "max": 50}, self.view.get("sf"))
+
+    def test_count_only(self):
+        view = AggregateView("by_city", "Place", "city_id")
+        pl = Place()
+        pl.city_id = "sf"
+        view.update("a", pl)
+        self.assertEqual({"count": 1, "sum": 0, "avg": None, "min": None,
+                          "max": None}, view.get("sf"))
+
+    def test_clear(self):
+        self.view.clear()
+        self.assertEqual({}, self.view.groups())
+
+
+if __name__ == "__main__":
+    unittest.main()